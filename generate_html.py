@@ -1,34 +1,29 @@
-import sqlite3
 from pathlib import Path
 import re
 from datetime import datetime
 
+from scraper.database import open_shows
+
 DB_PATH = Path(__file__).parent / "comedy_images.db"
 INDEX_HTML_FILE = Path(__file__).parent / "index.html"
 UPCOMING_HTML_FILE = Path(__file__).parent / "upcoming.html"
 SHOWS_HTML_FILE = Path(__file__).parent / "shows.html"
 
-def get_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
-
 def get_all_shows_with_images():
     """Fetches all shows that have an associated image."""
-    conn = get_connection()
+    conn = open_shows(DB_PATH)
     cursor = conn.cursor()
 
     cursor.execute("""
         SELECT
-            i.event_name,
-            i.event_date,
-            i.local_path,
-            v.name as venue_name,
-            v.url as venue_url
-        FROM images i
-        JOIN venues v ON i.venue_id = v.id
-        WHERE i.event_name IS NOT NULL AND i.event_name != ''
-        ORDER BY i.scraped_at DESC
+            event_name,
+            event_date,
+            show_start,
+            image as local_path,
+            venue as venue_name,
+            venue_url
+        FROM shows
+        ORDER BY scraped_at DESC
         LIMIT 50
     """)
     shows = [dict(row) for row in cursor.fetchall()]
@@ -48,6 +43,10 @@ def extract_title(event_name, max_length=40):
     return title
 
 def parse_date(show):
+    if show.get('show_start'):
+        date_obj = datetime.fromisoformat(show['show_start'][:10])
+        return date_obj.strftime('%b').upper(), str(date_obj.day), date_obj.strftime('%A')
+
     text_to_search = str(show.get('event_name', '')) + ' ' + str(show.get('event_date', ''))
     
     date_match = re.search(r'(\w{3,9})\s(\d{1,2})', text_to_search, re.IGNORECASE)
@@ -11,7 +11,6 @@ Usage:
     python -m instagram.generate_daily_post [--date YYYY-MM-DD] [--output-dir PATH]
 """
 
-import sqlite3
 import os
 import sys
 import argparse
@@ -26,6 +25,9 @@ from PIL import Image, ImageDraw, ImageFilter
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from scraper.database import open_shows
+from scraper.dates import window_bounds
+
 # Project root directory
 PROJECT_ROOT = Path(__file__).parent.parent
 DB_PATH = PROJECT_ROOT / "comedy_images.db"
@@ -174,106 +176,44 @@ FREE_SHOWS = {
 }
 
 
-def get_db_connection() -> sqlite3.Connection:
-    """Get database connection with row factory."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
-
-
-def parse_event_date(date_str: str, target_date: datetime) -> Optional[datetime]:
-    """
-    Parse event date string and check if it matches target date.
-    Handles formats like "Tuesday, Jan 27", "Jan 27", "January 27, 2026"
-    """
-    if not date_str:
-        return None
-
-    date_str = date_str.strip()
-    current_year = target_date.year
-
-    # Formats that include a year (parse directly)
-    formats_with_year = [
-        "%A, %B %d, %Y",  # "Friday, February 13, 2026"
-        "%A, %b %d, %Y",  # "Friday, Feb 13, 2026"
-        "%B %d, %Y",      # "January 27, 2026"
-        "%b %d, %Y",      # "Jan 27, 2026"
-    ]
-
-    for fmt in formats_with_year:
-        try:
-            return datetime.strptime(date_str, fmt)
-        except ValueError:
-            continue
-
-    # Formats without a year — append target year before parsing
-    # to avoid Python 3.15 deprecation (yearless day-of-month parsing)
-    formats_no_year = [
-        ("%A, %b %d", "%A, %b %d, %Y"),    # "Tuesday, Jan 27" -> "Tuesday, Jan 27, 2026"
-        ("%a, %b %d", "%a, %b %d, %Y"),    # "Tue, Jan 27"     -> "Tue, Jan 27, 2026"
-        ("%b %d",     "%b %d, %Y"),         # "Jan 27"          -> "Jan 27, 2026"
-        ("%B %d",     "%B %d, %Y"),         # "January 27"      -> "January 27, 2026"
-    ]
-
-    for _, fmt_with_year in formats_no_year:
-        try:
-            return datetime.strptime(f"{date_str}, {current_year}", fmt_with_year)
-        except ValueError:
-            continue
-
-    return None
-
-
 def get_todays_shows(target_date: datetime) -> List[Dict]:
     """
     Fetch all shows for the target date from the database.
     """
-    conn = get_db_connection()
+    conn = open_shows(DB_PATH)
     cursor = conn.cursor()
 
-    # Get all shows with their venue info
+    # Shows on the target date, by the show_start normalised at ingest
+    day_start, day_end = window_bounds(target_date.date(), 0)
     cursor.execute("""
-        SELECT
-            i.event_name,
-            i.event_date,
-            i.show_time,
-            i.local_path,
-            i.source_url,
-            v.name as venue_name,
-            v.url as venue_url
-        FROM images i
-        JOIN venues v ON i.venue_id = v.id
-        WHERE i.event_name IS NOT NULL
-        ORDER BY i.show_time
-    """)
-
+        SELECT event_name, event_date, show_time, image, source_url,
+               venue, venue_url
+        FROM shows
+        WHERE show_start >= ? AND show_start < ?
+        ORDER BY show_time
+    """, (day_start, day_end))
     all_shows = cursor.fetchall()
+
+    # Weekly shows and dates the scraper couldn't read have no show_start
+    cursor.execute("SELECT COUNT(*) FROM shows WHERE show_start IS NULL")
+    skipped_undated = cursor.fetchone()[0]
     conn.close()
 
-    # Filter to target date
-    target_date_only = target_date.date()
     todays_shows = []
-
-    skipped_unparseable = 0
     for show in all_shows:
-        parsed_date = parse_event_date(show['event_date'], target_date)
-        if not parsed_date:
-            skipped_unparseable += 1
-            continue
-        if parsed_date.date() == target_date_only:
-            todays_shows.append({
-                'name': show['event_name'],
-                'date': show['event_date'],
-                'time': show['show_time'] or 'TBA',
-                'image_path': show['local_path'],
-                'venue': show['venue_name'],
-                'venue_url': show['venue_url'],
-                'source_url': show['source_url'],
-                'is_free': show['event_name'].lower().strip() in FREE_SHOWS,
-            })
-
-    if skipped_unparseable > 0:
-        print(f"  Warning: {skipped_unparseable} shows had unparseable dates and were skipped")
+        todays_shows.append({
+            'name': show['event_name'],
+            'date': show['event_date'],
+            'time': show['show_time'] or 'TBA',
+            'image_path': show['image'],
+            'venue': show['venue'],
+            'venue_url': show['venue_url'],
+            'source_url': show['source_url'],
+            'is_free': show['event_name'].lower().strip() in FREE_SHOWS,
+        })
+
+    if skipped_undated > 0:
+        print(f"  Warning: {skipped_undated} shows had unparseable dates and were skipped")
 
     # Sort by time
     def parse_time(t):
@@ -616,21 +556,13 @@ def generate_summary(shows: List[Dict], images: List[Path], image_urls: List[str
     }
 
 
-def main():
-    parser = argparse.ArgumentParser(description='Generate daily Instagram post content')
-    parser.add_argument('--date', type=str, help='Target date (YYYY-MM-DD), defaults to today')
-    parser.add_argument('--output-dir', type=str, help='Output directory for images and caption')
-    args = parser.parse_args()
-
-    # Parse target date
-    if args.date:
-        target_date = datetime.strptime(args.date, "%Y-%m-%d")
-    else:
-        target_date = datetime.now()
-
-    # Set output directory
-    output_dir = Path(args.output_dir) if args.output_dir else OUTPUT_DIR
-    output_dir = output_dir / target_date.strftime("%Y-%m-%d")
+def generate_content(target_date: datetime, output_dir: Optional[Path] = None) -> Optional[Path]:
+    """
+    Write the caption, images and summary.json for target_date under
+    output_dir (OUTPUT_DIR by default). Returns the day's directory, or None
+    if there are no shows that day.
+    """
+    output_dir = (output_dir or OUTPUT_DIR) / target_date.strftime("%Y-%m-%d")
     output_dir.mkdir(parents=True, exist_ok=True)
 
     print(f"\nInstagram Content Generator")
@@ -646,7 +578,7 @@ def main():
     if not shows:
         print("\nERROR: No shows found for this date.")
         print("The scraper may not have run or the database may be empty.")
-        sys.exit(1)
+        return None
 
     # Generate caption
     print("\nGenerating caption...")
@@ -685,6 +617,25 @@ def main():
     print(f"\nContent ready in: {output_dir}")
     print("You can now post these images with the caption to Instagram!")
 
+    return output_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate daily Instagram post content')
+    parser.add_argument('--date', type=str, help='Target date (YYYY-MM-DD), defaults to today')
+    parser.add_argument('--output-dir', type=str, help='Output directory for images and caption')
+    args = parser.parse_args()
+
+    # Parse target date
+    if args.date:
+        target_date = datetime.strptime(args.date, "%Y-%m-%d")
+    else:
+        target_date = datetime.now()
+
+    output_dir = Path(args.output_dir) if args.output_dir else None
+    if generate_content(target_date, output_dir) is None:
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
@@ -26,8 +26,9 @@ from typing import List, Dict, Optional, Tuple
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from instagram.post_to_instagram import InstagramPoster
+from scraper.database import open_shows
+from scraper.dates import window_bounds
 from instagram.generate_daily_post import (
-    parse_event_date,
     format_image_for_instagram,
     FREE_SHOWS,
     VENUE_LOGOS,
@@ -162,23 +163,18 @@ def get_filler_shows(
     if needed <= 0:
         return []
 
-    conn = get_db_connection()
+    # Shows dated within the window, by the indexed show_start
+    window_start, window_end = window_bounds(reference_date.date(), 10)
+    conn = open_shows(DB_PATH)
     cursor = conn.cursor()
 
     cursor.execute("""
-        SELECT
-            i.event_name,
-            i.event_date,
-            i.show_time,
-            i.local_path,
-            i.source_url,
-            v.name as venue_name
-        FROM images i
-        JOIN venues v ON i.venue_id = v.id
-        WHERE v.name = ?
-          AND i.event_name IS NOT NULL
-        ORDER BY i.show_time
-    """, (venue_db_name,))
+        SELECT event_name, event_date, show_time, image, source_url, venue
+        FROM shows
+        WHERE venue = ?
+          AND show_start >= ? AND show_start < ?
+        ORDER BY show_time
+    """, (venue_db_name, window_start, window_end))
 
     all_shows = cursor.fetchall()
     conn.close()
@@ -195,29 +191,21 @@ def get_filler_shows(
             continue
 
         # Skip free shows
-        if show["event_name"] and show["event_name"].lower().strip() in FREE_SHOWS:
+        if show["event_name"].lower().strip() in FREE_SHOWS:
             continue
 
         # Skip duplicates by name
-        name_key = show["event_name"].lower().strip() if show["event_name"] else ""
+        name_key = show["event_name"].lower().strip()
         if name_key in seen_names:
             continue
 
-        # Only include shows within the next 10 days
-        parsed = parse_event_date(show["event_date"], reference_date)
-        if not parsed:
-            continue
-        delta = (parsed.date() - reference_date.date()).days
-        if delta < 0 or delta > 10:
-            continue
-
         seen_names.add(name_key)
         fillers.append({
             "name": show["event_name"],
             "date": show["event_date"],
             "time": show["show_time"] or "TBA",
-            "image_path": show["local_path"],
-            "venue": show["venue_name"],
+            "image_path": show["image"],
+            "venue": show["venue"],
             "source_url": show["source_url"],
             "is_featured": False,
         })
@@ -1,268 +1,33 @@
-import sqlite3
+"""
+Render shows.html and the featured shows on index.html from the database.
+
+    python regenerate_shows.py            # render into the current directory
+    python regenerate_shows.py --force    # rewrite even if nothing changed
+
+render_site() is the importable entry point (the daily pipeline calls it
+in-process) and reads the materialized shows table (scraper/shows.py). A
+digest of everything the pages are built from - the window's records,
+which flyers and their resized copies are on disk, the date, this file and
+the rules in scraper/shows.py - is embedded in shows.html; when it
+matches, rendering is skipped. Files whose rendered bytes are unchanged
+are never rewritten, so deploys only see real changes.
+"""
+
+import argparse
+import hashlib
 from datetime import datetime, timedelta
 import re
 from pathlib import Path
 
-# Date filtering - only include shows within the next 10 days
-TODAY = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-CURRENT_YEAR = TODAY.year
-TWO_WEEKS_FROM_NOW = TODAY + timedelta(days=10)
-
-def parse_show_date(event_date):
-    """Parse event_date string and return a datetime object or None."""
-    if not event_date:
-        return None
-
-    # Handle formats like "Tuesday, Dec 16" or "Wednesday, Dec 24"
-    date_str = event_date
-    if ', ' in event_date:
-        date_str = event_date.split(', ')[1]  # Get "Dec 16" part
-
-    # Skip if it's just a day name like "Tuesday"
-    if date_str in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
-        return None
-
-    # Try to parse with full year already included (e.g., "January 15, 2026")
-    try:
-        date_obj = datetime.strptime(date_str, "%B %d, %Y")
-        return date_obj
-    except ValueError:
-        pass
-
-    # Try to parse "Dec 15" or "Dec 16" format with current year
-    try:
-        date_obj = datetime.strptime(f"{CURRENT_YEAR} {date_str}", "%Y %b %d")
-        return date_obj
-    except ValueError:
-        pass
-
-    # Try with full month name
-    try:
-        date_obj = datetime.strptime(f"{CURRENT_YEAR} {date_str}", "%Y %B %d")
-        return date_obj
-    except ValueError:
-        pass
-
-    return None
-
-def is_show_in_date_range(event_date):
-    """Check if show date is today or within the next 2 weeks."""
-    parsed_date = parse_show_date(event_date)
-
-    # If we can't parse the date, include the show (it might be a recurring show)
-    if parsed_date is None:
-        return True
-
-    # Check if the show is today or in the future (within 2 weeks)
-    return TODAY <= parsed_date <= TWO_WEEKS_FROM_NOW
-
-# Known free shows (scraped from venue websites)
-FREE_SHOWS = [
-    # Creek and Cave free shows
-    'the monday gamble mic',
-    'monday gamble',
-    'monday night gimmick mic',
-    'gimmick mic',
-    'dunk tank',
-    'hood therapy',
-    'off the cuff',
-    'wild west wednesdays',
-    'bear arms',
-    'word up',
-    'new joke saturday',
-    'new joke monday',
-    'the creek and the cave open mic',
-    'creek open mic',
-    # Note: removed generic 'open mic' - Cap City open mic is $5
-    'banana phone',
-    'writers room',
-    # Gnar Bar - only Crowd Control is free (pay what you want)
-    'crowd control',
-]
-
-# Shows that are sold out (will be updated by scraper)
-SOLD_OUT_SHOWS = []
-
-# Correct day mappings for Creek and Cave shows
-# VERIFIED from ShowClix on 2025-12-16
-CREEK_CAVE_DAYS = {
-    # Monday (verified)
-    'the monday gamble mic': 'Monday',
-    'clocked out comedy': 'Monday',
-    'new joke monday': 'Monday',
-    'monday night gimmick mic': 'Monday',
-    # Tuesday (verified)
-    'dunk tank': 'Tuesday',
-    'optimum noctis': 'Tuesday',
-    'hood therapy tuesdays': 'Tuesday',
-    # Wednesday (verified)
-    'off the cuff': 'Wednesday',
-    'absolute show': 'Wednesday',
-    'the forge': 'Wednesday',
-    'wild west wednesdays': 'Wednesday',
-    'comedians on the rise': 'Wednesday',
-    # Thursday (verified)
-    'bear arms: open mic': 'Thursday',
-    'bear arms open mic': 'Thursday',
-    'gator tales': 'Thursday',
-    'unscripted: a tag team comedy show': 'Thursday',
-    'unscripted': 'Thursday',
-    'word up! open mic': 'Thursday',
-    'word up open mic': 'Thursday',
-    # Friday (verified)
-    'show us the big naturals': 'Friday',
-    'roast battle: austin': 'Friday',
-    'roast battle austin': 'Friday',
-    'laughs with the staff': 'Friday',
-    # Saturday (verified)
-    'new joke saturday open mic': 'Saturday',
-    'new joke saturday': 'Saturday',
-    'creek featured': 'Saturday',
-    'main course comedy': 'Saturday',
-    'freaky': 'Saturday',
-    'christmas at the creek': 'Saturday',
-    'christmas at the creek!': 'Saturday',
-    # Sunday (verified)
-    "writers' room": 'Sunday',
-    'writers room': 'Sunday',
-    'the creek and the cave open mic': 'Sunday',
-    'banana phone': 'Sunday',
-    # Special events (date-specific)
-    'algonauts': 'Monday',
-    'the roast of santa': 'Tuesday',
-    'king of the creek': 'Tuesday',
-    'comedy powered by bilt': 'Monday',
-    'the roast of 2025': 'Tuesday',
-    "lukas mccrary's nye comedy spectacular": 'Wednesday',
-}
-
-# Velveeta Room day mappings (for recurring shows without specific dates)
-VELVEETA_DAYS = {
-    # Weekly recurring shows
-    'cocktails and comedy': 'Sunday',
-    'cocktails and comedy!': 'Sunday',
-    'the hump': 'Wednesday',
-    'the hump!': 'Wednesday',
-    'power bomb': 'Monday',
-    'power bomb!': 'Monday',
-    'powerbomb': 'Monday',
-    'powerbomb!': 'Monday',
-    'ladies night': 'Wednesday',
-    'ladies night!': 'Wednesday',
-    'austin all-stars': 'Thursday',
-    'austin all-stars!': 'Thursday',
-    'all-star weekend': 'Friday',
-    'all-star weekend!': 'Friday',
-    'timeless comedy': 'Friday',
-    # Other shows
-    'the joke of painting': 'Friday',
-    'velveeta room wrestling': 'Saturday',
-    'the christmas hangover comedy show': 'Friday',
-    'arielle isaac norman': 'Saturday',
-    'joe begley': 'Saturday',
-    'mike macrae': 'Friday',
-    'doug mellard': 'Saturday',
-}
-
-# Creek and Cave event URL mappings
-CREEK_CAVE_URLS = {
-    'the monday gamble mic': '/events/the-monday-gamble-mic',
-    'clocked out comedy': '/events/clocked-out-comedy',
-    'new joke monday': '/events/new-joke-monday',
-    'monday night gimmick mic': '/events/monday-night-gimmick-mic',
-    'dunk tank': '/events/dunk-tank-mic',
-    'optimum noctis': '/events/optimumnoctis',
-    'hood therapy tuesdays': '/events/hood-therapy-tuesdays',
-    'off the cuff': '/events/off-the-cuff',
-    'absolute show': '/events/absolute-show-',
-    'the forge': '/events/the-forge',
-    'wild west wednesdays': '/events/wild-west-wednesdays',
-    'bear arms: open mic': '/events/bear-arms-open-mic',
-    'bear arms open mic': '/events/bear-arms-open-mic',
-    'gator tales': '/events/gator-tales',
-    'unscripted: a tag team comedy show': '/events/unscripted-comedy',
-    'unscripted': '/events/unscripted-comedy',
-    'word up! open mic': '/events/word-up-open-mic',
-    'word up open mic': '/events/word-up-open-mic',
-    'creek featured': '/events/creekfeat',
-    'show us the big naturals': '/events/show-us-the-big-naturals',
-    'new joke saturday open mic': '/events/new-joke-saturday',
-    'new joke saturday': '/events/new-joke-saturday',
-    'christmas at the creek': '/events/christmas-at-the-creek',
-    'christmas at the creek!': '/events/christmas-at-the-creek',
-    'christmas': '/events/christmas-at-the-creek',
-    'main course comedy': '/events/main-course-comedy',
-    'freaky': '/events/freaky-comedy',
-    "writers' room": '/events/writersroom',
-    'writers room': '/events/writersroom',
-    'the creek and the cave open mic': '/events/creek-mic',
-    'banana phone': '/events/banana-phone',
-    'laughs with the staff': '/events/laughs-with-the-staff',
-    'algonauts': '/events/algonauts',
-    'the roast of santa': '/events/the-roast-of-santa',
-    'king of the creek': '/events/king-of-the-creek',
-    'roast battle: austin': '/events/roast-battle-austin',
-    'roast battle austin': '/events/roast-battle-austin',
-    'comedians on the rise': '/events/comedians-on-the-rise',
-    'comedy powered by bilt': '/events/bilt-comedy',
-    'the roast of 2025': '/events/the-roast-of-2025',
-    "lukas mccrary's nye comedy spectacular": '/events/lukas-mccrary-nye',
-}
-
-# Velveeta Room URL mappings (scraped from website)
-VELVEETA_URLS = {
-    'cocktails and comedy': '/velv/cocktails-and-comedy7',
-    'the hump': '/velv/the-hump5',
-    'the joke of painting': '/velv/the-joke-of-painting',
-    'velveeta room wrestling': '/velv/vrw-comedy-championship',
-    'the christmas hangover comedy show': '/velv/the-christmas-hangover2',
-    'christmas hangover': '/velv/the-christmas-hangover2',
-    'timeless comedy': '/velv/timeless-comedy1',
-    'powerbomb': '/velv/powerbomb7',
-    'powerbomb!': '/velv/powerbomb7',
-    'power bomb': '/velv/power-bombd29',
-    'austin all stars': '/velv/austin-all-stars345g',
-    'austin all-stars': '/velv/austin-all-stars345g',
-}
-
-# Rozco's Comedy day mappings
-# VERIFIED from SimpleTix on 2025-12-16
-ROZCOS_DAYS = {
-    'austin all-star comedy': 'Saturday',  # Also runs Tuesdays
-    'eastside open mic': 'Wednesday',  # FIXED: was Tuesday
-    'best of austin comedy': 'Thursday',  # FIXED: was Wednesday
-    'candlelight comedy': 'Thursday',  # FIXED: was Wednesday
-    'friday night laughs': 'Friday',
-    'new faces of austin comedy': 'Saturday',
-    'tuesday gigante': 'Tuesday',
-    'kill or spill': 'Monday',
-    'lez be friends': 'Monday',
-    'dressed to kill': 'Saturday',
-    'your new favorite comic': 'Thursday',
-    'the filthy show': 'Saturday',
-    'circus fire': 'Saturday',
-    'sweet sunday comedy': 'Sunday',
-}
+from scraper.dates import window_bounds
+from scraper.database import open_shows
+from scraper.derivatives import derivatives_on_disk, derived_variants
+from scraper.shows import RULES_DIGEST, is_popup_venue, venue_to_id
 
-# Rozco's Comedy free shows
-ROZCOS_FREE_SHOWS = [
-    'eastside open mic',
-]
-
-# Speakeasy day mappings
-SPEAKEASY_DAYS = {
-    'the thursday special': 'Thursday',
-    'sunday service': 'Sunday',
-}
-
-# Speakeasy URL mappings (Eventbrite direct ticket links)
-SPEAKEASY_URLS = {
-    'the thursday special': 'https://www.eventbrite.com/e/the-thursday-special-tickets-1042163919337',
-    'sunday service': 'https://www.eventbrite.com/e/sunday-service-stand-up-comedy-show-tickets-1308986797749',
-}
+# Date filtering - only include shows within the next 10 days
+DAYS_AHEAD = 10
 
-# Pop Up venues (Bull's Pub, Gnar Bar, Speakeasy, Secret Level)
-POP_UP_VENUES = ["bull's pub", "gnar bar", "speakeasy", "secret level"]
+DIGEST_MARKER = re.compile(r'<!-- render-digest: ([0-9a-f]+) -->')
 
 # Venue location descriptions for tooltips
 VENUE_DESCRIPTIONS = {
@@ -278,389 +43,105 @@ VENUE_DESCRIPTIONS = {
     'secret level': 'Secret comedy pop-ups across ATX',
 }
 
-# Cap City Comedy URL
-CAPCITY_URL = 'https://www.capcitycomedy.com/calendar'
-
-# Rozco's Comedy URL mappings (SimpleTix direct ticket links)
-ROZCOS_URLS = {
-    'austin all-star comedy': 'https://www.simpletix.com/e/austin-all-star-comedy-tickets-249886',
-    'eastside open mic': 'https://www.simpletix.com/e/12-17-eastside-open-mic-tickets-245381',
-    'best of austin comedy': 'https://www.simpletix.com/e/12-18-best-of-austin-comedy-tickets-245375',
-    'candlelight comedy': 'https://www.simpletix.com/e/12-18-candlelight-comedy-tickets-245384',
-    'friday night laughs': 'https://www.simpletix.com/e/12-19-friday-night-laughs-7pm-tickets-249044',
-    'new faces of austin comedy': 'https://www.simpletix.com/e/new-faces-of-austin-comedy-tickets-248564',
-    'tuesday gigante': 'https://www.simpletix.com/e/tuesday-gigante-tickets-248656',
-    'kill or spill': 'https://www.simpletix.com/e/12-9-kill-or-spill-tickets-240508',
-    'lez be friends': 'https://www.simpletix.com/e/12-2-lez-be-friends-comedy-blind-dating-sh-tickets-244863',
-    'dressed to kill': 'https://www.simpletix.com/e/dressed-to-kill-halloween-party-tickets-238205',
-    'your new favorite comic': 'https://www.simpletix.com/e/10-16-your-new-favorite-comic-tickets-237530',
-    'the filthy show': 'https://www.simpletix.com/e/the-filthy-show-tickets-246504',
-    'circus fire': 'https://www.simpletix.com/e/11-1-circus-fire-stand-up-comedy-show-tickets-240102',
-    'sweet sunday comedy': 'https://www.simpletix.com/e/sweet-sunday-comedy-tickets-241384',
-}
-
-# Venue base URLs
-MOTHERSHIP_URL = 'https://comedymothership.com/shows'
-BULLS_PUB_URL = 'https://www.eventbrite.com/e/stand-up-comedy-show-bulls-pub-wedsthursat-at-830pm-tickets-1039732296287'
-GNAR_BAR_URL = 'https://gnarbaratx.com/events'
-ROZCOS_URL = 'https://rozcoscomedyclub.simpletix.com/'
-EAST_AUSTIN_URL = 'https://eastaustincomedy.com/'
-VULCAN_URL = 'https://www.vulcanatx.com/'
-BLACK_RABBIT_URL = 'https://www.eventbrite.com/e/black-rabbit-underground-comedy-tickets-1442073413399'
-SECRET_LEVEL_URL = 'https://www.eventbrite.com/o/secret-level-productions-45772952383'
-
-def is_free_show(name, venue):
-    name_lower = name.lower()
-    venue_lower = venue.lower()
-
-    # Bulls Pub is always free
-    if "bull" in venue_lower:
-        return True
-
-    # Speakeasy shows are always free
-    if "speakeasy" in venue_lower:
-        return True
-
-    # Check against free shows list
-    for free in FREE_SHOWS:
-        if free in name_lower:
-            return True
-
-    # Check Rozco's free shows
-    if 'rozco' in venue_lower:
-        for free in ROZCOS_FREE_SHOWS:
-            if free in name_lower:
-                return True
-
-    return False
-
-def is_sold_out(name, venue):
-    """Check if a show is sold out."""
-    name_lower = name.lower()
-    for sold_out_show in SOLD_OUT_SHOWS:
-        if sold_out_show.lower() in name_lower:
-            return True
-    return False
-
-def get_correct_day(show_name, venue_name, event_date):
-    """Get the correct day of week for a show."""
-    name_lower = show_name.lower().strip()
-    venue_lower = venue_name.lower()
-
-    # PRIORITY 1: If event_date contains scraped day (e.g., "Wednesday, Dec 24"), use it
-    if event_date:
-        # Check for format "Wednesday, Dec 24"
-        if ', ' in event_date:
-            day_part = event_date.split(', ')[0]
-            if day_part in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
-                return day_part
-
-        # Check if event_date is just a day name
-        if event_date in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
-            return event_date
-
-    # PRIORITY 2: Use hardcoded mappings as fallback for venues without scraped dates
-
-    # Creek and Cave - use hardcoded mappings
-    if 'creek' in venue_lower:
-        if name_lower in CREEK_CAVE_DAYS:
-            return CREEK_CAVE_DAYS[name_lower]
-        # Try partial match
-        for key, day in CREEK_CAVE_DAYS.items():
-            if key in name_lower or name_lower in key:
-                return day
-
-    # Velveeta Room - use hardcoded mappings
-    if 'velveeta' in venue_lower:
-        if name_lower in VELVEETA_DAYS:
-            return VELVEETA_DAYS[name_lower]
-        for key, day in VELVEETA_DAYS.items():
-            if key in name_lower or name_lower in key:
-                return day
-
-    # Rozco's Comedy - use hardcoded mappings
-    if 'rozco' in venue_lower:
-        if name_lower in ROZCOS_DAYS:
-            return ROZCOS_DAYS[name_lower]
-        for key, day in ROZCOS_DAYS.items():
-            if key in name_lower or name_lower in key:
-                return day
-
-    # Speakeasy - use hardcoded mappings
-    if 'speakeasy' in venue_lower:
-        if name_lower in SPEAKEASY_DAYS:
-            return SPEAKEASY_DAYS[name_lower]
-        for key, day in SPEAKEASY_DAYS.items():
-            if key in name_lower or name_lower in key:
-                return day
-
-    # Mothership - extract day from event name
-    if 'mothership' in venue_lower:
-        for day in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
-            if day.upper() in show_name.upper():
-                return day
-
-    return event_date or ''
-
-def get_day_from_date(date_str):
-    if not date_str:
-        return ''
-    day_map = {
-        'monday': 'mon', 'tuesday': 'tue', 'wednesday': 'wed',
-        'thursday': 'thu', 'friday': 'fri', 'saturday': 'sat', 'sunday': 'sun'
-    }
-    date_lower = date_str.lower()
-    if date_lower in day_map:
-        return day_map[date_lower]
-    # Try with current year first
+def load_rows(db, today):
+    """
+    Show records to render, from the materialized shows table (see
+    scraper/shows.py): dated shows in the window, selected in SQL on
+    show_start, plus shows without one (weekly shows, dates the scraper
+    couldn't read), which are always listed.
+    """
+    window_start, window_end = window_bounds(today.date(), DAYS_AHEAD)
+    conn = open_shows(db)
     try:
-        date_obj = datetime.strptime(f"{CURRENT_YEAR} {date_str}", "%Y %b %d")
-        return date_obj.strftime('%a').lower()
-    except:
-        pass
-    # Try with full month name
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT name, dedupe_key, event_date, show_time, show_start, day, url, image,
+                   venue, venue_slug, is_free, is_sold_out
+            FROM shows
+            WHERE show_start IS NULL OR (show_start >= ? AND show_start < ?)
+            ORDER BY venue, event_name, image_id
+        """, (window_start, window_end))
+        return cursor.fetchall()
+    finally:
+        conn.close()
+
+def input_digest(rows, today, out_dir, derived):
+    """Hash of everything the pages are rendered from."""
+    digest = hashlib.sha256()
+    digest.update(Path(__file__).read_bytes())
+    digest.update(RULES_DIGEST.encode())
+    digest.update(today.date().isoformat().encode())
+    for row in rows:
+        digest.update(repr(tuple(row)).encode())
+        has_image = (out_dir / row['image']).exists()
+        digest.update(b'1' if has_image else b'0')
+        digest.update(repr(derived_variants(row['image'], derived)).encode())
+    return digest.hexdigest()
+
+def stored_digest(path):
+    """The render digest embedded in a previously written shows.html, or None."""
     try:
-        date_obj = datetime.strptime(f"{CURRENT_YEAR} {date_str}", "%Y %B %d")
-        return date_obj.strftime('%a').lower()
-    except:
-        return ''
-
-def get_day_from_name(name):
-    name_upper = name.upper()
-    days = {
-        'MONDAY': 'mon', 'TUESDAY': 'tue', 'WEDNESDAY': 'wed',
-        'THURSDAY': 'thu', 'FRIDAY': 'fri', 'SATURDAY': 'sat', 'SUNDAY': 'sun'
-    }
-    for day_name, day_abbr in days.items():
-        if day_name in name_upper:
-            return day_abbr
-    return ''
-
-def venue_to_id(venue_name):
-    return venue_name.lower().replace(' ', '-').replace("'", '').replace('&', 'and')
-
-def is_popup_venue(venue_name):
-    """Check if venue should be grouped under Pop Up category."""
-    venue_lower = venue_name.lower()
-    for popup in POP_UP_VENUES:
-        if popup in venue_lower:
-            return True
-    return False
-
-def get_filter_venue_id(venue_name):
-    """Get the venue ID for filtering (Pop Up venues use 'pop-up')."""
-    if is_popup_venue(venue_name):
-        return 'pop-up'
-    return venue_to_id(venue_name)
-
-def extract_show_name_from_poster(text):
-    if not text:
+        with open(path, 'r', encoding='utf-8') as f:
+            match = DIGEST_MARKER.search(f.read(512))
+    except OSError:
         return None
-    match = re.search(r'Poster for ([^,]+)', text)
-    if match:
-        return match.group(1).strip()
-    return text
-
-def get_event_url(show_name, venue_name, venue_base_url, source_url=''):
-    name_lower = show_name.lower().strip()
-
-    # For Cap City, use the source_url from the database (specific ticket page)
-    if 'cap city' in venue_name.lower() and source_url:
-        # Remove the hash fragment we added for uniqueness
-        clean_url = source_url.split('#')[0]
-        return clean_url
-
-    if 'creek' in venue_name.lower():
-        # Use Creek website URL from scraper if available (preferred)
-        if source_url and 'creekandcave.com/events/' in source_url:
-            return source_url
-        # Fall back to hardcoded mapping
-        if name_lower in CREEK_CAVE_URLS:
-            return 'https://www.creekandcave.com' + CREEK_CAVE_URLS[name_lower]
-        for key, path in CREEK_CAVE_URLS.items():
-            if key in name_lower or name_lower in key:
-                return 'https://www.creekandcave.com' + path
-        # Fall back to ShowClix ticket URL
-        if source_url and 'showclix.com' in source_url:
-            return source_url
-        slug = re.sub(r'[^\w\s-]', '', name_lower)
-        slug = re.sub(r'[\s_]+', '-', slug).strip('-')
-        return f'https://www.creekandcave.com/events/{slug}'
-
-    elif 'mothership' in venue_name.lower():
-        return MOTHERSHIP_URL
-
-    elif 'velveeta' in venue_name.lower():
-        # Use the SeatEngine ticket URL from the scraper
-        if source_url and 'seatengine.com' in source_url:
-            return source_url
-        # Fallback to hardcoded URLs
-        if name_lower in VELVEETA_URLS:
-            return 'https://www.thevelveetaroom.com' + VELVEETA_URLS[name_lower]
-        for key, path in VELVEETA_URLS.items():
-            if key in name_lower or name_lower in key:
-                return 'https://www.thevelveetaroom.com' + path
-        slug = re.sub(r'[^\w\s]', '', name_lower).replace(' ', '')
-        return f'https://www.thevelveetaroom.com/velv/{slug}'
-
-    elif 'bull' in venue_name.lower():
-        return BULLS_PUB_URL
-
-    elif 'gnar' in venue_name.lower():
-        return GNAR_BAR_URL
-
-    elif 'rozco' in venue_name.lower():
-        # Use the per-show SimpleTix ticket URL from the scraper
-        if source_url and 'simpletix.com' in source_url:
-            return source_url
-        return ROZCOS_URL
-
-    elif 'speakeasy' in venue_name.lower():
-        if name_lower in SPEAKEASY_URLS:
-            return SPEAKEASY_URLS[name_lower]
-        for key, url in SPEAKEASY_URLS.items():
-            if key in name_lower or name_lower in key:
-                return url
-        return 'https://www.eventbrite.com'
-
-    elif 'cap city' in venue_name.lower():
-        return CAPCITY_URL
-
-    elif 'east austin' in venue_name.lower():
-        return EAST_AUSTIN_URL
-
-    elif 'vulcan' in venue_name.lower():
-        # Use the source_url from scraper (ticketsauce ticket page)
-        if source_url:
-            # Remove the hash fragment we added for uniqueness
-            clean_url = source_url.split('#')[0]
-            return clean_url
-        return VULCAN_URL
-
-    elif 'sunset' in venue_name.lower():
-        # Use the source_url from scraper (SquadUP event-id ticket page)
-        if source_url and 'event-id=' in source_url:
-            return source_url
-        return 'https://www.sunsetstripatx.com/events'
-
-    elif 'paramount' in venue_name.lower():
-        # Use the source_url from scraper (specific ticket page)
-        if source_url:
-            return source_url
-        return 'https://tickets.austintheatre.org/events?kid=4'
-
-    elif 'black rabbit' in venue_name.lower():
-        return BLACK_RABBIT_URL
-
-    elif 'secret level' in venue_name.lower():
-        if source_url and 'eventbrite.com' in source_url:
-            return source_url
-        return SECRET_LEVEL_URL
-
-    return venue_base_url
-
-# Get show data from database
-conn = sqlite3.connect('comedy_images.db')
-conn.row_factory = sqlite3.Row
-cursor = conn.cursor()
-cursor.execute("""
-    SELECT i.event_name, i.event_date, i.local_path, i.show_time, i.source_url, v.name as venue_name, v.url as venue_url
-    FROM images i
-    JOIN venues v ON i.venue_id = v.id
-    WHERE i.event_name IS NOT NULL AND i.event_name != ''
-    ORDER BY v.name, i.event_name
-""")
-
-shows = []
-seen = set()
-venues = set()
-
-for row in cursor.fetchall():
-    name = row['event_name'].strip()
-    event_date = row['event_date'] or ''
-
-    # Skip shows that are in the past or more than 2 weeks out
-    if not is_show_in_date_range(event_date):
-        continue
-
-    clean_name = name
-    if '\n' in name:
-        parts = name.split('\n')
-        clean_name = parts[1].strip() if len(parts) > 1 else parts[0].strip()
-    if 'Poster for' in name:
-        extracted = extract_show_name_from_poster(name)
-        if extracted:
-            clean_name = extracted
-
-    venue = row['venue_name']
-    show_time = row['show_time'] or ''
-    source_url = row['source_url'] or ''
-
-    # For venues with same show on multiple days/times, include date+time in key
-    if 'bull' in venue.lower() or 'gnar' in venue.lower() or 'cap city' in venue.lower() or 'secret level' in venue.lower():
-        key = (clean_name.lower(), venue, event_date, show_time)
-    else:
-        key = (clean_name.lower(), venue)
-
-    if key in seen:
-        continue
-    seen.add(key)
-
-    # Use correct day mappings first, then fall back to date parsing
-    correct_day = get_correct_day(clean_name, venue, event_date)
-    day = ''
-    if correct_day:
-        # Check if correct_day is actually a day name (not a month)
-        day_names = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-        correct_day_lower = correct_day.lower()
-        if correct_day_lower in day_names or any(correct_day_lower.startswith(d) for d in day_names):
-            day = correct_day[:3].lower()  # Convert to 'mon', 'tue', etc.
-        else:
-            # correct_day is a date like "Jan 29", need to calculate the day
-            day = get_day_from_date(correct_day) or get_day_from_name(name)
-
-    # If still no day, try to parse from event_date or calculate from date
-    if not day:
-        day = get_day_from_date(event_date) or get_day_from_name(name)
-
-    # Last resort: if we have a date like "Jan 29", calculate the day of week
-    if not day and event_date:
-        parsed = parse_show_date(event_date)
-        if parsed:
-            day = parsed.strftime('%a').lower()
-    is_free = is_free_show(clean_name, venue)
-    sold_out = is_sold_out(clean_name, venue)
-    venues.add(venue)
-    event_url = get_event_url(clean_name, venue, row['venue_url'], source_url)
-
-    image_path = row['local_path'].replace('\\', '/')
-    has_image = Path(image_path).exists()
-
-    shows.append({
-        'name': clean_name,
-        'date': event_date,
-        'time': show_time,
-        'image': image_path if has_image else '',
-        'venue': venue,
-        'venue_id': get_filter_venue_id(venue),
-        'url': event_url,
-        'day': day,
-        'is_free': is_free,
-        'is_sold_out': sold_out,
-        'has_image': has_image
-    })
-
-conn.close()
+    return match.group(1) if match else None
+
+def write_if_changed(path, content):
+    """Write content to path unless it already holds exactly that. Returns True if written."""
+    data = content.encode('utf-8')
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.write_bytes(data)
+    return True
+
+def build_shows(rows, now, out_dir, derived):
+    """Show entries for the pages, de-duplicated and sorted, and the set of venues."""
+    shows = []
+    seen = set()
+    venues = set()
+
+    for row in rows:
+        event_date = row['event_date']
+        show_start = row['show_start']
+
+        if row['dedupe_key'] in seen:
+            continue
+        seen.add(row['dedupe_key'])
+
+        venues.add(row['venue'])
+        image_path = row['image']
+        has_image = (out_dir / image_path).exists()
+
+        shows.append({
+            'name': row['name'],
+            'date': event_date,
+            'start': show_start,
+            'time': row['show_time'],
+            'image': image_path if has_image else '',
+            'venue': row['venue'],
+            'venue_id': row['venue_slug'],
+            'url': row['url'],
+            'day': row['day'],
+            'is_free': bool(row['is_free']),
+            'is_sold_out': bool(row['is_sold_out']),
+            'has_image': has_image,
+            'image_set': derived_variants(image_path, derived) if has_image else [],
+        })
+
+    # Sort shows chronologically: first by date, then by time, then by name
+    shows.sort(key=lambda s: (get_date_for_sort(s, now), parse_time_for_sort(s['time']), s['name']))
+    return shows, venues
 
 # Sort shows chronologically by actual date
-def get_date_for_sort(show):
+def get_date_for_sort(show, now):
     """Get a sortable date value from show data. Shows closest to today come first."""
-    event_date = show.get('date', '')
-
-    # Try to parse the actual date
-    parsed = parse_show_date(event_date)
-    if parsed:
-        return parsed
+    # Normalised at ingest, with the year resolved
+    if show.get('start'):
+        return datetime.fromisoformat(show['start'][:10])
 
     # If no specific date, use day of week mapping to estimate next occurrence
     day_abbr = show.get('day', '')
@@ -669,7 +150,7 @@ def get_date_for_sort(show):
         day_abbr = day_abbr.lower()
         if day_abbr in days_order:
             target_day = days_order.index(day_abbr)
-            today = datetime.now()
+            today = now
             current_day = today.weekday()
             days_ahead = (target_day - current_day) % 7
             if days_ahead == 0:
@@ -699,16 +180,23 @@ def parse_time_for_sort(time_str):
     except:
         return 99
 
-# Sort shows chronologically: first by date, then by time, then by name
-shows.sort(key=lambda s: (get_date_for_sort(s), parse_time_for_sort(s['time']), s['name']))
-
-# Generate venue filter buttons (group Pop Up venues together)
-filter_venues = set()
-for v in venues:
-    if is_popup_venue(v):
-        filter_venues.add('Pop Up')
-    else:
-        filter_venues.add(v)
+def card_background(show):
+    """
+    Inline style painting a card with its flyer: the original for browsers
+    without image-set(), then the resized AVIF/WebP copies (see
+    scraper/derivatives.py) at 1x and 2x for the rest.
+    """
+    if not show['has_image']:
+        return ''
+    style = f"background-image: url('{show['image']}');"
+    if show['image_set']:
+        base_width = min(width for _, _, width in show['image_set'])
+        options = ', '.join(
+            f"url('{path}') type('{mime}') {width / base_width:g}x"
+            for path, mime, width in show['image_set']
+        )
+        style += f" background-image: image-set({options});"
+    return style
 
 def get_venue_tooltip(venue_name):
     """Get tooltip description for a venue."""
@@ -717,17 +205,8 @@ def get_venue_tooltip(venue_name):
         return VENUE_DESCRIPTIONS[key]
     return ''
 
-venue_buttons = []
-for v in sorted(filter_venues):
-    tooltip = get_venue_tooltip(v)
-    tooltip_attr = f' title="{tooltip}"' if tooltip else ''
-    if v == 'Pop Up':
-        venue_buttons.append(f'<button class="filter-btn venue-btn popup-btn" data-filter="venue" data-value="pop-up"{tooltip_attr}>{v}</button>')
-    else:
-        venue_buttons.append(f'<button class="filter-btn venue-btn" data-filter="venue" data-value="{venue_to_id(v)}"{tooltip_attr}>{v}</button>')
-
 # Helper function to get next occurrence of a day
-def get_next_date_for_day(day_abbr):
+def get_next_date_for_day(day_abbr, now):
     """Calculate the next occurrence of a given day of the week."""
     if not day_abbr:
         return ''
@@ -739,7 +218,7 @@ def get_next_date_for_day(day_abbr):
         return ''
 
     target_day = days_map[day_lower]
-    today = datetime.now()
+    today = now
     today_weekday = today.weekday()
 
     # Calculate days until next occurrence (0 = today if it's that day)
@@ -748,59 +227,79 @@ def get_next_date_for_day(day_abbr):
 
     return next_date.strftime('%b %d')  # e.g., "Dec 16"
 
-# Generate show cards HTML
-show_cards = []
-for show in shows:
-    # Check if this is a special "See All Shows" entry
-    is_see_all = 'see all shows' in show['name'].lower()
+def render_shows_page(shows, venues, now, digest):
+    """The full shows.html page."""
+    # Generate venue filter buttons (group Pop Up venues together)
+    filter_venues = set()
+    for v in venues:
+        if is_popup_venue(v):
+            filter_venues.add('Pop Up')
+        else:
+            filter_venues.add(v)
+
+    venue_buttons = []
+    for v in sorted(filter_venues):
+        tooltip = get_venue_tooltip(v)
+        tooltip_attr = f' title="{tooltip}"' if tooltip else ''
+        if v == 'Pop Up':
+            venue_buttons.append(f'<button class="filter-btn venue-btn popup-btn" data-filter="venue" data-value="pop-up"{tooltip_attr}>{v}</button>')
+        else:
+            venue_buttons.append(f'<button class="filter-btn venue-btn" data-filter="venue" data-value="{venue_to_id(v)}"{tooltip_attr}>{v}</button>')
+
+    # Generate show cards HTML
+    show_cards = []
+    for show in shows:
+        # Check if this is a special "See All Shows" entry
+        is_see_all = 'see all shows' in show['name'].lower()
+
+        # Parse the date field which may contain "Wednesday, Dec 24" or just "Wednesday" or "Dec 24"
+        event_date = show['date'] or ''
+        day_abbr = show['day'].upper() if show['day'] else ''
+        date_part = ''
+
+        # Special handling for "See All Shows" entries
+        if is_see_all:
+            day_abbr = 'ALL'
+            date_part = 'Multiple Dates'
+        else:
+            # Extract date part from combined format like "Wednesday, Dec 24"
+            if ', ' in event_date:
+                parts = event_date.split(', ', 1)
+                date_part = parts[1] if len(parts) > 1 else ''
+            elif event_date and event_date not in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
+                # It's just a date like "Dec 24"
+                date_part = event_date
 
-    # Parse the date field which may contain "Wednesday, Dec 24" or just "Wednesday" or "Dec 24"
-    event_date = show['date'] or ''
-    day_abbr = show['day'].upper() if show['day'] else ''
-    date_part = ''
+            # If no date part but we have a day, calculate the next occurrence
+            if not date_part and day_abbr:
+                date_part = get_next_date_for_day(day_abbr, now)
+
+        # Create the day badge (orange bubble with abbreviated day)
+        day_badge = f'<span class="day-badge">{day_abbr}</span>' if day_abbr else ''
+
+        # Create the date text (plain text next to the badge)
+        date_html = f'<span class="date-text">{date_part}</span>' if date_part else ''
+
+        free_class = ' is-free' if show['is_free'] else ''
+        sold_out_class = ' is-sold-out' if show['is_sold_out'] else ''
+        price_data = 'free' if show['is_free'] else 'paid'
+        no_image_class = ' no-image' if not show['has_image'] else ''
+        bg_style = card_background(show)
 
-    # Special handling for "See All Shows" entries
-    if is_see_all:
-        day_abbr = 'ALL'
-        date_part = 'Multiple Dates'
-    else:
-        # Extract date part from combined format like "Wednesday, Dec 24"
-        if ', ' in event_date:
-            parts = event_date.split(', ', 1)
-            date_part = parts[1] if len(parts) > 1 else ''
-        elif event_date and event_date not in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
-            # It's just a date like "Dec 24"
-            date_part = event_date
-
-        # If no date part but we have a day, calculate the next occurrence
-        if not date_part and day_abbr:
-            date_part = get_next_date_for_day(day_abbr)
-
-    # Create the day badge (orange bubble with abbreviated day)
-    day_badge = f'<span class="day-badge">{day_abbr}</span>' if day_abbr else ''
-
-    # Create the date text (plain text next to the badge)
-    date_html = f'<span class="date-text">{date_part}</span>' if date_part else ''
-
-    free_class = ' is-free' if show['is_free'] else ''
-    sold_out_class = ' is-sold-out' if show['is_sold_out'] else ''
-    price_data = 'free' if show['is_free'] else 'paid'
-    no_image_class = ' no-image' if not show['has_image'] else ''
-    bg_style = f"background-image: url('{show['image']}');" if show['has_image'] else ''
-
-    time_html = f'<span class="show-time">{show["time"]}</span>' if show['time'] else ''
-
-    card = f'''            <a href="{show['url']}" class="show-card{free_class}{sold_out_class}{no_image_class}" data-day="{show['day']}" data-price="{price_data}" data-venue="{show['venue_id']}" style="{bg_style}" target="_blank">
+        time_html = f'<span class="show-time">{show["time"]}</span>' if show['time'] else ''
+
+        card = f'''            <a href="{show['url']}" class="show-card{free_class}{sold_out_class}{no_image_class}" data-day="{show['day']}" data-price="{price_data}" data-venue="{show['venue_id']}" style="{bg_style}" target="_blank">
                 <div class="show-card-content">
                     <div class="show-date-info">{day_badge}{date_html}</div>
                     <h3>{show['name']}</h3>
                     <span class="venue">{show['venue']}{time_html}</span>
                 </div>
             </a>'''
-    show_cards.append(card)
+        show_cards.append(card)
 
-# Build HTML
-html = f'''<!DOCTYPE html>
+    # Build HTML
+    html = f'''<!DOCTYPE html>
+<!-- render-digest: {digest} -->
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -1280,20 +779,13 @@ html = f'''<!DOCTYPE html>
     </script>
 </body>
 </html>'''
-
-with open('shows.html', 'w', encoding='utf-8') as f:
-    f.write(html)
-
-print(f"Created shows.html with {len(shows)} shows!")
-print(f"Venues: {', '.join(sorted(venues))}")
-print(f"Free shows: {sum(1 for s in shows if s['is_free'])}")
-print(f"Paid shows: {sum(1 for s in shows if not s['is_free'])}")
+    return html
 
 # ============================================
 # UPDATE INDEX.HTML FEATURED SHOWS
 # ============================================
 
-def generate_featured_show_card(show):
+def generate_featured_show_card(show, now):
     """Generate a show-item-v2 card for the homepage."""
     day_abbr = show['day'].upper() if show['day'] else ''
 
@@ -1306,10 +798,10 @@ def generate_featured_show_card(show):
     elif event_date and event_date not in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
         date_part = event_date
     if not date_part and day_abbr:
-        date_part = get_next_date_for_day(day_abbr)
+        date_part = get_next_date_for_day(day_abbr, now)
 
     time_html = f' <span class="time-text">{show["time"]}</span>' if show['time'] else ''
-    bg_style = f"background-image: url('{show['image']}');" if show['has_image'] else ''
+    bg_style = card_background(show)
 
     return f'''<div class="show-item-v2 card-lift glow-hover" data-tilt data-tilt-max="8" data-tilt-speed="400" data-tilt-glare data-tilt-max-glare="0.2" style="{bg_style}">
     <div class="show-overlay">
@@ -1322,38 +814,37 @@ def generate_featured_show_card(show):
     </div>
 </div>'''
 
-# Get top 5 shows with images for featured section (prioritize variety of venues)
-featured_shows = []
-venues_used = set()
-for show in shows:
-    if show['has_image'] and 'see all' not in show['name'].lower():
-        # Try to get variety of venues
-        if show['venue'] not in venues_used or len(featured_shows) < 5:
-            featured_shows.append(show)
-            venues_used.add(show['venue'])
-        if len(featured_shows) >= 5:
-            break
-
-# If we don't have 5 yet, fill with any shows that have images
-if len(featured_shows) < 5:
+def featured_section(shows, now):
+    """Cards for the homepage featured shows, and how many there are."""
+    # Get top 5 shows with images for featured section (prioritize variety of venues)
+    featured_shows = []
+    venues_used = set()
     for show in shows:
-        if show['has_image'] and show not in featured_shows and 'see all' not in show['name'].lower():
-            featured_shows.append(show)
+        if show['has_image'] and 'see all' not in show['name'].lower():
+            # Try to get variety of venues
+            if show['venue'] not in venues_used or len(featured_shows) < 5:
+                featured_shows.append(show)
+                venues_used.add(show['venue'])
             if len(featured_shows) >= 5:
                 break
 
-# Generate featured show cards HTML
-featured_cards = [generate_featured_show_card(show) for show in featured_shows[:5]]
-featured_html = '\n\n'.join(featured_cards)
-
-# Read current index.html
-try:
-    with open('index.html', 'r', encoding='utf-8') as f:
-        index_content = f.read()
-
+    # If we don't have 5 yet, fill with any shows that have images
+    if len(featured_shows) < 5:
+        for show in shows:
+            if show['has_image'] and show not in featured_shows and 'see all' not in show['name'].lower():
+                featured_shows.append(show)
+                if len(featured_shows) >= 5:
+                    break
+
+    # Generate featured show cards HTML
+    featured_cards = [generate_featured_show_card(show, now) for show in featured_shows[:5]]
+    featured_html = '\n\n'.join(featured_cards)
+    return featured_html, len(featured_shows[:5])
+
+def update_featured_shows(index_content, featured_html):
+    """index.html with its featured shows section replaced."""
     # Find and replace the featured shows section
     # Pattern: from '<div class="show-list stagger-children">' to the closing '</div>' before '</div></div></section>'
-    import re
     pattern = r'(<div class="show-list stagger-children">)\s*(.*?)\s*(</div>\s*</div>\s*</section>\s*<section class="faq-section)'
 
     replacement = f'''\\1
@@ -1362,11 +853,58 @@ try:
 
             \\3'''
 
-    new_content = re.sub(pattern, replacement, index_content, flags=re.DOTALL)
-
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(new_content)
-
-    print(f"Updated index.html with {len(featured_shows[:5])} featured shows!")
-except Exception as e:
-    print(f"Warning: Could not update index.html - {e}")
+    return re.sub(pattern, replacement, index_content, flags=re.DOTALL)
+
+def render_site(db, now, out_dir, force=False):
+    """
+    Render shows.html and the index.html featured shows into out_dir from
+    the database at `db`, as of `now`. Skips rendering when the input digest
+    matches the one in shows.html (unless `force`), and leaves files whose
+    bytes would not change untouched. Returns the paths written.
+    """
+    out_dir = Path(out_dir)
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    shows_path = out_dir / 'shows.html'
+    index_path = out_dir / 'index.html'
+
+    rows = load_rows(db, today)
+    derived = derivatives_on_disk(out_dir)
+    digest = input_digest(rows, today, out_dir, derived)
+    if not force and index_path.exists() and stored_digest(shows_path) == digest:
+        print("shows.html and index.html are up to date (inputs unchanged)")
+        return []
+
+    written = []
+    shows, venues = build_shows(rows, now, out_dir, derived)
+
+    if write_if_changed(shows_path, render_shows_page(shows, venues, now, digest)):
+        written.append(shows_path)
+    print(f"Created shows.html with {len(shows)} shows!")
+    print(f"Venues: {', '.join(sorted(venues))}")
+    print(f"Free shows: {sum(1 for s in shows if s['is_free'])}")
+    print(f"Paid shows: {sum(1 for s in shows if not s['is_free'])}")
+
+    featured_html, featured_count = featured_section(shows, now)
+    # Read current index.html
+    try:
+        index_content = index_path.read_text(encoding='utf-8')
+        if write_if_changed(index_path, update_featured_shows(index_content, featured_html)):
+            written.append(index_path)
+        print(f"Updated index.html with {featured_count} featured shows!")
+    except Exception as e:
+        print(f"Warning: Could not update index.html - {e}")
+
+    return written
+
+def main():
+    parser = argparse.ArgumentParser(description="Render shows.html and index.html from the database")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Render and compare the pages even if their inputs are unchanged"
+    )
+    args = parser.parse_args()
+    render_site('comedy_images.db', datetime.now(), Path('.'), force=args.force)
+
+if __name__ == '__main__':
+    main()
@@ -2,61 +2,53 @@
 """
 Master orchestration script for ATX Comedy Show scraping.
 
-Runs all scrapers and regenerates HTML files.
+Runs all scrapers and regenerates HTML files in one process (see
+scraper/orchestrator.py), then prints a per-step timing table.
 Used by GitHub Actions for automated daily updates.
 
 Usage:
     python run_all_scrapers.py
+    python run_all_scrapers.py --instagram     # Also generate today's Instagram content
+    python run_all_scrapers.py -c 5 --refresh  # 5 venues at once, reload detail pages
 """
 
-import subprocess
+import argparse
+import asyncio
 import sys
 from datetime import datetime
 
-
-def run_command(description, command):
-    """Run a command and return success status."""
-    print(f"\n{'='*60}")
-    print(f"{description}")
-    print(f"{'='*60}")
-    print(f"Running: {' '.join(command)}")
-
-    result = subprocess.run(command, capture_output=False)
-
-    if result.returncode != 0:
-        print(f"WARNING: {description} exited with code {result.returncode}")
-        return False
-    return True
+from scraper.orchestrator import PIPELINE_CONCURRENCY, run_pipeline
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Run the daily ATX Comedy update")
+    parser.add_argument(
+        "--concurrency", "-c",
+        type=int,
+        default=PIPELINE_CONCURRENCY,
+        metavar="N",
+        help=f"Scrape up to N venues in parallel (default: {PIPELINE_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Reload event detail pages even if they are in the detail cache"
+    )
+    parser.add_argument(
+        "--instagram",
+        action="store_true",
+        help="Generate today's Instagram post content after rendering"
+    )
+    args = parser.parse_args()
+
     print("="*60)
     print(f"ATX Comedy Show Update - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*60)
 
-    success_count = 0
-    total_count = 3
-
-    # Step 1: Run modern scraper module (7 venues)
-    if run_command(
-        "Step 1/3: Running modern scraper (7 venues)",
-        [sys.executable, "-m", "scraper.main", "--all"]
-    ):
-        success_count += 1
-
-    # Step 2: Run Cap City Comedy scraper (standalone)
-    if run_command(
-        "Step 2/3: Running Cap City Comedy scraper",
-        [sys.executable, "scrape_capcity.py"]
-    ):
-        success_count += 1
+    steps = asyncio.run(run_pipeline(args.concurrency, args.refresh, args.instagram))
 
-    # Step 3: Regenerate HTML files
-    if run_command(
-        "Step 3/3: Regenerating HTML files",
-        [sys.executable, "regenerate_shows.py"]
-    ):
-        success_count += 1
+    success_count = sum(1 for step in steps if step.ok)
+    total_count = len(steps)
 
     # Summary
     print(f"\n{'='*60}")
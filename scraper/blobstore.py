@@ -0,0 +1,186 @@
+"""
+Content-addressed view of the flyers under images/.
+
+Every flyer file is identified by the SHA-256 of its contents.
+collect_garbage() hashes the files and counts the references to each one:
+image rows in the database plus paths mentioned in the site's pages, scripts
+and Instagram summaries. It then folds byte-identical copies (e.g.
+rozcos_comedy vs rozcoscomedy) into one canonical file and deletes files
+nothing references. The counts are taken fresh on every run rather than
+kept in a table, since rows are added, rewritten and deleted by scrapers and
+scripts that know nothing about files.
+"""
+
+import hashlib
+import os
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Set
+from urllib.parse import unquote
+
+from .config import GC_SKIP_DIRS
+from .database import connection, unit_of_work
+from .derivatives import derivative_key, stale_derivatives
+from .downloader import IMAGES_DIR
+
+PROJECT_ROOT = IMAGES_DIR.parent
+
+# Text files that may mention image paths (pages, scripts, post summaries)
+REFERENCE_SUFFIXES = {".html", ".js", ".css", ".json", ".py", ".md"}
+REFERENCE_PATTERN = re.compile(r"images[/\\]+[^\"'\s<>()]+")
+
+# Suffix generate_daily_post/generate_hot_show_alert use for derivatives
+DERIVATIVE_SUFFIX = "_ig"
+
+
+def normalize_path(path: str) -> str:
+    """Normalise a stored or quoted path (some rows use backslashes)."""
+    path = re.sub(r"[/\\]+", "/", unquote(path))
+    return path.rstrip(",;:`")
+
+
+def file_hash(path: Path) -> str:
+    """SHA-256 of a file, read in chunks."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def scan_blobs() -> Dict[str, List[str]]:
+    """Hash every flyer in the venue directories. Returns {hash: [paths]}."""
+    blobs = defaultdict(list)
+    for venue_dir in sorted(IMAGES_DIR.iterdir()):
+        if not venue_dir.is_dir() or venue_dir.name in GC_SKIP_DIRS:
+            continue
+        for path in sorted(venue_dir.iterdir()):
+            # .part files are downloads still in flight
+            if path.is_file() and path.suffix != ".part":
+                rel_path = path.relative_to(PROJECT_ROOT).as_posix()
+                blobs[file_hash(path)].append(rel_path)
+    return blobs
+
+
+def db_references() -> Dict[str, int]:
+    """Count image rows per local_path."""
+    refs = defaultdict(int)
+    for row in connection().execute("SELECT local_path FROM images WHERE local_path != ''"):
+        refs[normalize_path(row["local_path"])] += 1
+    return refs
+
+
+def text_references() -> Set[str]:
+    """Image paths mentioned in the project's pages, scripts and summaries."""
+    refs = set()
+    for root, dirs, files in os.walk(PROJECT_ROOT):
+        dirs[:] = [d for d in dirs if not d.startswith(".") and d != "images"]
+        for name in files:
+            if Path(name).suffix.lower() not in REFERENCE_SUFFIXES:
+                continue
+            try:
+                text = (Path(root) / name).read_text(encoding="utf-8", errors="ignore")
+            except OSError:
+                continue
+            for match in REFERENCE_PATTERN.findall(text):
+                refs.add(normalize_path(match))
+    return refs
+
+
+def derivative_source(path: str) -> str:
+    """Return the flyer an _ig.jpg derivative was made from, or ''."""
+    stem, _ = os.path.splitext(path)
+    if not stem.endswith(DERIVATIVE_SUFFIX):
+        return ""
+    return stem[:-len(DERIVATIVE_SUFFIX)]
+
+
+def collect_garbage(dry_run: bool = False) -> dict:
+    """
+    Dedupe identical flyers and delete orphans.
+
+    A duplicate is only removed when no page or script names it directly;
+    image rows pointing at it are rewritten to the canonical copy. An _ig.jpg
+    derivative, and the card copies in images/derived/, live as long as the
+    flyer they were made from. Pass dry_run to report what would change
+    without touching files or rows.
+    """
+    blobs = scan_blobs()
+    db_refs = db_references()
+    text_refs = text_references()
+
+    # Flyers that stay, by stem, so their derivatives stay with them
+    kept_stems = {
+        os.path.splitext(path)[0]
+        for paths in blobs.values()
+        for path in paths
+        if db_refs.get(path) or path in text_refs
+    }
+
+    stats = {"files": 0, "deduped": 0, "deleted": 0, "bytes_freed": 0, "rows_rewritten": 0}
+    rewrites = []
+    deletions = []
+
+    for paths in blobs.values():
+        stats["files"] += len(paths)
+        referenced = [
+            p for p in paths
+            if db_refs.get(p) or p in text_refs or derivative_source(p) in kept_stems
+        ]
+        if not referenced:
+            deletions.extend(paths)
+            continue
+
+        # Prefer a copy the site names directly, then the most-used one
+        canonical = min(
+            referenced,
+            key=lambda p: (p not in text_refs, -db_refs.get(p, 0), p),
+        )
+        for path in paths:
+            if path == canonical:
+                continue
+            if path in text_refs or (path in referenced and derivative_source(path)):
+                # Still named by a page or kept alongside its flyer
+                continue
+            if db_refs.get(path):
+                rewrites.append((canonical, path))
+                stats["rows_rewritten"] += db_refs[path]
+                stats["deduped"] += 1
+            deletions.append(path)
+
+    # Card copies of the flyers that survive
+    deleted = set(deletions)
+    live_keys = {
+        derivative_key(path)
+        for paths in blobs.values()
+        for path in paths
+        if path not in deleted
+    }
+    deletions.extend(
+        path.relative_to(PROJECT_ROOT).as_posix() for path in stale_derivatives(live_keys)
+    )
+
+    for path in deletions:
+        stats["bytes_freed"] += (PROJECT_ROOT / path).stat().st_size
+    stats["deleted"] = len(deletions)
+
+    if dry_run:
+        for canonical, path in rewrites:
+            print(f"  = {path} -> {canonical}")
+        for path in deletions:
+            print(f"  - {path}")
+        return stats
+
+    with unit_of_work() as conn:
+        for canonical, path in rewrites:
+            # Match both slash styles used by older rows
+            conn.execute(
+                "UPDATE images SET local_path = ? WHERE local_path IN (?, ?)",
+                (canonical, path, path.replace("/", "\\")),
+            )
+
+    for path in deletions:
+        (PROJECT_ROOT / path).unlink(missing_ok=True)
+
+    return stats
@@ -0,0 +1,263 @@
+"""
+Browser helpers shared by the scraper package and the standalone scripts.
+
+Scraping only needs the DOM: flyers are fetched separately over aiohttp
+(see downloader.py), so the browser never has to download images, fonts,
+video or analytics. Blocked elements keep their src/srcset attributes.
+
+BrowserService is the one browser a run's scrapers share. Run this module
+to keep a Chromium up between runs:
+
+    python -m scraper.browser --port 9222
+    SCRAPER_BROWSER_ENDPOINT=http://127.0.0.1:9222 python run_all_scrapers.py
+"""
+
+import asyncio
+import os
+import weakref
+from typing import Iterable, Optional
+from urllib.parse import urlparse
+
+from .config import (
+    BLOCKED_RESOURCE_TYPES,
+    TRACKER_HOSTS,
+    VENUES,
+    BROWSER_ENDPOINT_ENV,
+    BROWSER_SERVER_PORT,
+    BROWSER_MAX_PAGES,
+)
+
+
+def is_tracker(url: str) -> bool:
+    """Check if a request goes to a known analytics/ads host."""
+    host = urlparse(url).hostname or ""
+    return any(host == h or host.endswith("." + h) for h in TRACKER_HOSTS)
+
+
+def venue_block_policy(venue_key: Optional[str] = None) -> tuple:
+    """Resource types to block for a venue (its `block_resources`, or the default)."""
+    config = VENUES.get(venue_key, {}) if venue_key else {}
+    return tuple(config.get("block_resources", BLOCKED_RESOURCE_TYPES))
+
+
+async def apply_request_policy(context, block: Iterable[str] = BLOCKED_RESOURCE_TYPES):
+    """
+    Abort requests for the given resource types and for tracker hosts on
+    every page of a browser context.
+    """
+    blocked = frozenset(block)
+
+    async def handle(route):
+        request = route.request
+        if request.resource_type in blocked or is_tracker(request.url):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route("**/*", handle)
+
+
+class RequestTracker:
+    """
+    Requests a page has in flight, and since when it has had none. Attached
+    when the page opens (see track_requests), so the requests of its first
+    navigation are counted too.
+    """
+
+    def __init__(self, page):
+        self._inflight = set()
+        self._quiet_since = asyncio.get_running_loop().time()
+        page.on("request", self._started)
+        page.on("requestfinished", self._finished)
+        page.on("requestfailed", self._finished)
+
+    def _started(self, request):
+        self._inflight.add(request)
+
+    def _finished(self, request):
+        self._inflight.discard(request)
+        if not self._inflight:
+            self._quiet_since = asyncio.get_running_loop().time()
+
+    def quiet_for(self) -> float:
+        """Seconds since the last request finished, or 0 while any is in flight."""
+        if self._inflight:
+            return 0.0
+        return asyncio.get_running_loop().time() - self._quiet_since
+
+
+_trackers = weakref.WeakKeyDictionary()
+
+
+def track_requests(page) -> RequestTracker:
+    """The page's RequestTracker, attaching one if it has none yet."""
+    tracker = _trackers.get(page)
+    if tracker is None:
+        tracker = _trackers[page] = RequestTracker(page)
+    return tracker
+
+
+class BrowserService:
+    """
+    Stand-in for a Playwright Browser shared by every scraper in a run.
+
+    Chromium starts on the first new_context() call, so runs where every
+    venue is served over plain HTTP (see fetch.py) never start it. With an
+    endpoint (or SCRAPER_BROWSER_ENDPOINT) it connects to a long-lived
+    browser instead of launching one: an http:// CDP endpoint such as the
+    one `python -m scraper.browser` serves, or a ws:// `playwright
+    run-server` endpoint.
+
+    After `max_pages` pages a browser this service launched is retired:
+    new contexts go to a fresh browser and the old one is closed once its
+    last context closes. An external browser isn't recycled, since
+    reconnecting would only reach the same process; restart its server
+    instead. If the browser crashes or the connection drops, the next
+    new_context() starts a new one, launching Chromium itself when the
+    endpoint can't be reached.
+    """
+
+    def __init__(
+        self,
+        playwright,
+        endpoint: Optional[str] = None,
+        headless: bool = True,
+        max_pages: int = BROWSER_MAX_PAGES,
+    ):
+        self._playwright = playwright
+        self._endpoint = endpoint or os.environ.get(BROWSER_ENDPOINT_ENV)
+        self._headless = headless
+        self._max_pages = max_pages
+        self._browser = None
+        # Whether _browser was launched here (and so can be recycled)
+        self._launched = False
+        self._pages = 0
+        self._contexts = {}
+        self._closing = set()
+        self._lock = asyncio.Lock()
+        self.restarts = 0
+
+    async def _connect(self):
+        """Connect to the external browser at the endpoint, or return None."""
+        chromium = self._playwright.chromium
+        try:
+            if self._endpoint.startswith("ws"):
+                browser = await chromium.connect(self._endpoint)
+            else:
+                browser = await chromium.connect_over_cdp(self._endpoint)
+        except Exception as e:
+            print(f"  Could not connect to browser at {self._endpoint}: {e}")
+            print("  Launching one for this run instead")
+            return None
+        if self._max_pages:
+            print(f"  Using browser at {self._endpoint}; it is not restarted "
+                  f"after {self._max_pages} pages")
+        return browser
+
+    async def _start(self):
+        browser = await self._connect() if self._endpoint else None
+        self._launched = browser is None
+        if browser is None:
+            browser = await self._playwright.chromium.launch(headless=self._headless)
+        browser.on("disconnected", self._disconnected)
+        self._contexts[browser] = set()
+        return browser
+
+    def _disconnected(self, browser):
+        self._contexts.pop(browser, None)
+        if browser is self._browser:
+            print("  Browser disconnected; the next venue gets a new one")
+            self._browser = None
+            self.restarts += 1
+
+    def _page_opened(self, page):
+        self._pages += 1
+        track_requests(page)
+
+    def _context_closed(self, browser, context):
+        contexts = self._contexts.get(browser)
+        if contexts is None:
+            return
+        contexts.discard(context)
+        if not contexts and browser is not self._browser:
+            self._close_later(browser)
+
+    def _close_later(self, browser):
+        task = asyncio.ensure_future(self._close_browser(browser))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close_browser(self, browser):
+        self._contexts.pop(browser, None)
+        try:
+            await browser.close()
+        except Exception:
+            # Already gone (crashed or disconnected)
+            pass
+
+    async def _retire(self):
+        browser = self._browser
+        self._browser = None
+        self.restarts += 1
+        print(f"  Restarting browser after {self._pages} pages")
+        if not self._contexts.get(browser):
+            await self._close_browser(browser)
+
+    async def new_context(self, **kwargs):
+        async with self._lock:
+            if (self._browser is not None and self._launched
+                    and self._max_pages and self._pages >= self._max_pages):
+                await self._retire()
+            if self._browser is None:
+                self._browser = await self._start()
+                self._pages = 0
+            browser = self._browser
+            context = await browser.new_context(**kwargs)
+            self._contexts[browser].add(context)
+        context.on("page", self._page_opened)
+        context.on("close", lambda ctx: self._context_closed(browser, ctx))
+        return context
+
+    async def close(self):
+        """Close (or disconnect from) every browser this service started."""
+        self._browser = None
+        for browser in list(self._contexts):
+            await self._close_browser(browser)
+        if self._closing:
+            await asyncio.gather(*self._closing)
+
+
+async def serve(port: int = BROWSER_SERVER_PORT, headless: bool = True):
+    """
+    Run one Chromium with a CDP endpoint on 127.0.0.1:`port` until
+    interrupted, for scrapers started with SCRAPER_BROWSER_ENDPOINT.
+    """
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(
+            headless=headless,
+            args=[f"--remote-debugging-port={port}", "--remote-debugging-address=127.0.0.1"],
+        )
+        closed = asyncio.Event()
+        browser.on("disconnected", lambda _: closed.set())
+        print(f"Browser listening; run scrapers with {BROWSER_ENDPOINT_ENV}=http://127.0.0.1:{port}")
+        try:
+            await closed.wait()
+        finally:
+            await browser.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Shared Chromium for scraper runs")
+    parser.add_argument(
+        "--port", type=int, default=BROWSER_SERVER_PORT,
+        help=f"CDP port to listen on (default: {BROWSER_SERVER_PORT})"
+    )
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.port))
+    except KeyboardInterrupt:
+        pass
@@ -11,6 +11,7 @@ VENUES = {
         ],
         "event_name_selector": ".shows_card h2, .shows_card h3",
         "event_date_selector": ".shows_card .date, .shows_card time",
+        "ready_selector": ".events-calendar-day, .events-list-day",
     },
     "mothership": {
         "name": "Comedy Mothership",
@@ -22,6 +23,7 @@ VENUES = {
         ],
         "event_name_selector": "[class*='EventCard_title'], h2, h3",
         "event_date_selector": "[class*='EventCard_date'], time",
+        "ready_selector": "[class*='EventCard_eventCard']",
     },
     "velveeta": {
         "name": "The Velveeta Room",
@@ -34,6 +36,7 @@ VENUES = {
         ],
         "event_name_selector": "",
         "event_date_selector": "",
+        "ready_selector": "[role='listitem']",
     },
     "sunset_strip": {
         "name": "Sunset Strip Comedy",
@@ -46,6 +49,7 @@ VENUES = {
         ],
         "event_name_selector": ".eventlist-title, .summary-title, h2",
         "event_date_selector": ".eventlist-meta-date, time.event-date",
+        "ready_selector": ".squadup-checkout-event-box",
     },
     "east_austin": {
         "name": "East Austin Comedy Club",
@@ -58,6 +62,7 @@ VENUES = {
         ],
         "event_name_selector": "h2, h3, .event-title",
         "event_date_selector": "time, .date",
+        "ready_selector": ".sqs-block-image img, .fe-block img",
     },
     "rozcos": {
         "name": "Rozco's Comedy",
@@ -66,6 +71,16 @@ VENUES = {
         "image_selectors": [],
         "event_name_selector": "",
         "event_date_selector": "",
+        "ready_selector": "a[href*='simpletix.com/e/']",
+    },
+    "cap_city": {
+        "name": "Cap City Comedy",
+        "url": "https://www.capcitycomedy.com",
+        "events_url": "https://www.capcitycomedy.com/calendar",
+        "image_selectors": [],
+        "event_name_selector": "",
+        "event_date_selector": "",
+        "ready_selector": "a[href*='/events/']",
     },
     "vulcan": {
         "name": "Vulcan Gas Company",
@@ -78,6 +93,7 @@ VENUES = {
         ],
         "event_name_selector": "h2, h3, h4, .event-title",
         "event_date_selector": ".event-date, time",
+        "ready_selector": ".w-dyn-item",
     },
     "paramount": {
         "name": "Paramount Theatre",
@@ -89,6 +105,7 @@ VENUES = {
         ],
         "event_name_selector": ".tn-event-listing-item__name, .tn-name",
         "event_date_selector": ".tn-event-listing-item__date, .tn-date-time",
+        "ready_selector": ".tn-prod-list-item",
     },
     "secret_level": {
         "name": "Secret Level",
@@ -97,6 +114,9 @@ VENUES = {
         "image_selectors": [],
         "event_name_selector": "",
         "event_date_selector": "",
+        "ready_selector": "a[href*='/e/']",
+        # Eventbrite series gain dates between runs; re-read them daily
+        "detail_ttl": 12 * 3600,
     },
 }
 
@@ -106,4 +126,93 @@ MIN_IMAGE_HEIGHT = 200
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
 REQUEST_TIMEOUT = 30000
-PAGE_LOAD_WAIT = 3000
+
+# Detail pages fetched at once by the browserless HTTP tier (scraper/fetch.py)
+HTTP_DETAIL_CONCURRENCY = 4
+
+# Per-event pages crawled in the browser (scraper/crawler.py): tabs open at
+# once, pages loading from one host at once, and ms between loads per host
+DETAIL_WORKERS = 4
+DETAIL_PER_HOST = 2
+DETAIL_HOST_DELAY = 250
+
+# Seconds a parsed detail page stays in the detail_cache table before it is
+# loaded again (--refresh ignores the cache). A venue can override this with
+# "detail_ttl".
+DETAIL_CACHE_TTL = 3 * 24 * 3600
+
+# Browser service (scraper/browser.py): a shared Chromium that scrapers
+# connect to when SCRAPER_BROWSER_ENDPOINT is set (see
+# `python -m scraper.browser`), otherwise one launched per run. A launched
+# browser is restarted after BROWSER_MAX_PAGES pages; either kind is
+# replaced after a crash, by a launched one if the endpoint is unreachable.
+BROWSER_ENDPOINT_ENV = "SCRAPER_BROWSER_ENDPOINT"
+BROWSER_SERVER_PORT = 9222
+BROWSER_MAX_PAGES = 200
+
+# Request types the browser aborts while scraping (flyers are downloaded
+# separately). A venue can override this with a "block_resources" list,
+# e.g. [] to load everything.
+BLOCKED_RESOURCE_TYPES = ("image", "font", "media")
+
+# Analytics/ads hosts (and their subdomains) aborted on every page
+TRACKER_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "segment.com",
+    "segment.io",
+    "fullstory.com",
+    "newrelic.com",
+    "nr-data.net",
+    "bat.bing.com",
+    "analytics.tiktok.com",
+    "scorecardresearch.com",
+    "quantserve.com",
+    "adroll.com",
+    "criteo.com",
+)
+
+# Page readiness: scrapers wait for their content (a selector count, JSON-LD,
+# then a quiet network window) instead of sleeping a fixed time. READY_TIMEOUT
+# is the ceiling for a page; SCROLL_WAIT the ceiling after each scroll.
+READY_TIMEOUT = 15000
+NETWORK_QUIET_MS = 500
+SCROLL_WAIT = 2000
+
+# Image download stage: parallel fetches per venue, and connection pool
+# limits for the aiohttp session shared by the whole run.
+DOWNLOAD_CONCURRENCY = 8
+DOWNLOAD_CONNECTION_LIMIT = 16
+DOWNLOAD_LIMIT_PER_HOST = 4
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 30
+
+# Records stream from a scraper to the download/DB stage through a queue of
+# at most STREAM_QUEUE_SIZE; new shows are stored STREAM_BATCH_SIZE at a time
+STREAM_QUEUE_SIZE = 64
+STREAM_BATCH_SIZE = 16
+
+# How much of a flyer to read while looking for its dimensions in the file
+# header; undersized images are abandoned before the rest is downloaded.
+IMAGE_PROBE_CHUNK = 4096
+IMAGE_PROBE_LIMIT = 64 * 1024
+
+# Flyers are streamed to disk in chunks of this size while being hashed
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Resized copies of each flyer for the site's cards (scraper/derivatives.py):
+# widths for 1x and 2x screens, formats best first (ones Pillow can't encode
+# are skipped), and the encoder quality per format
+DERIVATIVE_WIDTHS = (480, 960)
+DERIVATIVE_FORMATS = ("avif", "webp")
+DERIVATIVE_QUALITY = {"avif": 50, "webp": 75}
+
+# Image directories that --gc never scans for flyers: hand-curated ones, and
+# the flyer derivatives (pruned separately)
+GC_SKIP_DIRS = {"podcasts", "venue_spotlight", "derived"}
@@ -0,0 +1,222 @@
+"""
+Concurrent detail-page crawler.
+
+Several venues list events on one page and keep the poster or show times on
+a page per event. iter_details() visits those pages over a small pool of
+tabs in one browser context, instead of one page.goto() after another, and
+yields each parsed result as soon as it is ready. A scraper hands it the
+URLs and a parse(page, url) callback; crawl_details() collects the results.
+
+Detail pages rarely change between daily runs, so DetailCache keeps each
+page's parsed result in the detail_cache table and only pages that are new
+or past their TTL are loaded again.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import defaultdict
+from contextlib import aclosing
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from .config import (
+    VENUES,
+    DETAIL_WORKERS,
+    DETAIL_PER_HOST,
+    DETAIL_HOST_DELAY,
+    DETAIL_CACHE_TTL,
+    REQUEST_TIMEOUT,
+)
+from .database import load_detail_cache, save_detail_cache
+
+ParseFn = Callable[[Any, str], Awaitable[Any]]
+FetchManyFn = Callable[[List[str]], Awaitable[Sequence[Any]]]
+IterManyFn = Callable[[List[str]], AsyncIterator[Tuple[str, Optional[Any]]]]
+
+# Queued by an iter_details() worker when it stops
+_WORKER_DONE = object()
+
+
+async def iter_details(
+    context,
+    urls: Sequence[str],
+    parse: ParseFn,
+    workers: int = DETAIL_WORKERS,
+    per_host: int = DETAIL_PER_HOST,
+    host_delay: int = DETAIL_HOST_DELAY,
+    wait_until: str = "domcontentloaded",
+    timeout: int = REQUEST_TIMEOUT,
+) -> AsyncIterator[Tuple[str, Optional[Any]]]:
+    """
+    Load each URL on one of `workers` pages and yield (url, parse(page, url))
+    as each page is parsed, so callers can use results while later pages
+    are still loading.
+
+    At most `per_host` pages load from one host at a time, and loads from a
+    host start at least `host_delay` ms apart. If loading or parsing a URL
+    raises, its result is None and the other URLs carry on. Repeated URLs
+    are only visited (and yielded) once.
+    """
+    unique = list(dict.fromkeys(urls))
+    if not unique:
+        return
+
+    queue = asyncio.Queue()
+    for url in unique:
+        queue.put_nowait(url)
+
+    done = asyncio.Queue()
+    host_slots = defaultdict(lambda: asyncio.Semaphore(per_host))
+    next_start = defaultdict(float)
+
+    async def pace(host: str):
+        # Reserve the next start time for this host, then wait for it
+        now = time.monotonic()
+        start = max(now, next_start[host])
+        next_start[host] = start + host_delay / 1000
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def worker():
+        try:
+            page = await context.new_page()
+        except BaseException:
+            done.put_nowait(_WORKER_DONE)
+            raise
+        try:
+            while True:
+                try:
+                    url = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                host = urlparse(url).hostname or ""
+                async with host_slots[host]:
+                    await pace(host)
+                    try:
+                        if page.is_closed():
+                            page = await context.new_page()
+                        await page.goto(url, wait_until=wait_until, timeout=timeout)
+                        result = await parse(page, url)
+                    except Exception as e:
+                        print(f"      Error crawling {url}: {e}")
+                        result = None
+                done.put_nowait((url, result))
+        finally:
+            done.put_nowait(_WORKER_DONE)
+            if not page.is_closed():
+                await page.close()
+
+    running = min(workers, len(unique))
+    pool = asyncio.ensure_future(asyncio.gather(*(worker() for _ in range(running))))
+    try:
+        while running:
+            item = await done.get()
+            if item is _WORKER_DONE:
+                running -= 1
+            else:
+                yield item
+        # Surface a worker that couldn't open its page
+        await pool
+    finally:
+        pool.cancel()
+
+
+async def crawl_details(context, urls: Sequence[str], parse: ParseFn, **kwargs) -> List[Optional[Any]]:
+    """iter_details() collected into one result per URL, in the order given."""
+    results = {url: result async for url, result in iter_details(context, urls, parse, **kwargs)}
+    return [results.get(url) for url in urls]
+
+
+def _encode(value: Any) -> str:
+    """JSON for a parsed result; datetimes survive the round trip."""
+    def default(obj):
+        if isinstance(obj, datetime):
+            return {"$datetime": obj.isoformat()}
+        raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+    return json.dumps(value, default=default, sort_keys=True)
+
+
+def _decode(data: str) -> Any:
+    """Inverse of _encode."""
+    def object_hook(obj):
+        if set(obj) == {"$datetime"}:
+            return datetime.fromisoformat(obj["$datetime"])
+        return obj
+    return json.loads(data, object_hook=object_hook)
+
+
+class DetailCache:
+    """
+    Parsed detail-page results for one venue, stored in the detail_cache
+    table with a content fingerprint.
+
+    iter() serves fresh entries from the table and hands only the remaining
+    URLs to the real fetcher (iter_details), passing its results on as they
+    arrive; fetch() does the same for a fetcher that returns a list (an
+    HTTP gather). None results aren't stored, so failed pages are retried
+    on the next run. With refresh=True every page is loaded again and the
+    cache is rewritten.
+    """
+
+    def __init__(self, venue: str, ttl: int = DETAIL_CACHE_TTL, refresh: bool = False):
+        self.venue = venue
+        self.ttl = ttl
+        self.refresh = refresh
+
+    @classmethod
+    def for_venue(cls, venue_key: str, refresh: bool = False) -> "DetailCache":
+        """Cache using the venue's "detail_ttl" (or DETAIL_CACHE_TTL)."""
+        ttl = VENUES.get(venue_key, {}).get("detail_ttl", DETAIL_CACHE_TTL)
+        return cls(venue_key, ttl, refresh)
+
+    async def iter(
+        self, urls: Sequence[str], iter_many: IterManyFn
+    ) -> AsyncIterator[Tuple[str, Optional[Any]]]:
+        """
+        Yield (url, result) for each unique URL: cached ones first, then the
+        rest as iter_many yields them. New results are stored at the end.
+        """
+        unique = list(dict.fromkeys(urls))
+        cached = load_detail_cache(self.venue, self.ttl)
+
+        missing = []
+        hits = []
+        for url in unique:
+            if url in cached and not self.refresh:
+                hits.append(url)
+            else:
+                missing.append(url)
+        print(f"    Detail pages: {len(hits)} cached, {len(missing)} to load")
+
+        for url in hits:
+            yield url, _decode(cached[url][0])
+
+        entries = []
+        changed = 0
+        try:
+            if missing:
+                async with aclosing(iter_many(missing)) as results:
+                    async for url, result in results:
+                        if result is not None:
+                            data = _encode(result)
+                            fingerprint = hashlib.sha256(data.encode()).hexdigest()[:16]
+                            if url in cached and cached[url][1] != fingerprint:
+                                changed += 1
+                            entries.append((url, data, fingerprint))
+                        yield url, result
+        finally:
+            if changed:
+                print(f"    Detail pages: {changed} changed since last load")
+            save_detail_cache(self.venue, entries)
+
+    async def fetch(self, urls: Sequence[str], fetch_many: FetchManyFn) -> List[Optional[Any]]:
+        """Return a result per URL, in order, fetching only uncached ones."""
+        async def iter_many(missing: List[str]):
+            for url, result in zip(missing, await fetch_many(missing)):
+                yield url, result
+
+        results = {url: result async for url, result in self.iter(urls, iter_many)}
+        return [results.get(url) for url in urls]
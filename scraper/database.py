@@ -1,20 +1,98 @@
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .dates import normalize_show
+from .shows import create_shows_tables, refresh_shows, stale_venues
 
 DB_PATH = Path(__file__).parent.parent / "comedy_images.db"
 
+_local = threading.local()
+
 
 def get_connection() -> sqlite3.Connection:
+    """Open a new standalone connection. The caller is responsible for closing it."""
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     return conn
 
 
+def connection() -> sqlite3.Connection:
+    """
+    Return this thread's shared connection, opening it on first use.
+
+    The connection stays open for the life of the thread (or until
+    close_connection()), and runs in WAL mode so readers such as
+    regenerate_shows.py are not blocked while a scrape is writing.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _local.conn = conn
+        _local.depth = 0
+    return conn
+
+
+def close_connection():
+    """Commit and close this thread's shared connection, if open."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.commit()
+        conn.close()
+        _local.conn = None
+        _local.depth = 0
+
+
+@contextmanager
+def unit_of_work() -> Iterator[sqlite3.Connection]:
+    """
+    Group writes into a single commit.
+
+    Module functions called inside the block skip their own commit; the
+    outermost block commits once on exit. Units nest. Rows written before an
+    error are still committed, matching the per-call commits this replaces.
+
+    Every asyncio task on the thread shares the connection and its open
+    transaction, so a unit must not span an await: do the network work
+    first, then write and commit synchronously. Otherwise the write lock
+    would be held across downloads and other tasks' rows would wait on its
+    commit.
+    """
+    conn = connection()
+    _local.depth += 1
+    try:
+        yield conn
+    finally:
+        _local.depth -= 1
+        if _local.depth == 0:
+            conn.commit()
+
+
+def _commit(conn: sqlite3.Connection):
+    """Commit unless a unit_of_work() is open on this thread."""
+    if not getattr(_local, "depth", 0):
+        conn.commit()
+
+
 def init_db():
-    """Initialize database tables if they don't exist."""
-    conn = get_connection()
+    """
+    Initialize database tables if they don't exist, and bring the shows
+    records up to date (rows changed by other tools, new rules or year).
+    """
+    conn = connection()
+    create_schema(conn)
+    refresh_shows(conn)
+    _commit(conn)
+
+
+def create_schema(conn: sqlite3.Connection):
+    """Create missing tables and run migrations on conn, without committing."""
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -26,6 +104,11 @@ def init_db():
         )
     """)
 
+    # Migration: fingerprint of the last stored listing (see scraper.main)
+    cursor.execute("PRAGMA table_info(venues)")
+    if "listing_fingerprint" not in [row["name"] for row in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE venues ADD COLUMN listing_fingerprint TEXT")
+
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS images (
             id INTEGER PRIMARY KEY,
@@ -41,11 +124,13 @@ def init_db():
         )
     """)
 
-    # Migration: add image_url column to existing databases
+    # Migration: add columns introduced after the original schema
     cursor.execute("PRAGMA table_info(images)")
     columns = [row["name"] for row in cursor.fetchall()]
-    if "image_url" not in columns:
-        cursor.execute("ALTER TABLE images ADD COLUMN image_url TEXT")
+    for column in ("image_url", "show_time", "etag", "last_modified",
+                   "show_start", "recurrence_day"):
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE images ADD COLUMN {column} TEXT")
 
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS sync_log (
@@ -61,16 +146,108 @@ def init_db():
         )
     """)
 
+    # Migration: blobstore.collect_garbage() counts references on each run;
+    # the table it used to rebuild went stale between runs
+    cursor.execute("DROP TABLE IF EXISTS blobs")
+
+    # Parsed results of per-event detail pages, see crawler.DetailCache
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS detail_cache (
+            venue TEXT NOT NULL,
+            url TEXT NOT NULL,
+            data TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            fetched_at TIMESTAMP NOT NULL,
+            PRIMARY KEY (venue, url)
+        )
+    """)
+
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_images_hash ON images(image_hash)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_images_source ON images(source_url)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_images_show_start ON images(show_start)")
+
+    # Ready-to-render show records, see shows.refresh_shows()
+    create_shows_tables(conn)
+
+    backfill_show_start(conn)
+
+
+def backfill_show_start(conn: sqlite3.Connection) -> int:
+    """
+    Fill show_start / recurrence_day on rows stored without them (rows from
+    before the columns existed, or written by other tools). Yearless dates
+    are read relative to when the row was scraped. Returns rows updated.
+    """
+    rows = conn.execute(
+        """SELECT id, event_date, show_time, scraped_at FROM images
+           WHERE show_start IS NULL AND recurrence_day IS NULL
+           AND event_date IS NOT NULL AND event_date != ''"""
+    ).fetchall()
+    updates = []
+    for row in rows:
+        try:
+            reference = datetime.fromisoformat(row["scraped_at"]).date()
+        except (TypeError, ValueError):
+            reference = None
+        show_start, recurrence_day = normalize_show(row["event_date"], row["show_time"], reference)
+        if show_start or recurrence_day:
+            updates.append((show_start, recurrence_day, row["id"]))
+    if updates:
+        conn.executemany(
+            "UPDATE images SET show_start = ?, recurrence_day = ? WHERE id = ?",
+            updates
+        )
+    return len(updates)
+
+
+def _connect_read_only(db: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(f"{Path(db).resolve().as_uri()}?mode=ro", uri=True, timeout=30)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def open_shows(db: Path = DB_PATH) -> sqlite3.Connection:
+    """
+    Open a read-only connection for reading the shows table. The scraper
+    keeps it current (init_db() and refresh_venue_shows()); venues that are
+    stale anyway - rows written by other tools, rules edited since the last
+    scrape, a database no scraper has opened yet - are refreshed through a
+    writable connection first. The caller closes it.
+    """
+    conn = _connect_read_only(db)
+    try:
+        ready = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'shows_state'"
+        ).fetchone()
+        if ready and not stale_venues(conn):
+            return conn
+    except Exception:
+        conn.close()
+        raise
 
-    conn.commit()
     conn.close()
+    setup = sqlite3.connect(db, timeout=30)
+    setup.row_factory = sqlite3.Row
+    try:
+        create_schema(setup)
+        refresh_shows(setup)
+        setup.commit()
+    finally:
+        setup.close()
+    return _connect_read_only(db)
+
+
+def refresh_venue_shows(venue_id: Optional[int] = None) -> int:
+    """Rebuild the shows records of one venue (or all) if its rows changed."""
+    conn = connection()
+    rebuilt = refresh_shows(conn, None if venue_id is None else [venue_id])
+    _commit(conn)
+    return rebuilt
 
 
 def get_or_create_venue(name: str, url: str) -> int:
     """Get venue ID, creating if it doesn't exist."""
-    conn = get_connection()
+    conn = connection()
     cursor = conn.cursor()
 
     cursor.execute("SELECT id FROM venues WHERE name = ?", (name,))
@@ -84,41 +261,57 @@ def get_or_create_venue(name: str, url: str) -> int:
             (name, url)
         )
         venue_id = cursor.lastrowid
-        conn.commit()
+        _commit(conn)
 
-    conn.close()
     return venue_id
 
 
 def update_venue_last_scraped(venue_id: int):
     """Update the last_scraped timestamp for a venue."""
-    conn = get_connection()
+    conn = connection()
     cursor = conn.cursor()
     cursor.execute(
         "UPDATE venues SET last_scraped = ? WHERE id = ?",
         (datetime.now().isoformat(), venue_id)
     )
-    conn.commit()
-    conn.close()
+    _commit(conn)
+
+
+def get_listing_fingerprint(venue_id: int) -> Optional[str]:
+    """Return the fingerprint of the venue's last fully stored listing."""
+    conn = connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT listing_fingerprint FROM venues WHERE id = ?", (venue_id,))
+    row = cursor.fetchone()
+    return row["listing_fingerprint"] if row else None
+
+
+def set_listing_fingerprint(venue_id: int, fingerprint: Optional[str]):
+    """Record (or with None, forget) the venue's listing fingerprint."""
+    conn = connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "UPDATE venues SET listing_fingerprint = ? WHERE id = ?",
+        (fingerprint, venue_id)
+    )
+    _commit(conn)
 
 
 def image_exists(source_url: str) -> bool:
     """Check if an image URL has already been scraped."""
-    conn = get_connection()
+    conn = connection()
     cursor = conn.cursor()
     cursor.execute("SELECT 1 FROM images WHERE source_url = ?", (source_url,))
     exists = cursor.fetchone() is not None
-    conn.close()
     return exists
 
 
 def hash_exists(image_hash: str) -> Optional[str]:
     """Check if an image hash exists, return local path if so."""
-    conn = get_connection()
+    conn = connection()
     cursor = conn.cursor()
     cursor.execute("SELECT local_path FROM images WHERE image_hash = ?", (image_hash,))
     row = cursor.fetchone()
-    conn.close()
     return row["local_path"] if row else None
 
 
@@ -133,27 +326,28 @@ def add_image(
     image_url: Optional[str] = None,
 ) -> int:
     """Add a new image record to the database."""
-    conn = get_connection()
+    show_start, recurrence_day = normalize_show(event_date, show_time)
+    conn = connection()
     cursor = conn.cursor()
     cursor.execute(
         """INSERT INTO images
-           (venue_id, source_url, local_path, image_hash, event_name, event_date, show_time, image_url)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-        (venue_id, source_url, local_path, image_hash, event_name, event_date, show_time, image_url)
+           (venue_id, source_url, local_path, image_hash, event_name, event_date, show_time,
+            image_url, show_start, recurrence_day)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        (venue_id, source_url, local_path, image_hash, event_name, event_date, show_time,
+         image_url, show_start, recurrence_day)
     )
     image_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    _commit(conn)
     return image_id
 
 
 def get_stored_image_url(source_url: str) -> Optional[str]:
     """Return the stored CDN image_url for a source_url, or None if not found."""
-    conn = get_connection()
+    conn = connection()
     cursor = conn.cursor()
     cursor.execute("SELECT image_url FROM images WHERE source_url = ?", (source_url,))
     row = cursor.fetchone()
-    conn.close()
     if row is None:
         return None
     return row["image_url"]
@@ -161,11 +355,10 @@ def get_stored_image_url(source_url: str) -> Optional[str]:
 
 def get_stored_image_hash(source_url: str) -> Optional[str]:
     """Return the stored image_hash for a source_url, or None if not found."""
-    conn = get_connection()
+    conn = connection()
     cursor = conn.cursor()
     cursor.execute("SELECT image_hash FROM images WHERE source_url = ?", (source_url,))
     row = cursor.fetchone()
-    conn.close()
     if row is None:
         return None
     return row["image_hash"]
@@ -173,7 +366,7 @@ def get_stored_image_hash(source_url: str) -> Optional[str]:
 
 def update_image(source_url: str, local_path: str, image_hash: str, image_url: str):
     """Update an existing image record when the flyer has changed."""
-    conn = get_connection()
+    conn = connection()
     cursor = conn.cursor()
     cursor.execute(
         """UPDATE images
@@ -181,33 +374,235 @@ def update_image(source_url: str, local_path: str, image_hash: str, image_url: s
            WHERE source_url = ?""",
         (local_path, image_hash, image_url, source_url)
     )
-    conn.commit()
-    conn.close()
+    _commit(conn)
 
 
 def backfill_image_url(source_url: str, image_url: str):
     """Set image_url on a legacy row that has NULL."""
-    conn = get_connection()
+    conn = connection()
     cursor = conn.cursor()
     cursor.execute(
         "UPDATE images SET image_url = ? WHERE source_url = ?",
         (image_url, source_url)
     )
-    conn.commit()
-    conn.close()
+    _commit(conn)
+
+
+class ImageSnapshot:
+    """
+    In-memory view of the images table for one venue run.
+
+    Answers the image_exists / get_stored_image_hash / hash_exists questions
+    from dicts loaded in a single query, and buffers new and changed rows so
+    flush() can write them back with executemany. Pending writes are visible
+    to later lookups, just as committed rows were to the per-call helpers.
+
+    by_source maps source_url -> (image_hash, image_url, local_path, etag,
+    last_modified); by_hash maps image_hash -> local_path.
+
+    Used as a context manager it flushes on exit, including after an error,
+    so rows gathered before a failure are still saved.
+    """
+
+    def __init__(
+        self,
+        venue_id: int,
+        by_source: Dict[str, Tuple[str, Optional[str], str, Optional[str], Optional[str]]],
+        by_hash: Dict[str, str],
+    ):
+        self.venue_id = venue_id
+        self.by_source = by_source
+        self.by_hash = by_hash
+        self._inserts: List[tuple] = []
+        self._updates: List[tuple] = []
+        self._validators: List[tuple] = []
+
+    def __enter__(self) -> "ImageSnapshot":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
+
+    def has_source(self, source_url: str) -> bool:
+        return source_url in self.by_source
+
+    def stored_hash(self, source_url: str) -> Optional[str]:
+        entry = self.by_source.get(source_url)
+        return entry[0] if entry else None
+
+    def has_flyer(self, source_url: str) -> bool:
+        entry = self.by_source.get(source_url)
+        return bool(entry and entry[2])
+
+    def path_for_hash(self, image_hash: str) -> Optional[str]:
+        return self.by_hash.get(image_hash)
+
+    def validators(self, source_url: str, image_url: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Return the stored (etag, last_modified) for a conditional re-download.
+
+        Only offered when the row still points at the same image_url and its
+        local file is on disk, so a 304 can never leave a row without a flyer.
+        """
+        entry = self.by_source.get(source_url)
+        if not entry:
+            return None, None
+        _, stored_url, local_path, etag, last_modified = entry
+        if stored_url != image_url or not local_path:
+            return None, None
+        if not (DB_PATH.parent / local_path).exists():
+            return None, None
+        return etag, last_modified
+
+    def set_validators(self, source_url: str, etag: Optional[str], last_modified: Optional[str]):
+        """Queue new ETag/Last-Modified values for an unchanged flyer."""
+        entry = self.by_source.get(source_url)
+        if entry is None or entry[3:] == (etag, last_modified):
+            return
+        self._validators.append((etag, last_modified, source_url))
+        self.by_source[source_url] = entry[:3] + (etag, last_modified)
+
+    def add(
+        self,
+        source_url: str,
+        local_path: str,
+        image_hash: str,
+        event_name: Optional[str] = None,
+        event_date: Optional[str] = None,
+        show_time: Optional[str] = None,
+        image_url: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        """Queue a new image row (see add_image)."""
+        show_start, recurrence_day = normalize_show(event_date, show_time)
+        self._inserts.append((
+            self.venue_id, source_url, local_path, image_hash,
+            event_name, event_date, show_time, image_url, etag, last_modified,
+            show_start, recurrence_day,
+        ))
+        self.by_source[source_url] = (image_hash, image_url, local_path, etag, last_modified)
+        self.by_hash.setdefault(image_hash, local_path)
+
+    def update(
+        self,
+        source_url: str,
+        local_path: str,
+        image_hash: str,
+        image_url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        """Queue a changed flyer for an existing row (see update_image)."""
+        self._updates.append((local_path, image_hash, image_url, etag, last_modified, source_url))
+        self.by_source[source_url] = (image_hash, image_url, local_path, etag, last_modified)
+        self.by_hash.setdefault(image_hash, local_path)
+
+    def flush(self):
+        """Write queued inserts, updates and validators in executemany batches."""
+        if not self._inserts and not self._updates and not self._validators:
+            return
+        conn = connection()
+        if self._inserts:
+            conn.executemany(
+                """INSERT INTO images
+                   (venue_id, source_url, local_path, image_hash, event_name, event_date,
+                    show_time, image_url, etag, last_modified, show_start, recurrence_day)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                self._inserts
+            )
+        if self._updates:
+            conn.executemany(
+                """UPDATE images
+                   SET local_path = ?, image_hash = ?, image_url = ?, etag = ?, last_modified = ?,
+                       scraped_at = CURRENT_TIMESTAMP
+                   WHERE source_url = ?""",
+                self._updates
+            )
+        if self._validators:
+            conn.executemany(
+                "UPDATE images SET etag = ?, last_modified = ? WHERE source_url = ?",
+                self._validators
+            )
+        self._inserts = []
+        self._updates = []
+        self._validators = []
+        _commit(conn)
+
+
+def load_image_snapshot(venue_id: int) -> ImageSnapshot:
+    """
+    Load every known source_url and image hash in one query.
+
+    source_url is unique across the whole table and shared flyers are reused
+    across venues, so the lookups cover all rows; only writes are venue-scoped.
+    """
+    conn = connection()
+    rows = conn.execute(
+        """SELECT source_url, image_hash, image_url, local_path, etag, last_modified
+           FROM images ORDER BY id"""
+    ).fetchall()
+
+    by_source = {}
+    by_hash = {}
+    for row in rows:
+        by_source[row["source_url"]] = (
+            row["image_hash"], row["image_url"], row["local_path"],
+            row["etag"], row["last_modified"],
+        )
+        by_hash.setdefault(row["image_hash"], row["local_path"])
+
+    return ImageSnapshot(venue_id, by_source, by_hash)
+
+
+def load_detail_cache(venue: str, max_age: int) -> Dict[str, Tuple[str, str]]:
+    """
+    Return {url: (data, fingerprint)} for a venue's detail pages fetched in
+    the last max_age seconds. Older rows are deleted.
+    """
+    conn = connection()
+    cutoff = (datetime.now() - timedelta(seconds=max_age)).isoformat()
+    conn.execute(
+        "DELETE FROM detail_cache WHERE venue = ? AND fetched_at < ?",
+        (venue, cutoff)
+    )
+    rows = conn.execute(
+        "SELECT url, data, fingerprint FROM detail_cache WHERE venue = ?",
+        (venue,)
+    ).fetchall()
+    _commit(conn)
+    return {row["url"]: (row["data"], row["fingerprint"]) for row in rows}
+
+
+def save_detail_cache(venue: str, entries: List[Tuple[str, str, str]]):
+    """Insert or refresh (url, data, fingerprint) detail cache rows for a venue."""
+    if not entries:
+        return
+    conn = connection()
+    fetched_at = datetime.now().isoformat()
+    conn.executemany(
+        """INSERT INTO detail_cache (venue, url, data, fingerprint, fetched_at)
+           VALUES (?, ?, ?, ?, ?)
+           ON CONFLICT(venue, url) DO UPDATE SET
+               data = excluded.data,
+               fingerprint = excluded.fingerprint,
+               fetched_at = excluded.fetched_at""",
+        [(venue, url, data, fingerprint, fetched_at) for url, data, fingerprint in entries]
+    )
+    _commit(conn)
 
 
 def start_sync_log(venue_id: int) -> int:
     """Start a sync log entry, return log ID."""
-    conn = get_connection()
+    conn = connection()
     cursor = conn.cursor()
     cursor.execute(
         "INSERT INTO sync_log (venue_id, started_at, status) VALUES (?, ?, ?)",
         (venue_id, datetime.now().isoformat(), "running")
     )
     log_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    _commit(conn)
     return log_id
 
 
@@ -219,7 +614,7 @@ def complete_sync_log(
     error_message: Optional[str] = None
 ):
     """Complete a sync log entry."""
-    conn = get_connection()
+    conn = connection()
     cursor = conn.cursor()
     cursor.execute(
         """UPDATE sync_log
@@ -228,13 +623,12 @@ def complete_sync_log(
            WHERE id = ?""",
         (datetime.now().isoformat(), images_found, images_new, status, error_message, log_id)
     )
-    conn.commit()
-    conn.close()
+    _commit(conn)
 
 
 def get_recent_syncs(venue_id: Optional[int] = None, limit: int = 10) -> list:
     """Get recent sync logs."""
-    conn = get_connection()
+    conn = connection()
     cursor = conn.cursor()
 
     if venue_id:
@@ -256,20 +650,72 @@ def get_recent_syncs(venue_id: Optional[int] = None, limit: int = 10) -> list:
         )
 
     rows = cursor.fetchall()
-    conn.close()
     return [dict(row) for row in rows]
 
 
+def prune_missing_shows(venue_id: int, source_urls: Iterable[str], since: str) -> int:
+    """
+    Delete a venue's rows starting at or after `since` (a show_start value)
+    whose source_url is not in source_urls. Returns count of deleted rows.
+    """
+    listed = set(source_urls)
+    conn = connection()
+    rows = conn.execute(
+        "SELECT id, source_url FROM images WHERE venue_id = ? AND show_start >= ?",
+        (venue_id, since)
+    ).fetchall()
+    missing = [(row["id"],) for row in rows if row["source_url"] not in listed]
+    if missing:
+        conn.executemany("DELETE FROM images WHERE id = ?", missing)
+    _commit(conn)
+    return len(missing)
+
+
+def correct_show_times(
+    venue_id: int,
+    correct: Callable[[Optional[str], Optional[str], Optional[str]], Tuple[Optional[str], Optional[str]]],
+) -> int:
+    """
+    Rewrite a venue's event_date / show_time with
+    correct(event_name, event_date, show_time), refreshing show_start and
+    recurrence_day to match. Returns count of rows changed.
+    """
+    conn = connection()
+    rows = conn.execute(
+        """SELECT id, event_name, event_date, show_time, scraped_at FROM images
+           WHERE venue_id = ? AND event_name IS NOT NULL""",
+        (venue_id,)
+    ).fetchall()
+    updates = []
+    for row in rows:
+        event_date, show_time = correct(row["event_name"], row["event_date"], row["show_time"])
+        if (event_date, show_time) == (row["event_date"], row["show_time"]):
+            continue
+        try:
+            reference = datetime.fromisoformat(row["scraped_at"]).date()
+        except (TypeError, ValueError):
+            reference = None
+        show_start, recurrence_day = normalize_show(event_date, show_time, reference)
+        updates.append((event_date, show_time, show_start, recurrence_day, row["id"]))
+    if updates:
+        conn.executemany(
+            """UPDATE images SET event_date = ?, show_time = ?, show_start = ?, recurrence_day = ?
+               WHERE id = ?""",
+            updates
+        )
+    _commit(conn)
+    return len(updates)
+
+
 def clear_venue_images(venue_name: str) -> int:
     """Clear all images for a specific venue. Returns count of deleted rows."""
-    conn = get_connection()
+    conn = connection()
     cursor = conn.cursor()
 
     # Get venue ID
     cursor.execute("SELECT id FROM venues WHERE name LIKE ?", (f"%{venue_name}%",))
     row = cursor.fetchone()
     if not row:
-        conn.close()
         return 0
 
     venue_id = row["id"]
@@ -278,6 +724,5 @@ def clear_venue_images(venue_name: str) -> int:
     cursor.execute("DELETE FROM images WHERE venue_id = ?", (venue_id,))
     deleted_count = cursor.rowcount
 
-    conn.commit()
-    conn.close()
+    _commit(conn)
     return deleted_count
@@ -0,0 +1,134 @@
+"""
+Normalised show dates.
+
+Venues list dates as free text: "Wednesday, Dec 24", "Dec 24", "January
+15, 2026", "Thu, Dec 18", or just "Monday" for weekly shows. Rows are
+normalised once, when they are stored, into two indexed columns:
+
+    show_start      ISO date or timestamp ("2026-01-15" or "2026-01-15T20:00")
+    recurrence_day  "mon".."sun" for shows listed only by weekday
+
+so readers can filter a date window in SQL instead of re-parsing every
+row with their own strptime fallbacks.
+"""
+
+import re
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple
+
+DAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+# A yearless date this far before the reference day is read as next year's
+# ("Jan 3" listed in late December)
+YEAR_ROLLOVER_DAYS = 30
+
+FORMATS_WITH_YEAR = [
+    "%A, %B %d, %Y",  # "Friday, February 13, 2026"
+    "%A, %b %d, %Y",  # "Friday, Feb 13, 2026"
+    "%a, %b %d, %Y",  # "Fri, Feb 13, 2026"
+    "%B %d, %Y",      # "January 27, 2026"
+    "%b %d, %Y",      # "Jan 27, 2026"
+    "%m/%d/%Y",       # "01/27/2026"
+    "%Y-%m-%d",       # "2026-01-27"
+]
+
+# Parsed with the year appended (yearless day-of-month parsing is deprecated)
+FORMATS_NO_YEAR = [
+    "%A, %b %d, %Y",  # "Tuesday, Jan 27"
+    "%A, %B %d, %Y",  # "Tuesday, January 27"
+    "%a, %b %d, %Y",  # "Tue, Jan 27"
+    "%b %d, %Y",      # "Jan 27"
+    "%B %d, %Y",      # "January 27"
+]
+
+WEEKDAY_PATTERN = re.compile(
+    r"^(?:every\s+)?(" + "|".join(DAY_NAMES) + r")s?$", re.IGNORECASE
+)
+TIME_PATTERN = re.compile(r"(\d{1,2})(?::(\d{2}))?\s*([AaPp])\.?[Mm]")
+
+
+def parse_show_date(event_date: Optional[str], reference: Optional[date] = None) -> Optional[date]:
+    """
+    The calendar date in an event_date string, or None. Yearless dates take
+    the year that puts them nearest after `reference` (today by default).
+    """
+    if not event_date:
+        return None
+    text = " ".join(event_date.split()).strip(" ,")
+    if not text:
+        return None
+
+    for fmt in FORMATS_WITH_YEAR:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+
+    reference = reference or date.today()
+    for fmt in FORMATS_NO_YEAR:
+        try:
+            parsed = datetime.strptime(f"{text}, {reference.year}", fmt).date()
+        except ValueError:
+            continue
+        if parsed < reference - timedelta(days=YEAR_ROLLOVER_DAYS):
+            try:
+                parsed = parsed.replace(year=reference.year + 1)
+            except ValueError:
+                # Feb 29 with no leap day next year
+                return None
+        return parsed
+
+    return None
+
+
+def parse_show_time(show_time: Optional[str]) -> Optional[Tuple[int, int]]:
+    """(hour, minute) of the first time in a show_time string like '8:00 PM'."""
+    if not show_time:
+        return None
+    match = TIME_PATTERN.search(show_time)
+    if not match:
+        return None
+    hour = int(match.group(1)) % 12
+    if match.group(3).lower() == "p":
+        hour += 12
+    minute = int(match.group(2) or 0)
+    if minute > 59:
+        return None
+    return hour, minute
+
+
+def recurrence_day(event_date: Optional[str]) -> Optional[str]:
+    """'mon'..'sun' for an event_date that is only a weekday ('Monday', 'Every Tuesday')."""
+    if not event_date:
+        return None
+    match = WEEKDAY_PATTERN.match(event_date.strip())
+    return match.group(1)[:3].lower() if match else None
+
+
+def normalize_show(
+    event_date: Optional[str],
+    show_time: Optional[str] = None,
+    reference: Optional[date] = None,
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    (show_start, recurrence_day) for a row. show_start is an ISO date, or
+    an ISO timestamp to the minute when the show time is known; both are
+    None when event_date is neither a date nor a weekday.
+    """
+    day = parse_show_date(event_date, reference)
+    if day is None:
+        return None, recurrence_day(event_date)
+
+    start_time = parse_show_time(show_time)
+    if start_time is None:
+        return day.isoformat(), None
+    start = datetime(day.year, day.month, day.day, *start_time)
+    return start.isoformat(timespec="minutes"), None
+
+
+def window_bounds(start: date, days: int) -> Tuple[str, str]:
+    """
+    show_start bounds for `days` days from `start`, inclusive of the last
+    day: rows match with `show_start >= lo AND show_start < hi`.
+    """
+    return start.isoformat(), (start + timedelta(days=days + 1)).isoformat()
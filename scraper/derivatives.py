@@ -0,0 +1,162 @@
+"""
+Responsive copies of downloaded flyers.
+
+Show cards paint flyers as CSS backgrounds a few hundred pixels wide, but
+the originals are often megabyte PNGs. After a flyer is saved, every
+DERIVATIVE_WIDTHS x DERIVATIVE_FORMATS copy is written to images/derived/
+as {hash[:16]}-{width}.{format}, keyed like the flyer's own filename, so a
+flyer shared by many shows is only resized once and existing copies are
+never redone. regenerate_shows.py lists the directory and emits image-set()
+backgrounds for the flyers whose copies are complete.
+"""
+
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Iterable, List, Optional, Set, Tuple
+
+from PIL import Image, ImageOps, features
+
+from .config import DERIVATIVE_WIDTHS, DERIVATIVE_FORMATS, DERIVATIVE_QUALITY, GC_SKIP_DIRS
+
+PROJECT_ROOT = Path(__file__).parent.parent
+# Relative to the site root, as the pages refer to it
+DERIVED_SUBDIR = "images/derived"
+DERIVED_DIR = PROJECT_ROOT / DERIVED_SUBDIR
+
+# Flyers are saved as {hash[:16]}{ext} (see downloader.download_and_save)
+KEY_PATTERN = re.compile(r"^[0-9a-f]{16}$")
+
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+
+
+def derivative_key(path: str) -> Optional[str]:
+    """The hash prefix naming a flyer's derivatives, or None for hand-named files."""
+    stem = Path(path).stem
+    return stem if KEY_PATTERN.match(stem) else None
+
+
+def derivative_name(key: str, width: int, fmt: str) -> str:
+    return f"{key}-{width}.{fmt}"
+
+
+def encodable_formats() -> List[str]:
+    """DERIVATIVE_FORMATS this Pillow build can write."""
+    return [fmt for fmt in DERIVATIVE_FORMATS if features.check(fmt)]
+
+
+def _save_atomic(image: Image.Image, target: Path, fmt: str):
+    """Write image to target via a temp file, so readers never see half a file."""
+    fd, temp_name = tempfile.mkstemp(dir=target.parent, suffix=".part")
+    os.close(fd)
+    try:
+        image.save(temp_name, format=fmt.upper(), quality=DERIVATIVE_QUALITY[fmt])
+        # mkstemp creates 0600 files; derivatives are served by the site
+        os.chmod(temp_name, 0o644)
+        os.replace(temp_name, target)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def make_derivatives(source: Path, key: str) -> int:
+    """
+    Write the missing derivatives of the flyer at `source`. A flyer
+    narrower than a width is re-encoded at its own size under that width's
+    name, so every set is complete. Returns how many files were written;
+    errors are reported and leave the flyer without (some) copies rather
+    than failing its download.
+    """
+    targets = [
+        (width, fmt, DERIVED_DIR / derivative_name(key, width, fmt))
+        for width in DERIVATIVE_WIDTHS
+        for fmt in encodable_formats()
+    ]
+    missing = [(width, fmt, target) for width, fmt, target in targets if not target.exists()]
+    if not missing:
+        return 0
+
+    written = 0
+    try:
+        DERIVED_DIR.mkdir(parents=True, exist_ok=True)
+        with Image.open(source) as original:
+            # First frame of animated GIFs, upright per EXIF orientation
+            image = ImageOps.exif_transpose(original)
+            if image.mode not in ("RGB", "RGBA"):
+                transparent = "A" in image.mode or "transparency" in image.info
+                image = image.convert("RGBA" if transparent else "RGB")
+
+            resized = {}
+            for width, fmt, target in missing:
+                if width not in resized:
+                    if image.width > width:
+                        height = round(image.height * width / image.width)
+                        resized[width] = image.resize((width, height), Image.Resampling.LANCZOS)
+                    else:
+                        resized[width] = image
+                _save_atomic(resized[width], target, fmt)
+                written += 1
+    except Exception as e:
+        print(f"  Could not make derivatives of {source}: {e}")
+    return written
+
+
+def derive_all() -> Tuple[int, int]:
+    """
+    Make the missing derivatives of every flyer already in the venue
+    directories. Returns (flyers seen, files written).
+    """
+    flyers = written = 0
+    for venue_dir in sorted(DERIVED_DIR.parent.iterdir()):
+        if not venue_dir.is_dir() or venue_dir.name in GC_SKIP_DIRS:
+            continue
+        for path in sorted(venue_dir.iterdir()):
+            key = derivative_key(path.name)
+            if path.is_file() and path.suffix != ".part" and key:
+                flyers += 1
+                written += make_derivatives(path, key)
+    return flyers, written
+
+
+def derivatives_on_disk(root: Path = PROJECT_ROOT) -> Set[str]:
+    """Names of the derivative files under root's images/derived/."""
+    try:
+        return {
+            entry.name for entry in os.scandir(Path(root) / DERIVED_SUBDIR)
+            if not entry.name.endswith(".part")
+        }
+    except FileNotFoundError:
+        return set()
+
+
+def derived_variants(image_path: str, on_disk: Set[str]) -> List[Tuple[str, str, int]]:
+    """
+    (path, mime type, width) of each derivative of the flyer at image_path,
+    best format first, for the formats whose widths are all on disk.
+    """
+    key = derivative_key(image_path)
+    if key is None:
+        return []
+    variants = []
+    for fmt in DERIVATIVE_FORMATS:
+        names = [derivative_name(key, width, fmt) for width in DERIVATIVE_WIDTHS]
+        if all(name in on_disk for name in names):
+            variants.extend(
+                (f"{DERIVED_SUBDIR}/{name}", MIME_TYPES[fmt], width)
+                for name, width in zip(names, DERIVATIVE_WIDTHS)
+            )
+    return variants
+
+
+def stale_derivatives(live_keys: Iterable[str]) -> List[Path]:
+    """Derivative files whose flyer is gone (or no longer kept)."""
+    live_keys = set(live_keys)
+    if not DERIVED_DIR.is_dir():
+        return []
+    return [
+        path for path in sorted(DERIVED_DIR.iterdir())
+        # .part files are derivatives still being written
+        if path.is_file() and path.suffix != ".part"
+        and path.name.split("-", 1)[0] not in live_keys
+    ]
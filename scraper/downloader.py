@@ -1,15 +1,51 @@
+import asyncio
 import hashlib
+import os
+import tempfile
 import aiohttp
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple, Union
 from urllib.parse import urlparse
 from PIL import Image
 import io
 
-from .config import MIN_IMAGE_WIDTH, MIN_IMAGE_HEIGHT, USER_AGENT
+from .config import (
+    MIN_IMAGE_WIDTH,
+    MIN_IMAGE_HEIGHT,
+    USER_AGENT,
+    DOWNLOAD_CONCURRENCY,
+    DOWNLOAD_CONNECTION_LIMIT,
+    DOWNLOAD_LIMIT_PER_HOST,
+    DNS_CACHE_TTL,
+    KEEPALIVE_TIMEOUT,
+    IMAGE_PROBE_CHUNK,
+    IMAGE_PROBE_LIMIT,
+    DOWNLOAD_CHUNK_SIZE,
+)
+from .derivatives import make_derivatives
 
 IMAGES_DIR = Path(__file__).parent.parent / "images"
 
+# Returned instead of image data when the server answers 304 to a
+# conditional request: the stored flyer is still current.
+NOT_MODIFIED = object()
+
+
+def create_session() -> aiohttp.ClientSession:
+    """
+    Create the aiohttp session shared by a scrape run.
+
+    Connections are kept alive and DNS answers cached between venues, with a
+    per-host cap so a burst of flyers from one CDN stays polite.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=DOWNLOAD_CONNECTION_LIMIT,
+        limit_per_host=DOWNLOAD_LIMIT_PER_HOST,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(connector=connector)
+
 
 def get_image_extension(url: str, content_type: Optional[str] = None) -> str:
     """Determine image extension from URL or content type."""
@@ -31,16 +67,84 @@ def get_image_extension(url: str, content_type: Optional[str] = None) -> str:
     return ".jpg"
 
 
-def calculate_hash(data: bytes) -> str:
-    """Calculate SHA256 hash of image data."""
-    return hashlib.sha256(data).hexdigest()
+# JPEG start-of-frame markers (excluding DHT, JPG and DAC, which share the range)
+JPEG_SOF_MARKERS = {
+    0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+    0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF,
+}
+
+
+def probe_image_size(header: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Read (width, height) from the start of a JPEG, PNG, GIF or WebP file.
+
+    Returns None if the format is not recognised or the header does not yet
+    contain the dimensions.
+    """
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        if len(header) >= 24 and header[12:16] == b"IHDR":
+            return (
+                int.from_bytes(header[16:20], "big"),
+                int.from_bytes(header[20:24], "big"),
+            )
+        return None
+
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        if len(header) >= 10:
+            return (
+                int.from_bytes(header[6:8], "little"),
+                int.from_bytes(header[8:10], "little"),
+            )
+        return None
+
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        chunk = header[12:16]
+        if chunk == b"VP8 " and len(header) >= 30:
+            return (
+                int.from_bytes(header[26:28], "little") & 0x3FFF,
+                int.from_bytes(header[28:30], "little") & 0x3FFF,
+            )
+        if chunk == b"VP8L" and len(header) >= 25:
+            bits = int.from_bytes(header[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b"VP8X" and len(header) >= 30:
+            return (
+                int.from_bytes(header[24:27], "little") + 1,
+                int.from_bytes(header[27:30], "little") + 1,
+            )
+        return None
 
+    if header[:2] == b"\xff\xd8":
+        # Walk the marker segments until the start-of-frame header
+        i = 2
+        while i + 4 <= len(header):
+            if header[i] != 0xFF:
+                return None
+            marker = header[i + 1]
+            if marker == 0xFF:
+                i += 1
+                continue
+            if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+                i += 2
+                continue
+            if marker in JPEG_SOF_MARKERS:
+                if i + 9 > len(header):
+                    return None
+                return (
+                    int.from_bytes(header[i + 7:i + 9], "big"),
+                    int.from_bytes(header[i + 5:i + 7], "big"),
+                )
+            i += 2 + int.from_bytes(header[i + 2:i + 4], "big")
+        return None
 
-def validate_image(data: bytes) -> Tuple[bool, Optional[Tuple[int, int]]]:
-    """Validate image data and check dimensions."""
+    return None
+
+
+def validate_image(data: Union[bytes, Path]) -> Tuple[bool, Optional[Tuple[int, int]]]:
+    """Validate image data (or an image file) and check dimensions."""
     try:
-        img = Image.open(io.BytesIO(data))
-        width, height = img.size
+        with Image.open(io.BytesIO(data) if isinstance(data, bytes) else data) as img:
+            width, height = img.size
         if width >= MIN_IMAGE_WIDTH and height >= MIN_IMAGE_HEIGHT:
             return True, (width, height)
         return False, (width, height)
@@ -48,79 +152,160 @@ def validate_image(data: bytes) -> Tuple[bool, Optional[Tuple[int, int]]]:
         return False, None
 
 
-async def download_image(
+def request_headers(etag: Optional[str] = None, last_modified: Optional[str] = None) -> dict:
+    """Build request headers, conditional when validators are given."""
+    headers = {"User-Agent": USER_AGENT}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+async def probe_response(response) -> Tuple[bytes, Optional[Tuple[int, int]]]:
+    """
+    Read just enough of a response body to find the image dimensions.
+
+    Returns the bytes read so far and (width, height), or None if the header
+    wasn't recognised within IMAGE_PROBE_LIMIT bytes.
+    """
+    header = b""
+    while len(header) < IMAGE_PROBE_LIMIT:
+        chunk = await response.content.read(IMAGE_PROBE_CHUNK)
+        if not chunk:
+            break
+        header += chunk
+        dimensions = probe_image_size(header)
+        if dimensions:
+            return header, dimensions
+    return header, None
+
+
+def is_large_enough(dimensions: Tuple[int, int]) -> bool:
+    """Check dimensions against MIN_IMAGE_WIDTH/MIN_IMAGE_HEIGHT."""
+    width, height = dimensions
+    return width >= MIN_IMAGE_WIDTH and height >= MIN_IMAGE_HEIGHT
+
+
+def get_venue_dir(venue_name: str) -> Path:
+    """Return (and create) the image directory for a venue."""
+    venue_dir = IMAGES_DIR / venue_name.lower().replace(" ", "_").replace("'", "")
+    venue_dir.mkdir(parents=True, exist_ok=True)
+    return venue_dir
+
+
+async def download_and_save(
     url: str,
     venue_name: str,
-    session: Optional[aiohttp.ClientSession] = None
-) -> Optional[Tuple[bytes, str, str]]:
+    session: Optional[aiohttp.ClientSession] = None,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+):
     """
-    Download an image from URL.
-    Returns: (image_data, hash, extension) or None if failed.
+    Download an image straight to disk and return its content-addressed path.
+
+    The body is streamed in DOWNLOAD_CHUNK_SIZE chunks into a SHA-256 and a
+    temp file in the venue directory at the same time, then renamed into
+    place as {hash[:16]}{ext}. If that file already exists the temp file is
+    discarded instead, so the flyer is never rewritten. Missing card
+    derivatives (scraper/derivatives.py) are then made off the event loop.
+    Returns: (local_path, hash, etag, last_modified), NOT_MODIFIED, or None if failed.
     """
     close_session = False
     if session is None:
         session = aiohttp.ClientSession()
         close_session = True
 
+    temp_path = None
     try:
-        headers = {"User-Agent": USER_AGENT}
+        headers = request_headers(etag, last_modified)
+
         async with session.get(url, headers=headers, timeout=30) as response:
+            if response.status == 304:
+                return NOT_MODIFIED
             if response.status != 200:
                 return None
 
             content_type = response.headers.get("Content-Type", "")
-            data = await response.read()
 
-            is_valid, dimensions = validate_image(data)
+            # Walk away from logos and thumbnails before fetching the rest
+            header, dimensions = await probe_response(response)
+            if dimensions and not is_large_enough(dimensions):
+                return None
+
+            venue_dir = get_venue_dir(venue_name)
+            fd, temp_name = tempfile.mkstemp(dir=venue_dir, suffix=".part")
+            temp_path = Path(temp_name)
+            # mkstemp creates 0600 files; flyers are served by the site
+            os.fchmod(fd, 0o644)
+
+            hasher = hashlib.sha256(header)
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    hasher.update(chunk)
+                    f.write(chunk)
+
+            new_etag = response.headers.get("ETag")
+            new_last_modified = response.headers.get("Last-Modified")
+
+        if not dimensions:
+            # Unrecognised header: let Pillow decide
+            is_valid, dimensions = validate_image(temp_path)
             if not is_valid:
                 return None
 
-            image_hash = calculate_hash(data)
-            extension = get_image_extension(url, content_type)
+        image_hash = hasher.hexdigest()
+        extension = get_image_extension(url, content_type)
+        filepath = venue_dir / f"{image_hash[:16]}{extension}"
+
+        if not filepath.exists():
+            os.replace(temp_path, filepath)
+            temp_path = None
 
-            return data, image_hash, extension
+        # Resized card copies; a no-op once they exist
+        await asyncio.to_thread(make_derivatives, filepath, image_hash[:16])
+
+        return (
+            str(filepath.relative_to(IMAGES_DIR.parent)),
+            image_hash,
+            new_etag,
+            new_last_modified,
+        )
 
     except Exception as e:
         print(f"Error downloading {url}: {e}")
         return None
     finally:
+        if temp_path is not None:
+            temp_path.unlink(missing_ok=True)
         if close_session:
             await session.close()
 
 
-def save_image(
-    data: bytes,
-    venue_name: str,
-    image_hash: str,
-    extension: str
-) -> str:
-    """Save image data to disk, return relative path."""
-    venue_dir = IMAGES_DIR / venue_name.lower().replace(" ", "_").replace("'", "")
-    venue_dir.mkdir(parents=True, exist_ok=True)
-
-    filename = f"{image_hash[:16]}{extension}"
-    filepath = venue_dir / filename
-
-    with open(filepath, "wb") as f:
-        f.write(data)
-
-    return str(filepath.relative_to(IMAGES_DIR.parent))
-
-
-async def download_and_save(
-    url: str,
+async def download_all(
+    jobs: List[Tuple[str, Optional[str], Optional[str]]],
     venue_name: str,
-    session: Optional[aiohttp.ClientSession] = None
-) -> Optional[Tuple[str, str]]:
+    session: aiohttp.ClientSession,
+    concurrency: int = DOWNLOAD_CONCURRENCY,
+) -> list:
     """
-    Download and save an image.
-    Returns: (local_path, hash) or None if failed.
+    Run download_and_save for many (url, etag, last_modified) jobs at once.
+
+    At most `concurrency` downloads are in flight; identical jobs are fetched
+    once. Results are returned in the same order as `jobs`.
     """
-    result = await download_image(url, venue_name, session)
-    if result is None:
-        return None
+    slots = asyncio.Semaphore(max(1, concurrency))
+    tasks = {}
+
+    async def fetch(url: str, etag: Optional[str], last_modified: Optional[str]):
+        async with slots:
+            return await download_and_save(url, venue_name, session, etag, last_modified)
 
-    data, image_hash, extension = result
-    local_path = save_image(data, venue_name, image_hash, extension)
+    for job in jobs:
+        if job not in tasks:
+            tasks[job] = asyncio.ensure_future(fetch(*job))
 
-    return local_path, image_hash
+    if tasks:
+        await asyncio.gather(*tasks.values())
+    return [tasks[job].result() for job in jobs]
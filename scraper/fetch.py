@@ -0,0 +1,82 @@
+"""
+Browserless HTTP tier for venues whose data is in JSON APIs or server-rendered
+HTML (JSON-LD, __NEXT_DATA__, plain links).
+
+Scrapers that set `requires_browser = False` implement
+`scrape_http(session)` with these helpers. A None result, a FetchError or
+any other exception (e.g. an API that changed shape) makes scraper.main
+fall back to the Playwright path for that venue.
+"""
+
+import asyncio
+import json
+from typing import Any, List, Optional
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+from .config import USER_AGENT, REQUEST_TIMEOUT
+
+
+class FetchError(Exception):
+    """A page or API could not be fetched or parsed over plain HTTP."""
+
+
+async def fetch_text(session: aiohttp.ClientSession, url: str) -> str:
+    """GET a page and return its body, raising FetchError unless it's a 200."""
+    try:
+        async with session.get(
+            url,
+            headers={"User-Agent": USER_AGENT},
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT / 1000),
+        ) as response:
+            if response.status != 200:
+                raise FetchError(f"{url} returned {response.status}")
+            return await response.text()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise FetchError(f"{url}: {e}") from e
+
+
+async def fetch_json(session: aiohttp.ClientSession, url: str) -> Any:
+    """GET a JSON API, raising FetchError on HTTP or decode errors."""
+    text = await fetch_text(session, url)
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        raise FetchError(f"{url} did not return JSON") from e
+
+
+async def fetch_html(session: aiohttp.ClientSession, url: str) -> BeautifulSoup:
+    """GET a page and parse it."""
+    return BeautifulSoup(await fetch_text(session, url), "lxml")
+
+
+def json_ld_items(soup: BeautifulSoup) -> List[dict]:
+    """All JSON-LD objects on a page, with top-level lists flattened."""
+    items = []
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or "")
+        except json.JSONDecodeError:
+            continue
+        for item in data if isinstance(data, list) else [data]:
+            if isinstance(item, dict):
+                items.append(item)
+    return items
+
+
+def next_data(soup: BeautifulSoup) -> Optional[dict]:
+    """The __NEXT_DATA__ payload of a server-rendered Next.js page."""
+    script = soup.find("script", id="__NEXT_DATA__")
+    if not script:
+        return None
+    try:
+        return json.loads(script.string or "")
+    except json.JSONDecodeError:
+        return None
+
+
+def meta_content(soup: BeautifulSoup, prop: str) -> Optional[str]:
+    """Content of a <meta property=...> tag (e.g. og:image)."""
+    tag = soup.find("meta", property=prop)
+    return tag.get("content") if tag else None
@@ -4,37 +4,305 @@ ATX Comedy Venue Image Scraper
 
 Usage:
     python -m scraper.main --all              # Scrape all venues
+    python -m scraper.main --all -c 3         # Scrape up to 3 venues at once
+    python -m scraper.main --all --refresh    # Reload cached event detail pages
     python -m scraper.main --venue creek_cave # Scrape specific venue
     python -m scraper.main --list             # List available venues
     python -m scraper.main --status           # Show recent sync status
+    python -m scraper.main --gc --dry-run     # Preview image garbage collection
+    python -m scraper.main --derive           # Make missing card image derivatives
+
+Set SCRAPER_BROWSER_ENDPOINT (e.g. http://127.0.0.1:9222, as served by
+`python -m scraper.browser`) to share one long-lived Chromium between runs.
 """
 
 import argparse
 import asyncio
+import hashlib
 import aiohttp
-from typing import Optional
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
 
 from playwright.async_api import async_playwright
 
 from .database import (
     init_db,
+    unit_of_work,
+    close_connection,
     get_or_create_venue,
     update_venue_last_scraped,
-    image_exists,
-    get_stored_image_hash,
-    update_image,
-    hash_exists,
-    add_image,
+    get_listing_fingerprint,
+    set_listing_fingerprint,
+    load_image_snapshot,
+    ImageSnapshot,
     start_sync_log,
     complete_sync_log,
     get_recent_syncs,
+    refresh_venue_shows,
+    prune_missing_shows,
+    correct_show_times,
+)
+from .blobstore import collect_garbage
+from .derivatives import derive_all
+from .browser import BrowserService, apply_request_policy, venue_block_policy
+from .downloader import create_session, download_all, NOT_MODIFIED
+from .fetch import FetchError
+from .config import (
+    VENUES,
+    USER_AGENT,
+    DOWNLOAD_CONCURRENCY,
+    STREAM_QUEUE_SIZE,
+    STREAM_BATCH_SIZE,
 )
-from .downloader import download_and_save
-from .config import VENUES, USER_AGENT
 from .venues import SCRAPERS
 
 
-async def scrape_venue(venue_key: str, browser) -> dict:
+# Marks the end of a scraper's record stream
+_END = object()
+
+
+def _source_url(img: dict) -> str:
+    """Use ticket_url as source_url for uniqueness, falling back to the image URL."""
+    return img.get("ticket_url") or img["url"]
+
+
+def _plan_download(known, img: dict) -> Optional[tuple]:
+    """Return the (url, etag, last_modified) download job for a record, if any."""
+    url = img["url"]
+    if not url or not url.strip():
+        return None
+    # Revalidate known flyers; fetch new ones unconditionally
+    etag, last_modified = known.validators(_source_url(img), url)
+    return url, etag, last_modified
+
+
+async def _store_batch(
+    known: ImageSnapshot,
+    images: list,
+    venue_name: str,
+    session: aiohttp.ClientSession,
+    download_concurrency: int,
+    keep_without_flyer: bool = False,
+) -> tuple:
+    """
+    Download a batch of records' flyers and apply them to the DB. Returns
+    (new, updated, complete); complete is False if a new show's flyer
+    failed to download. That show gets no row, or with keep_without_flyer
+    a row without a flyer, which a later run fills in.
+    """
+    new = 0
+    updated = 0
+    complete = True
+    # Download stage: fetch every flyer in parallel, with no transaction open...
+    jobs = [_plan_download(known, img) for img in images]
+    results = await download_all(
+        [job for job in jobs if job], venue_name, session, download_concurrency
+    )
+    downloaded = iter(results)
+
+    # ...then apply the results to the DB in listing order, in one commit
+    with unit_of_work():
+        for img, job in zip(images, jobs):
+            result = next(downloaded) if job else None
+            url = img["url"]
+            event_name = img.get("event_name")
+            event_date = img.get("event_date")
+            show_time = img.get("show_time")
+            ticket_url = img.get("ticket_url")
+            stored_url = _source_url(img)
+
+            # Check if this source_url already exists in the DB
+            if known.has_source(stored_url):
+                # Compare content hash to detect stale flyers
+                # (venues can update the image at the same CDN URL)
+                if result is None or result is NOT_MODIFIED:
+                    if result is None and job and not known.has_flyer(stored_url):
+                        # Stored without its flyer: try again next run
+                        complete = False
+                    continue
+
+                new_local_path, new_hash, etag, last_modified = result
+                stored_hash = known.stored_hash(stored_url)
+
+                if stored_hash and new_hash == stored_hash:
+                    # Content unchanged — remember validators for next run
+                    known.set_validators(stored_url, etag, last_modified)
+                    continue
+
+                # Content changed — update DB with new image
+                known.update(stored_url, new_local_path, new_hash, url, etag, last_modified)
+                updated += 1
+                print(f"  ~ Updated flyer: {event_name or url[:50]}")
+                continue
+
+            # New source_url — handle events with images
+            if job and (result is None or result is NOT_MODIFIED):
+                complete = False
+                if not keep_without_flyer:
+                    continue
+                # Failed flyer: store the show without one (see below)
+                job = None
+
+            if job:
+                local_path, image_hash, etag, last_modified = result
+
+                # If same image exists, reuse its path but still create new entry
+                # This allows recurring shows to share images but have separate listings
+                existing_path = known.path_for_hash(image_hash)
+                if existing_path:
+                    local_path = existing_path
+                    # Generate unique hash for this specific show date
+                    unique_str = f"{event_name}|{event_date}|{show_time}|{ticket_url}"
+                    image_hash = f"shared-{hashlib.md5(unique_str.encode()).hexdigest()[:12]}"
+            else:
+                # Handle events without images (but with valid data)
+                if not event_name or not event_date:
+                    continue
+                local_path = ""
+                etag = last_modified = None
+                # Generate unique hash from event details
+                unique_str = f"{event_name}|{event_date}|{show_time}"
+                image_hash = f"no-image-{hashlib.md5(unique_str.encode()).hexdigest()[:12]}"
+
+            known.add(
+                source_url=stored_url,
+                local_path=local_path,
+                image_hash=image_hash,
+                event_name=event_name,
+                event_date=event_date,
+                show_time=show_time,
+                image_url=url,
+                etag=etag,
+                last_modified=last_modified,
+            )
+            new += 1
+            if local_path:
+                print(f"  + New: {event_name or url[:50]}...")
+            else:
+                print(f"  + New (no image): {event_name} | {event_date} @ {show_time}")
+
+        known.flush()
+
+    return new, updated, complete
+
+
+async def _produce(records: AsyncIterator[dict], queue: asyncio.Queue):
+    """Feed a scraper's records into the queue, then the end marker."""
+    try:
+        async for record in records:
+            await queue.put(record)
+    finally:
+        await queue.put(_END)
+
+
+async def _iterate(images: list) -> AsyncIterator[dict]:
+    """An already-built listing (from scrape_http) as a record stream."""
+    for img in images:
+        yield img
+
+
+async def _store_stream(
+    records: AsyncIterator[dict],
+    scraper,
+    venue_id: int,
+    venue_name: str,
+    session: aiohttp.ClientSession,
+    download_concurrency: int,
+    refresh: bool,
+) -> tuple:
+    """
+    Store records while the scraper is still producing them.
+
+    The scraper runs as a producer task feeding a bounded queue, so it
+    pauses when downloads fall behind. Shows with no row yet are
+    downloaded and written in batches as they arrive. Shows already in the
+    DB only need revalidating, which the listing fingerprint can make
+    unnecessary, so they wait for the end of the listing, unless the run
+    already knows it will revalidate (--refresh, or a new show was
+    stored): then they stream too. Returns (found, new, updated, status).
+    """
+    queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+    producer = asyncio.ensure_future(_produce(records, queue))
+
+    listing = []
+    deferred = []
+    new = updated = 0
+    complete = True
+
+    async def store(batch: list):
+        nonlocal new, updated, complete
+        batch_new, batch_updated, batch_complete = await _store_batch(
+            known, batch, venue_name, session, download_concurrency,
+            scraper.keep_shows_without_flyer,
+        )
+        new += batch_new
+        updated += batch_updated
+        complete = complete and batch_complete
+
+    try:
+        with load_image_snapshot(venue_id) as known:
+            done = False
+            while not done:
+                # Take what has arrived (at least one record), up to a batch
+                batch = []
+                record = await queue.get()
+                while True:
+                    if record is _END:
+                        done = True
+                        break
+                    listing.append(record)
+                    if known.has_source(_source_url(record)) and not (refresh or new):
+                        deferred.append(record)
+                    else:
+                        batch.append(record)
+                    if len(batch) >= STREAM_BATCH_SIZE or queue.empty():
+                        break
+                    record = queue.get_nowait()
+                if batch:
+                    await store(batch)
+                if deferred and (refresh or new):
+                    # The fingerprint can no longer match: revalidate now
+                    batch, deferred = deferred, []
+                    for start in range(0, len(batch), STREAM_BATCH_SIZE):
+                        await store(batch[start:start + STREAM_BATCH_SIZE])
+
+            # Surface a scraper error (the end marker is sent either way)
+            await producer
+            print(f"  Found {len(listing)} images")
+
+            # Same listing as last time: nothing to revalidate or store
+            fingerprint = scraper.listing_fingerprint(listing)
+            if not refresh and not new and fingerprint == get_listing_fingerprint(venue_id):
+                print("  Listing unchanged since last run")
+                return len(listing), new, updated, "unchanged"
+
+            for start in range(0, len(deferred), STREAM_BATCH_SIZE):
+                await store(deferred[start:start + STREAM_BATCH_SIZE])
+    finally:
+        producer.cancel()
+
+    # The listing was read to the end: upcoming rows it no longer has are
+    # cancelled or rescheduled shows. An empty listing is more likely a
+    # broken page than an empty calendar, so it prunes nothing.
+    if scraper.prune_missing_shows and listing and not scraper.partial_listing:
+        since = datetime.now().isoformat(timespec="minutes")
+        pruned = prune_missing_shows(venue_id, [_source_url(img) for img in listing], since)
+        if pruned:
+            print(f"  - Removed {pruned} shows no longer listed")
+
+    # Only trust the fingerprint once every show has its row, so failed
+    # downloads are retried next run
+    set_listing_fingerprint(venue_id, fingerprint if complete else None)
+    return len(listing), new, updated, "success"
+
+
+async def scrape_venue(
+    venue_key: str,
+    browser,
+    session: Optional[aiohttp.ClientSession] = None,
+    download_concurrency: int = DOWNLOAD_CONCURRENCY,
+    refresh: bool = False,
+) -> dict:
     """Scrape a single venue and return stats."""
     if venue_key not in SCRAPERS:
         print(f"Unknown venue: {venue_key}")
@@ -43,6 +311,7 @@ async def scrape_venue(venue_key: str, browser) -> dict:
     config = VENUES[venue_key]
     scraper_class = SCRAPERS[venue_key]
     scraper = scraper_class()
+    scraper.refresh_details = refresh
 
     venue_id = get_or_create_venue(config["name"], config["url"])
     log_id = start_sync_log(venue_id)
@@ -52,110 +321,70 @@ async def scrape_venue(venue_key: str, browser) -> dict:
 
     images_found = 0
     images_new = 0
+    images_updated = 0
+    corrected = 0
     error_message = None
+    context = None
+    own_session = session is None
 
     try:
-        context = await browser.new_context(user_agent=USER_AGENT)
-        page = await context.new_page()
-
-        images = await scraper.scrape(page)
-        images_found = len(images)
-        print(f"  Found {images_found} images")
-
-        images_updated = 0
-
-        async with aiohttp.ClientSession() as session:
-            for img in images:
-                url = img["url"]
-                event_name = img.get("event_name")
-                event_date = img.get("event_date")
-                show_time = img.get("show_time")
-                ticket_url = img.get("ticket_url")
-
-                # Use ticket_url as source_url for uniqueness
-                stored_url = ticket_url or url
-
-                # Check if this source_url already exists in the DB
-                if image_exists(stored_url):
-                    if not url or not url.strip():
-                        continue
-
-                    # Re-download and compare content hash to detect stale flyers
-                    # (venues can update the image at the same CDN URL)
-                    result = await download_and_save(url, config["name"], session)
-                    if result is None:
-                        continue
-
-                    new_local_path, new_hash = result
-                    stored_hash = get_stored_image_hash(stored_url)
-
-                    if stored_hash and new_hash == stored_hash:
-                        # Content unchanged — skip
-                        continue
-
-                    # Content changed — update DB with new image
-                    update_image(stored_url, new_local_path, new_hash, url)
-                    images_updated += 1
-                    print(f"  ~ Updated flyer: {event_name or url[:50]}")
-                    continue
+        if own_session:
+            session = create_session()
+
+        # Plain HTTP first for venues that don't need rendering
+        images = None
+        if not scraper.requires_browser:
+            try:
+                images = await scraper.scrape_http(session)
+            except FetchError as e:
+                print(f"  HTTP fetch failed: {e}")
+            except Exception as e:
+                # An API that changed shape shouldn't cost the venue its run
+                print(f"  HTTP scrape failed: {type(e).__name__}: {e}")
+                images = None
+            if images is None:
+                print("  Falling back to browser")
+
+        if images is not None:
+            records = _iterate(images)
+        else:
+            context = await browser.new_context(user_agent=USER_AGENT)
+            await apply_request_policy(context, venue_block_policy(venue_key))
+            page = await context.new_page()
+            records = scraper.iter_records(page)
+
+        images_found, images_new, images_updated, status = await _store_stream(
+            records, scraper, venue_id, config["name"], session, download_concurrency, refresh
+        )
 
-                # New source_url — handle events with images
-                if url and url.strip():
-                    result = await download_and_save(url, config["name"], session)
-                    if result is None:
-                        continue
-
-                    local_path, image_hash = result
-
-                    # If same image exists, reuse its path but still create new entry
-                    # This allows recurring shows to share images but have separate listings
-                    existing_path = hash_exists(image_hash)
-                    if existing_path:
-                        local_path = existing_path
-                        # Generate unique hash for this specific show date
-                        import hashlib as hl
-                        unique_str = f"{event_name}|{event_date}|{show_time}|{ticket_url}"
-                        image_hash = f"shared-{hl.md5(unique_str.encode()).hexdigest()[:12]}"
-                else:
-                    # Handle events without images (but with valid data)
-                    if not event_name or not event_date:
-                        continue
-                    local_path = ""
-                    # Generate unique hash from event details
-                    import hashlib
-                    unique_str = f"{event_name}|{event_date}|{show_time}"
-                    image_hash = f"no-image-{hashlib.md5(unique_str.encode()).hexdigest()[:12]}"
-
-                add_image(
-                    venue_id=venue_id,
-                    source_url=stored_url,
-                    local_path=local_path,
-                    image_hash=image_hash,
-                    event_name=event_name,
-                    event_date=event_date,
-                    show_time=show_time,
-                    image_url=url,
-                )
-                images_new += 1
-                if local_path:
-                    print(f"  + New: {event_name or url[:50]}...")
-                else:
-                    print(f"  + New (no image): {event_name} | {event_date} @ {show_time}")
+        if scraper.known_shows is not None:
+            corrected = correct_show_times(venue_id, scraper.known_show_times)
+            if corrected:
+                print(f"  ~ Corrected day/time of {corrected} recurring shows")
 
-        await context.close()
         update_venue_last_scraped(venue_id)
-        status = "success"
 
     except Exception as e:
         error_message = str(e)
         status = "failed"
         print(f"  Error: {error_message}")
+    finally:
+        if context is not None:
+            await context.close()
+        if own_session and session is not None:
+            await session.close()
 
     complete_sync_log(log_id, images_found, images_new, status, error_message)
-    parts = [f"{images_new} new"]
-    if images_updated:
-        parts.append(f"{images_updated} updated")
-    print(f"  Done: {', '.join(parts)} images saved")
+    if status != "unchanged" or corrected:
+        # Even a failed run may have stored some rows
+        refresh_venue_shows(venue_id)
+    if status == "unchanged":
+        print("  Done: nothing to update")
+    else:
+        parts = [f"{images_new} new"]
+        if images_updated:
+            parts.append(f"{images_updated} updated")
+        print(f"  Done: {', '.join(parts)} images saved")
 
     return {
         "venue": config["name"],
@@ -167,13 +396,96 @@ async def scrape_venue(venue_key: str, browser) -> dict:
     }
 
 
-async def scrape_all(browser) -> list:
-    """Scrape all venues."""
-    results = []
-    for venue_key in SCRAPERS.keys():
-        result = await scrape_venue(venue_key, browser)
-        results.append(result)
-    return results
+async def scrape_all(
+    browser,
+    concurrency: int = 1,
+    session: Optional[aiohttp.ClientSession] = None,
+    download_concurrency: int = DOWNLOAD_CONCURRENCY,
+    refresh: bool = False,
+    venue_keys: Optional[List[str]] = None,
+) -> list:
+    """
+    Scrape all venues, or just `venue_keys`.
+
+    With concurrency > 1, venues share the one browser but each gets its own
+    context; at most `concurrency` contexts are open at a time. Results are
+    returned in SCRAPERS order (or the order given) regardless of which venue
+    finishes first.
+    """
+    if venue_keys is None:
+        venue_keys = list(SCRAPERS.keys())
+
+    if concurrency <= 1:
+        results = []
+        for venue_key in venue_keys:
+            result = await scrape_venue(venue_key, browser, session, download_concurrency, refresh)
+            results.append(result)
+        return results
+
+    slots = asyncio.Semaphore(concurrency)
+
+    async def scrape_in_slot(venue_key: str) -> dict:
+        async with slots:
+            return await scrape_venue(venue_key, browser, session, download_concurrency, refresh)
+
+    return list(await asyncio.gather(
+        *(scrape_in_slot(venue_key) for venue_key in venue_keys)
+    ))
+
+
+async def run_venues(
+    venue_keys: Optional[List[str]] = None,
+    concurrency: int = 1,
+    download_concurrency: int = DOWNLOAD_CONCURRENCY,
+    refresh: bool = False,
+) -> list:
+    """
+    Scrape venues (all of SCRAPERS by default) in one run: one Playwright
+    instance, one browser launched only if a venue needs it, one HTTP
+    session and one DB connection, closed when the run ends.
+    """
+    init_db()
+    try:
+        async with async_playwright() as p, create_session() as session:
+            # Chromium only starts if some venue needs it
+            browser = BrowserService(p)
+            try:
+                return await scrape_all(
+                    browser, concurrency, session, download_concurrency, refresh, venue_keys
+                )
+            finally:
+                await browser.close()
+    finally:
+        close_connection()
+
+
+def print_summary(results: list):
+    """Print the per-venue results of a run."""
+    print("\n" + "=" * 50)
+    print("SUMMARY")
+    print("=" * 50)
+
+    total_found = 0
+    total_new = 0
+    total_updated = 0
+    for r in results:
+        total_found += r.get("images_found", 0)
+        total_new += r.get("images_new", 0)
+        total_updated += r.get("images_updated", 0)
+        status_icon = "[OK]" if r["status"] in ("success", "unchanged") else "[FAIL]"
+        if r["status"] == "unchanged":
+            print(f"{status_icon} {r['venue']}: unchanged")
+            continue
+        parts = [f"{r.get('images_new', 0)} new"]
+        if r.get("images_updated", 0):
+            parts.append(f"{r['images_updated']} updated")
+        print(f"{status_icon} {r['venue']}: {', '.join(parts)} images")
+
+    print("-" * 50)
+    summary = f"Total: {total_found} found, {total_new} new"
+    if total_updated:
+        summary += f", {total_updated} updated"
+    print(summary)
 
 
 def list_venues():
@@ -185,6 +497,27 @@ def list_venues():
     print()
 
 
+def run_gc(dry_run: bool):
+    """Dedupe identical flyers and delete unreferenced ones."""
+    print("\nCollecting unreferenced images" + (" (dry run)..." if dry_run else "..."))
+    stats = collect_garbage(dry_run=dry_run)
+    verb = "Would free" if dry_run else "Freed"
+    print(
+        f"{stats['files']} files scanned, {stats['deduped']} duplicates merged "
+        f"({stats['rows_rewritten']} rows rewritten), {stats['deleted']} files removed"
+    )
+    print(f"{verb} {stats['bytes_freed'] / (1024 * 1024):.1f} MB")
+    print()
+
+
+def run_derive():
+    """Make the WebP/AVIF card copies of flyers downloaded before they existed."""
+    print("\nMaking card image derivatives...")
+    flyers, written = derive_all()
+    print(f"{flyers} flyers checked, {written} derivatives written")
+    print()
+
+
 def show_status():
     """Show recent sync status."""
     syncs = get_recent_syncs(limit=20)
@@ -234,57 +567,71 @@ async def main():
         action="store_true",
         help="Show recent sync status"
     )
+    parser.add_argument(
+        "--concurrency", "-c",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Scrape up to N venues in parallel with --all (default: 1)"
+    )
+    parser.add_argument(
+        "--downloads",
+        type=int,
+        default=DOWNLOAD_CONCURRENCY,
+        metavar="N",
+        help=f"Download up to N flyers per venue in parallel (default: {DOWNLOAD_CONCURRENCY})"
+    )
 
-    args = parser.parse_args()
-
-    init_db()
-
-    if args.list:
-        list_venues()
-        return
-
-    if args.status:
-        show_status()
-        return
-
-    if not args.venue and not args.all:
-        parser.print_help()
-        return
-
-    print("Starting ATX Comedy Image Scraper...")
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-
-        if args.all:
-            results = await scrape_all(browser)
-        elif args.venue:
-            results = [await scrape_venue(args.venue, browser)]
-
-        await browser.close()
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Reload event detail pages even if they are in the detail cache"
+    )
 
-    print("\n" + "=" * 50)
-    print("SUMMARY")
-    print("=" * 50)
+    parser.add_argument(
+        "--gc",
+        action="store_true",
+        help="Dedupe identical images and delete unreferenced ones"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="With --gc, only report what would be removed"
+    )
+    parser.add_argument(
+        "--derive",
+        action="store_true",
+        help="Make missing resized card copies of downloaded flyers"
+    )
 
-    total_found = 0
-    total_new = 0
-    total_updated = 0
-    for r in results:
-        total_found += r.get("images_found", 0)
-        total_new += r.get("images_new", 0)
-        total_updated += r.get("images_updated", 0)
-        status_icon = "[OK]" if r["status"] == "success" else "[FAIL]"
-        parts = [f"{r.get('images_new', 0)} new"]
-        if r.get("images_updated", 0):
-            parts.append(f"{r['images_updated']} updated")
-        print(f"{status_icon} {r['venue']}: {', '.join(parts)} images")
+    args = parser.parse_args()
+    if args.dry_run and not args.gc:
+        parser.error("--dry-run only applies to --gc")
 
-    print("-" * 50)
-    summary = f"Total: {total_found} found, {total_new} new"
-    if total_updated:
-        summary += f", {total_updated} updated"
-    print(summary)
+    init_db()
+    try:
+        if args.list:
+            list_venues()
+        elif args.status:
+            show_status()
+        elif args.gc:
+            run_gc(args.dry_run)
+        elif args.derive:
+            run_derive()
+        elif not args.venue and not args.all:
+            parser.print_help()
+        else:
+            print("Starting ATX Comedy Image Scraper...")
+
+            results = await run_venues(
+                None if args.all else [args.venue],
+                args.concurrency,
+                args.downloads,
+                args.refresh,
+            )
+            print_summary(results)
+    finally:
+        close_connection()
 
 
 if __name__ == "__main__":
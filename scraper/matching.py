@@ -0,0 +1,140 @@
+"""
+Show-name lookups against hand-maintained tables.
+
+The site renderer maps show names to days, ticket URLs and free/paid flags
+with tables of lowercase name fragments, where a row matches if its key
+appears in the show name or the show name appears in its key. Scanning a
+table per show and direction is quadratic over a night's listings, so
+ShowMatcher compiles a table once:
+
+- keys found *in* a name come from one pass of an Aho-Corasick automaton
+  over the name;
+- keys that *contain* the name come from one str.find over the keys joined
+  in table order, whose first hit is the earliest such key.
+
+Results are memoized per name, and ties resolve to the earliest key in the
+table, exactly as the linear scans did.
+"""
+
+from bisect import bisect_right
+from collections import deque
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+# Separates keys in the joined string; never part of a show name
+_SEPARATOR = "\x00"
+
+_MISS = object()
+
+
+class ShowMatcher:
+    """
+    Compiled lookup over a {fragment: value} table (or a list of fragments,
+    whose values are the fragments themselves). Keys are matched as given,
+    so callers lowercase both the table and the names.
+    """
+
+    def __init__(self, table: Union[Mapping[str, Any], Iterable[str]]):
+        if not isinstance(table, Mapping):
+            table = {key: key for key in table}
+        self.keys: List[str] = list(table)
+        self.values: List[Any] = list(table.values())
+        self._index: Dict[str, int] = {}
+        for i, key in enumerate(self.keys):
+            self._index.setdefault(key, i)
+
+        self._joined = _SEPARATOR.join(self.keys)
+        # Offset of each key in _joined, for mapping a find() hit to its key
+        self._starts: List[int] = []
+        offset = 0
+        for key in self.keys:
+            self._starts.append(offset)
+            offset += len(key) + 1
+
+        self._build_automaton()
+        self._found: Dict[str, Any] = {}
+        self._looked_up: Dict[str, Any] = {}
+
+    def _build_automaton(self):
+        """Trie of the keys plus failure links (Aho-Corasick)."""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Earliest table index of any key ending at the state, via fail links
+        self._out: List[Optional[int]] = [None]
+
+        for i, key in enumerate(self.keys):
+            state = 0
+            for ch in key:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(None)
+                state = nxt
+            if self._out[state] is None:
+                self._out[state] = i
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = _earliest(self._out[nxt], self._out[self._fail[nxt]])
+
+    def _first_key_in(self, text: str) -> Optional[int]:
+        """Table index of the earliest key that occurs in text."""
+        best = self._out[0]  # an empty key occurs in everything
+        state = 0
+        for ch in text:
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            best = _earliest(best, self._out[state])
+            if best == 0:
+                break
+        return best
+
+    def _first_key_containing(self, text: str) -> Optional[int]:
+        """Table index of the earliest key that contains text."""
+        if _SEPARATOR in text or not self.keys:
+            return None
+        pos = self._joined.find(text)
+        if pos < 0:
+            return None
+        # The hit lies inside the last key starting at or before pos
+        return bisect_right(self._starts, pos) - 1
+
+    def find(self, text: str) -> Any:
+        """Value of the earliest key that occurs in text, or None."""
+        value = self._found.get(text, _MISS)
+        if value is _MISS:
+            i = self._first_key_in(text)
+            value = self._found[text] = None if i is None else self.values[i]
+        return value
+
+    def lookup(self, name: str) -> Any:
+        """
+        Value for an exact key, else for the earliest key that occurs in
+        name or that name occurs in; None if there is none.
+        """
+        value = self._looked_up.get(name, _MISS)
+        if value is _MISS:
+            i = self._index.get(name)
+            if i is None:
+                i = _earliest(self._first_key_in(name), self._first_key_containing(name))
+            value = self._looked_up[name] = None if i is None else self.values[i]
+        return value
+
+
+def _earliest(a: Optional[int], b: Optional[int]) -> Optional[int]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
@@ -0,0 +1,207 @@
+"""
+In-process pipeline for the daily update (run_all_scrapers.py).
+
+The run is a small dependency graph of steps: one scrape step per venue,
+then making any missing card image derivatives, then rendering the site,
+then (optionally) the Instagram post content.
+Every step starts as soon as the steps it depends on have finished, so the
+venue scrapes share one browser and HTTP session and run side by side, and
+nothing pays for another interpreter or Chromium launch.
+
+A step whose dependency failed still runs, as the old subprocess chain
+carried on after a failed step; the run as a whole fails if any step did.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from graphlib import TopologicalSorter
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from playwright.async_api import async_playwright
+
+from .browser import BrowserService
+from .config import DOWNLOAD_CONCURRENCY
+from .database import DB_PATH, init_db, close_connection
+from .derivatives import derive_all
+from .downloader import create_session
+from .main import scrape_venue, print_summary
+from .venues import SCRAPERS
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Venue scrapes running at once (each holds a browser context while it runs)
+PIPELINE_CONCURRENCY = 3
+
+
+class Step:
+    """
+    One node of the pipeline: an async callable and the names of the steps
+    it waits for. run() may return a short detail for the timing table;
+    raising marks the step failed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[], Awaitable[Optional[str]]],
+        after: Iterable[str] = (),
+    ):
+        self.name = name
+        self.run = run
+        self.after = tuple(after)
+        self.ok: Optional[bool] = None
+        self.detail = ""
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+async def run_steps(steps: List[Step]) -> bool:
+    """
+    Run every step once all of its dependencies have finished. Returns True
+    if every step succeeded. Raises ValueError for an unknown dependency and
+    graphlib.CycleError for a cycle, before anything runs.
+    """
+    names = {step.name for step in steps}
+    for step in steps:
+        for dep in step.after:
+            if dep not in names:
+                raise ValueError(f"Step {step.name!r} depends on unknown step {dep!r}")
+    TopologicalSorter({step.name: step.after for step in steps}).prepare()
+
+    finished = {step.name: asyncio.Event() for step in steps}
+
+    async def run_one(step: Step):
+        for dep in step.after:
+            await finished[dep].wait()
+        print(f"\n>>> {step.name}")
+        step.started = time.monotonic()
+        try:
+            step.detail = await step.run() or ""
+            step.ok = True
+        except Exception as e:
+            step.detail = str(e) or type(e).__name__
+            step.ok = False
+            print(f"WARNING: {step.name} failed: {step.detail}")
+        finally:
+            step.finished = time.monotonic()
+            finished[step.name].set()
+
+    await asyncio.gather(*(run_one(step) for step in steps))
+    return all(step.ok for step in steps)
+
+
+def print_timings(steps: List[Step], origin: float):
+    """Per-step table: status, start offset from `origin`, and duration."""
+    width = max(len(step.name) for step in steps)
+    print("\n" + "=" * 60)
+    print("TIMINGS")
+    print("=" * 60)
+    print(f"{'Step':<{width}}  {'Status':<6}  {'Start':>7}  {'Time':>7}  Detail")
+    print("-" * 60)
+    for step in sorted(steps, key=lambda s: s.started or 0):
+        status = "ok" if step.ok else "FAILED"
+        start = (step.started or origin) - origin
+        print(
+            f"{step.name:<{width}}  {status:<6}  {start:>6.1f}s  "
+            f"{step.elapsed:>6.1f}s  {step.detail}"
+        )
+    print("-" * 60)
+    print(f"Wall time: {time.monotonic() - origin:.1f}s")
+
+
+def render_site() -> str:
+    """Regenerate shows.html and index.html from the database."""
+    from regenerate_shows import render_site as render
+
+    written = render(DB_PATH, datetime.now(), PROJECT_ROOT)
+    if not written:
+        return "unchanged"
+    return ", ".join(path.name for path in written)
+
+
+def generate_instagram(target_date: datetime) -> str:
+    """Write today's Instagram caption, images and summary."""
+    # Pillow and the caption client are only needed for this step
+    from instagram.generate_daily_post import generate_content
+
+    output_dir = generate_content(target_date)
+    if output_dir is None:
+        raise RuntimeError("no shows found for the post")
+    return str(output_dir.relative_to(PROJECT_ROOT))
+
+
+async def run_pipeline(
+    concurrency: int = PIPELINE_CONCURRENCY,
+    refresh: bool = False,
+    instagram: bool = False,
+) -> List[Step]:
+    """
+    Scrape every venue, render the site and optionally generate the
+    Instagram content, in one process. Returns the finished steps.
+    """
+    origin = time.monotonic()
+    init_db()
+    slots = asyncio.Semaphore(concurrency)
+    results: Dict[str, dict] = {}
+
+    try:
+        async with async_playwright() as p, create_session() as session:
+            # Chromium only starts if some venue needs it
+            browser = BrowserService(p)
+
+            def scrape_step(venue_key: str) -> Step:
+                async def run() -> str:
+                    async with slots:
+                        result = await scrape_venue(
+                            venue_key, browser, session, DOWNLOAD_CONCURRENCY, refresh
+                        )
+                    results[venue_key] = result
+                    # A venue that fails is reported but, as with
+                    # `scraper.main --all`, doesn't fail the run
+                    if result["status"] == "failed":
+                        return f"venue failed: {result['error']}"
+                    if result["status"] == "unchanged":
+                        return "unchanged"
+                    return f"{result['images_found']} found, {result['images_new']} new"
+                return Step(f"scrape:{venue_key}", run)
+
+            steps = [scrape_step(venue_key) for venue_key in SCRAPERS]
+            scrape_names = [step.name for step in steps]
+
+            # Flyers saved before derivatives existed (or whose copies
+            # failed) get them here, so the render can use them
+            async def derive() -> str:
+                flyers, written = await asyncio.to_thread(derive_all)
+                return f"{flyers} flyers, {written} written"
+
+            steps.append(Step("derive", derive, after=scrape_names))
+
+            async def render() -> str:
+                return await asyncio.to_thread(render_site)
+
+            steps.append(Step("render", render, after=["derive"]))
+
+            if instagram:
+                async def post_content() -> str:
+                    return await asyncio.to_thread(generate_instagram, datetime.now())
+
+                steps.append(Step("instagram", post_content, after=["render"]))
+
+            try:
+                await run_steps(steps)
+            finally:
+                await browser.close()
+    finally:
+        close_connection()
+
+    print_summary([results[key] for key in SCRAPERS if key in results])
+    print_timings(steps, origin)
+    return steps
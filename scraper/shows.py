@@ -0,0 +1,736 @@
+"""
+Materialized show records.
+
+Every page and post is built from the same transformation of a raw images
+row: clean the name ("Poster for ..." alt text, two-line titles), work out
+the day of week, resolve the ticket URL, and flag free and sold-out shows.
+It used to be redone, slightly differently, by each renderer against the
+images JOIN venues query. Here it runs once per row and is stored in the
+`shows` table, indexed by date, venue and price. Readers select
+ready-to-render records with one query.
+
+refresh_shows() rebuilds a venue's records only when the venue's rows (or
+the rules in this file) have changed since the last rebuild, as recorded by
+a fingerprint in shows_state. The scraper refreshes a venue right after
+storing it, and every venue when it opens the database (init_db()).
+Readers open it read-only with database.open_shows(), which first
+refreshes any venue that is stale (stale_venues()): rows written by other
+tools, or rules edited since the last scrape.
+"""
+
+import hashlib
+import re
+import sqlite3
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .dates import DAY_NAMES
+from .matching import ShowMatcher
+
+# Venues that list the same show on several days or times; their records
+# are de-duplicated per date and time instead of per name
+DATED_VENUES = ["bull", "gnar", "cap city", "secret level"]
+
+
+# Known free shows (scraped from venue websites)
+FREE_SHOWS = [
+    # Creek and Cave free shows
+    'the monday gamble mic',
+    'monday gamble',
+    'monday night gimmick mic',
+    'gimmick mic',
+    'dunk tank',
+    'hood therapy',
+    'off the cuff',
+    'wild west wednesdays',
+    'bear arms',
+    'word up',
+    'new joke saturday',
+    'new joke monday',
+    'the creek and the cave open mic',
+    'creek open mic',
+    # Note: removed generic 'open mic' - Cap City open mic is $5
+    'banana phone',
+    'writers room',
+    # Gnar Bar - only Crowd Control is free (pay what you want)
+    'crowd control',
+]
+
+# Shows that are sold out (will be updated by scraper)
+SOLD_OUT_SHOWS = []
+
+# Correct day mappings for Creek and Cave shows
+# VERIFIED from ShowClix on 2025-12-16
+CREEK_CAVE_DAYS = {
+    # Monday (verified)
+    'the monday gamble mic': 'Monday',
+    'clocked out comedy': 'Monday',
+    'new joke monday': 'Monday',
+    'monday night gimmick mic': 'Monday',
+    # Tuesday (verified)
+    'dunk tank': 'Tuesday',
+    'optimum noctis': 'Tuesday',
+    'hood therapy tuesdays': 'Tuesday',
+    # Wednesday (verified)
+    'off the cuff': 'Wednesday',
+    'absolute show': 'Wednesday',
+    'the forge': 'Wednesday',
+    'wild west wednesdays': 'Wednesday',
+    'comedians on the rise': 'Wednesday',
+    # Thursday (verified)
+    'bear arms: open mic': 'Thursday',
+    'bear arms open mic': 'Thursday',
+    'gator tales': 'Thursday',
+    'unscripted: a tag team comedy show': 'Thursday',
+    'unscripted': 'Thursday',
+    'word up! open mic': 'Thursday',
+    'word up open mic': 'Thursday',
+    # Friday (verified)
+    'show us the big naturals': 'Friday',
+    'roast battle: austin': 'Friday',
+    'roast battle austin': 'Friday',
+    'laughs with the staff': 'Friday',
+    # Saturday (verified)
+    'new joke saturday open mic': 'Saturday',
+    'new joke saturday': 'Saturday',
+    'creek featured': 'Saturday',
+    'main course comedy': 'Saturday',
+    'freaky': 'Saturday',
+    'christmas at the creek': 'Saturday',
+    'christmas at the creek!': 'Saturday',
+    # Sunday (verified)
+    "writers' room": 'Sunday',
+    'writers room': 'Sunday',
+    'the creek and the cave open mic': 'Sunday',
+    'banana phone': 'Sunday',
+    # Special events (date-specific)
+    'algonauts': 'Monday',
+    'the roast of santa': 'Tuesday',
+    'king of the creek': 'Tuesday',
+    'comedy powered by bilt': 'Monday',
+    'the roast of 2025': 'Tuesday',
+    "lukas mccrary's nye comedy spectacular": 'Wednesday',
+}
+
+# Velveeta Room day mappings (for recurring shows without specific dates)
+VELVEETA_DAYS = {
+    # Weekly recurring shows
+    'cocktails and comedy': 'Sunday',
+    'cocktails and comedy!': 'Sunday',
+    'the hump': 'Wednesday',
+    'the hump!': 'Wednesday',
+    'power bomb': 'Monday',
+    'power bomb!': 'Monday',
+    'powerbomb': 'Monday',
+    'powerbomb!': 'Monday',
+    'ladies night': 'Wednesday',
+    'ladies night!': 'Wednesday',
+    'austin all-stars': 'Thursday',
+    'austin all-stars!': 'Thursday',
+    'all-star weekend': 'Friday',
+    'all-star weekend!': 'Friday',
+    'timeless comedy': 'Friday',
+    # Other shows
+    'the joke of painting': 'Friday',
+    'velveeta room wrestling': 'Saturday',
+    'the christmas hangover comedy show': 'Friday',
+    'arielle isaac norman': 'Saturday',
+    'joe begley': 'Saturday',
+    'mike macrae': 'Friday',
+    'doug mellard': 'Saturday',
+}
+
+# Creek and Cave event URL mappings
+CREEK_CAVE_URLS = {
+    'the monday gamble mic': '/events/the-monday-gamble-mic',
+    'clocked out comedy': '/events/clocked-out-comedy',
+    'new joke monday': '/events/new-joke-monday',
+    'monday night gimmick mic': '/events/monday-night-gimmick-mic',
+    'dunk tank': '/events/dunk-tank-mic',
+    'optimum noctis': '/events/optimumnoctis',
+    'hood therapy tuesdays': '/events/hood-therapy-tuesdays',
+    'off the cuff': '/events/off-the-cuff',
+    'absolute show': '/events/absolute-show-',
+    'the forge': '/events/the-forge',
+    'wild west wednesdays': '/events/wild-west-wednesdays',
+    'bear arms: open mic': '/events/bear-arms-open-mic',
+    'bear arms open mic': '/events/bear-arms-open-mic',
+    'gator tales': '/events/gator-tales',
+    'unscripted: a tag team comedy show': '/events/unscripted-comedy',
+    'unscripted': '/events/unscripted-comedy',
+    'word up! open mic': '/events/word-up-open-mic',
+    'word up open mic': '/events/word-up-open-mic',
+    'creek featured': '/events/creekfeat',
+    'show us the big naturals': '/events/show-us-the-big-naturals',
+    'new joke saturday open mic': '/events/new-joke-saturday',
+    'new joke saturday': '/events/new-joke-saturday',
+    'christmas at the creek': '/events/christmas-at-the-creek',
+    'christmas at the creek!': '/events/christmas-at-the-creek',
+    'christmas': '/events/christmas-at-the-creek',
+    'main course comedy': '/events/main-course-comedy',
+    'freaky': '/events/freaky-comedy',
+    "writers' room": '/events/writersroom',
+    'writers room': '/events/writersroom',
+    'the creek and the cave open mic': '/events/creek-mic',
+    'banana phone': '/events/banana-phone',
+    'laughs with the staff': '/events/laughs-with-the-staff',
+    'algonauts': '/events/algonauts',
+    'the roast of santa': '/events/the-roast-of-santa',
+    'king of the creek': '/events/king-of-the-creek',
+    'roast battle: austin': '/events/roast-battle-austin',
+    'roast battle austin': '/events/roast-battle-austin',
+    'comedians on the rise': '/events/comedians-on-the-rise',
+    'comedy powered by bilt': '/events/bilt-comedy',
+    'the roast of 2025': '/events/the-roast-of-2025',
+    "lukas mccrary's nye comedy spectacular": '/events/lukas-mccrary-nye',
+}
+
+# Velveeta Room URL mappings (scraped from website)
+VELVEETA_URLS = {
+    'cocktails and comedy': '/velv/cocktails-and-comedy7',
+    'the hump': '/velv/the-hump5',
+    'the joke of painting': '/velv/the-joke-of-painting',
+    'velveeta room wrestling': '/velv/vrw-comedy-championship',
+    'the christmas hangover comedy show': '/velv/the-christmas-hangover2',
+    'christmas hangover': '/velv/the-christmas-hangover2',
+    'timeless comedy': '/velv/timeless-comedy1',
+    'powerbomb': '/velv/powerbomb7',
+    'powerbomb!': '/velv/powerbomb7',
+    'power bomb': '/velv/power-bombd29',
+    'austin all stars': '/velv/austin-all-stars345g',
+    'austin all-stars': '/velv/austin-all-stars345g',
+}
+
+# Rozco's Comedy day mappings
+# VERIFIED from SimpleTix on 2025-12-16
+ROZCOS_DAYS = {
+    'austin all-star comedy': 'Saturday',  # Also runs Tuesdays
+    'eastside open mic': 'Wednesday',  # FIXED: was Tuesday
+    'best of austin comedy': 'Thursday',  # FIXED: was Wednesday
+    'candlelight comedy': 'Thursday',  # FIXED: was Wednesday
+    'friday night laughs': 'Friday',
+    'new faces of austin comedy': 'Saturday',
+    'tuesday gigante': 'Tuesday',
+    'kill or spill': 'Monday',
+    'lez be friends': 'Monday',
+    'dressed to kill': 'Saturday',
+    'your new favorite comic': 'Thursday',
+    'the filthy show': 'Saturday',
+    'circus fire': 'Saturday',
+    'sweet sunday comedy': 'Sunday',
+}
+
+# Rozco's Comedy free shows
+ROZCOS_FREE_SHOWS = [
+    'eastside open mic',
+]
+
+# Speakeasy day mappings
+SPEAKEASY_DAYS = {
+    'the thursday special': 'Thursday',
+    'sunday service': 'Sunday',
+}
+
+# Speakeasy URL mappings (Eventbrite direct ticket links)
+SPEAKEASY_URLS = {
+    'the thursday special': 'https://www.eventbrite.com/e/the-thursday-special-tickets-1042163919337',
+    'sunday service': 'https://www.eventbrite.com/e/sunday-service-stand-up-comedy-show-tickets-1308986797749',
+}
+
+# Show-name tables compiled once for lookups (see scraper/matching.py),
+# keyed by a fragment of the venue name
+DAY_MATCHERS = [
+    ('creek', ShowMatcher(CREEK_CAVE_DAYS)),
+    ('velveeta', ShowMatcher(VELVEETA_DAYS)),
+    ('rozco', ShowMatcher(ROZCOS_DAYS)),
+    ('speakeasy', ShowMatcher(SPEAKEASY_DAYS)),
+]
+CREEK_CAVE_URL_MATCHER = ShowMatcher(CREEK_CAVE_URLS)
+VELVEETA_URL_MATCHER = ShowMatcher(VELVEETA_URLS)
+SPEAKEASY_URL_MATCHER = ShowMatcher(SPEAKEASY_URLS)
+FREE_SHOW_MATCHER = ShowMatcher(FREE_SHOWS)
+ROZCOS_FREE_MATCHER = ShowMatcher(ROZCOS_FREE_SHOWS)
+
+# Pop Up venues (Bull's Pub, Gnar Bar, Speakeasy, Secret Level)
+POP_UP_VENUES = ["bull's pub", "gnar bar", "speakeasy", "secret level"]
+
+# Cap City Comedy URL
+CAPCITY_URL = 'https://www.capcitycomedy.com/calendar'
+
+# Rozco's Comedy URL mappings (SimpleTix direct ticket links)
+ROZCOS_URLS = {
+    'austin all-star comedy': 'https://www.simpletix.com/e/austin-all-star-comedy-tickets-249886',
+    'eastside open mic': 'https://www.simpletix.com/e/12-17-eastside-open-mic-tickets-245381',
+    'best of austin comedy': 'https://www.simpletix.com/e/12-18-best-of-austin-comedy-tickets-245375',
+    'candlelight comedy': 'https://www.simpletix.com/e/12-18-candlelight-comedy-tickets-245384',
+    'friday night laughs': 'https://www.simpletix.com/e/12-19-friday-night-laughs-7pm-tickets-249044',
+    'new faces of austin comedy': 'https://www.simpletix.com/e/new-faces-of-austin-comedy-tickets-248564',
+    'tuesday gigante': 'https://www.simpletix.com/e/tuesday-gigante-tickets-248656',
+    'kill or spill': 'https://www.simpletix.com/e/12-9-kill-or-spill-tickets-240508',
+    'lez be friends': 'https://www.simpletix.com/e/12-2-lez-be-friends-comedy-blind-dating-sh-tickets-244863',
+    'dressed to kill': 'https://www.simpletix.com/e/dressed-to-kill-halloween-party-tickets-238205',
+    'your new favorite comic': 'https://www.simpletix.com/e/10-16-your-new-favorite-comic-tickets-237530',
+    'the filthy show': 'https://www.simpletix.com/e/the-filthy-show-tickets-246504',
+    'circus fire': 'https://www.simpletix.com/e/11-1-circus-fire-stand-up-comedy-show-tickets-240102',
+    'sweet sunday comedy': 'https://www.simpletix.com/e/sweet-sunday-comedy-tickets-241384',
+}
+
+# Venue base URLs
+MOTHERSHIP_URL = 'https://comedymothership.com/shows'
+BULLS_PUB_URL = 'https://www.eventbrite.com/e/stand-up-comedy-show-bulls-pub-wedsthursat-at-830pm-tickets-1039732296287'
+GNAR_BAR_URL = 'https://gnarbaratx.com/events'
+ROZCOS_URL = 'https://rozcoscomedyclub.simpletix.com/'
+EAST_AUSTIN_URL = 'https://eastaustincomedy.com/'
+VULCAN_URL = 'https://www.vulcanatx.com/'
+BLACK_RABBIT_URL = 'https://www.eventbrite.com/e/black-rabbit-underground-comedy-tickets-1442073413399'
+SECRET_LEVEL_URL = 'https://www.eventbrite.com/o/secret-level-productions-45772952383'
+
+
+def is_free_show(name, venue):
+    name_lower = name.lower()
+    venue_lower = venue.lower()
+
+    # Bulls Pub is always free
+    if "bull" in venue_lower:
+        return True
+
+    # Speakeasy shows are always free
+    if "speakeasy" in venue_lower:
+        return True
+
+    # Check against free shows list
+    if FREE_SHOW_MATCHER.find(name_lower) is not None:
+        return True
+
+    # Check Rozco's free shows
+    if 'rozco' in venue_lower and ROZCOS_FREE_MATCHER.find(name_lower) is not None:
+        return True
+
+    return False
+
+
+def is_sold_out(name, venue):
+    """Check if a show is sold out."""
+    name_lower = name.lower()
+    for sold_out_show in SOLD_OUT_SHOWS:
+        if sold_out_show.lower() in name_lower:
+            return True
+    return False
+
+
+def get_correct_day(show_name, venue_name, event_date):
+    """Get the correct day of week for a show."""
+    name_lower = show_name.lower().strip()
+    venue_lower = venue_name.lower()
+
+    # PRIORITY 1: If event_date contains scraped day (e.g., "Wednesday, Dec 24"), use it
+    if event_date:
+        # Check for format "Wednesday, Dec 24"
+        if ', ' in event_date:
+            day_part = event_date.split(', ')[0]
+            if day_part in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
+                return day_part
+
+        # Check if event_date is just a day name
+        if event_date in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
+            return event_date
+
+    # PRIORITY 2: Use hardcoded mappings (exact, then partial match) as
+    # fallback for Creek and Cave, Velveeta, Rozco's and Speakeasy
+    for venue_key, matcher in DAY_MATCHERS:
+        if venue_key in venue_lower:
+            day = matcher.lookup(name_lower)
+            if day:
+                return day
+
+    # Mothership - extract day from event name
+    if 'mothership' in venue_lower:
+        for day in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
+            if day.upper() in show_name.upper():
+                return day
+
+    return event_date or ''
+
+
+def get_day_from_date(date_str, year):
+    if not date_str:
+        return ''
+    day_map = {
+        'monday': 'mon', 'tuesday': 'tue', 'wednesday': 'wed',
+        'thursday': 'thu', 'friday': 'fri', 'saturday': 'sat', 'sunday': 'sun'
+    }
+    date_lower = date_str.lower()
+    if date_lower in day_map:
+        return day_map[date_lower]
+    # Try with current year first
+    try:
+        date_obj = datetime.strptime(f"{year} {date_str}", "%Y %b %d")
+        return date_obj.strftime('%a').lower()
+    except:
+        pass
+    # Try with full month name
+    try:
+        date_obj = datetime.strptime(f"{year} {date_str}", "%Y %B %d")
+        return date_obj.strftime('%a').lower()
+    except:
+        return ''
+
+
+def get_day_from_name(name):
+    name_upper = name.upper()
+    days = {
+        'MONDAY': 'mon', 'TUESDAY': 'tue', 'WEDNESDAY': 'wed',
+        'THURSDAY': 'thu', 'FRIDAY': 'fri', 'SATURDAY': 'sat', 'SUNDAY': 'sun'
+    }
+    for day_name, day_abbr in days.items():
+        if day_name in name_upper:
+            return day_abbr
+    return ''
+
+
+def venue_to_id(venue_name):
+    return venue_name.lower().replace(' ', '-').replace("'", '').replace('&', 'and')
+
+
+def is_popup_venue(venue_name):
+    """Check if venue should be grouped under Pop Up category."""
+    venue_lower = venue_name.lower()
+    for popup in POP_UP_VENUES:
+        if popup in venue_lower:
+            return True
+    return False
+
+
+def get_filter_venue_id(venue_name):
+    """Get the venue ID for filtering (Pop Up venues use 'pop-up')."""
+    if is_popup_venue(venue_name):
+        return 'pop-up'
+    return venue_to_id(venue_name)
+
+
+def extract_show_name_from_poster(text):
+    if not text:
+        return None
+    match = re.search(r'Poster for ([^,]+)', text)
+    if match:
+        return match.group(1).strip()
+    return text
+
+
+def get_event_url(show_name, venue_name, venue_base_url, source_url=''):
+    name_lower = show_name.lower().strip()
+
+    # For Cap City, use the source_url from the database (specific ticket page)
+    if 'cap city' in venue_name.lower() and source_url:
+        # Remove the hash fragment we added for uniqueness
+        clean_url = source_url.split('#')[0]
+        return clean_url
+
+    if 'creek' in venue_name.lower():
+        # Use Creek website URL from scraper if available (preferred)
+        if source_url and 'creekandcave.com/events/' in source_url:
+            return source_url
+        # Fall back to hardcoded mapping
+        path = CREEK_CAVE_URL_MATCHER.lookup(name_lower)
+        if path:
+            return 'https://www.creekandcave.com' + path
+        # Fall back to ShowClix ticket URL
+        if source_url and 'showclix.com' in source_url:
+            return source_url
+        slug = re.sub(r'[^\w\s-]', '', name_lower)
+        slug = re.sub(r'[\s_]+', '-', slug).strip('-')
+        return f'https://www.creekandcave.com/events/{slug}'
+
+    elif 'mothership' in venue_name.lower():
+        return MOTHERSHIP_URL
+
+    elif 'velveeta' in venue_name.lower():
+        # Use the SeatEngine ticket URL from the scraper
+        if source_url and 'seatengine.com' in source_url:
+            return source_url
+        # Fallback to hardcoded URLs
+        path = VELVEETA_URL_MATCHER.lookup(name_lower)
+        if path:
+            return 'https://www.thevelveetaroom.com' + path
+        slug = re.sub(r'[^\w\s]', '', name_lower).replace(' ', '')
+        return f'https://www.thevelveetaroom.com/velv/{slug}'
+
+    elif 'bull' in venue_name.lower():
+        return BULLS_PUB_URL
+
+    elif 'gnar' in venue_name.lower():
+        return GNAR_BAR_URL
+
+    elif 'rozco' in venue_name.lower():
+        # Use the per-show SimpleTix ticket URL from the scraper
+        if source_url and 'simpletix.com' in source_url:
+            return source_url
+        return ROZCOS_URL
+
+    elif 'speakeasy' in venue_name.lower():
+        return SPEAKEASY_URL_MATCHER.lookup(name_lower) or 'https://www.eventbrite.com'
+
+    elif 'cap city' in venue_name.lower():
+        return CAPCITY_URL
+
+    elif 'east austin' in venue_name.lower():
+        return EAST_AUSTIN_URL
+
+    elif 'vulcan' in venue_name.lower():
+        # Use the source_url from scraper (ticketsauce ticket page)
+        if source_url:
+            # Remove the hash fragment we added for uniqueness
+            clean_url = source_url.split('#')[0]
+            return clean_url
+        return VULCAN_URL
+
+    elif 'sunset' in venue_name.lower():
+        # Use the source_url from scraper (SquadUP event-id ticket page)
+        if source_url and 'event-id=' in source_url:
+            return source_url
+        return 'https://www.sunsetstripatx.com/events'
+
+    elif 'paramount' in venue_name.lower():
+        # Use the source_url from scraper (specific ticket page)
+        if source_url:
+            return source_url
+        return 'https://tickets.austintheatre.org/events?kid=4'
+
+    elif 'black rabbit' in venue_name.lower():
+        return BLACK_RABBIT_URL
+
+    elif 'secret level' in venue_name.lower():
+        if source_url and 'eventbrite.com' in source_url:
+            return source_url
+        return SECRET_LEVEL_URL
+
+    return venue_base_url
+
+
+def clean_show_name(event_name: str) -> str:
+    """Show name without alt-text or two-line title noise."""
+    name = event_name.strip()
+    clean_name = name
+    if '\n' in name:
+        parts = name.split('\n')
+        clean_name = parts[1].strip() if len(parts) > 1 else parts[0].strip()
+    if 'Poster for' in name:
+        extracted = extract_show_name_from_poster(name)
+        if extracted:
+            clean_name = extracted
+    return clean_name
+
+
+def show_day(
+    name: str, clean_name: str, venue: str, event_date: str, year: int,
+    show_start: Optional[str] = None,
+) -> str:
+    """'mon'..'sun' for a show, or '' if it can't be told."""
+    # Use correct day mappings first, then fall back to date parsing
+    correct_day = get_correct_day(clean_name, venue, event_date)
+    day = ''
+    if correct_day:
+        # Check if correct_day is actually a day name (not a month)
+        correct_day_lower = correct_day.lower()
+        if correct_day_lower in DAY_NAMES or any(correct_day_lower.startswith(d) for d in DAY_NAMES):
+            day = correct_day[:3].lower()  # Convert to 'mon', 'tue', etc.
+        else:
+            # correct_day is a date like "Jan 29", need to calculate the day
+            day = get_day_from_date(correct_day, year) or get_day_from_name(name)
+
+    # If still no day, try to parse from event_date or calculate from date
+    if not day:
+        day = get_day_from_date(event_date, year) or get_day_from_name(name)
+
+    # Last resort: the weekday of the date normalised at ingest
+    if not day and show_start:
+        day = date.fromisoformat(show_start[:10]).strftime('%a').lower()
+    return day
+
+
+def show_record(row: sqlite3.Row, year: int) -> tuple:
+    """The shows table row for an images row (see SHOW_COLUMNS)."""
+    name = row['event_name'].strip()
+    clean_name = clean_show_name(name)
+    event_date = row['event_date'] or ''
+    show_time = row['show_time'] or ''
+    source_url = row['source_url'] or ''
+    venue = row['venue_name']
+    show_start = row['show_start']
+    if show_start:
+        # Yearless dates are resolved at ingest; use that year for weekdays
+        year = int(show_start[:4])
+
+    if any(key in venue.lower() for key in DATED_VENUES):
+        dedupe_key = (clean_name.lower(), venue, event_date, show_time)
+    else:
+        dedupe_key = (clean_name.lower(), venue)
+
+    return (
+        row['id'],
+        row['venue_id'],
+        venue,
+        get_filter_venue_id(venue),
+        row['venue_url'],
+        row['event_name'],
+        clean_name,
+        '\x1f'.join(dedupe_key),
+        event_date,
+        show_time,
+        show_start,
+        row['recurrence_day'],
+        show_day(name, clean_name, venue, event_date, year, show_start),
+        get_event_url(clean_name, venue, row['venue_url'], source_url),
+        row['local_path'].replace('\\', '/'),
+        source_url,
+        int(is_free_show(clean_name, venue)),
+        int(is_sold_out(clean_name, venue)),
+        row['scraped_at'],
+    )
+
+
+SHOW_COLUMNS = (
+    "image_id", "venue_id", "venue", "venue_slug", "venue_url", "event_name", "name",
+    "dedupe_key", "event_date", "show_time", "show_start", "recurrence_day", "day",
+    "url", "image", "source_url", "is_free", "is_sold_out", "scraped_at",
+)
+
+
+def create_shows_tables(conn: sqlite3.Connection):
+    """Create the shows table, its indexes and shows_state if they don't exist."""
+    # One record per named images row; `image` is the flyer's local path
+    # with forward slashes, `venue_slug` the filter id, `day` mon..sun
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS shows (
+            image_id INTEGER PRIMARY KEY,
+            venue_id INTEGER NOT NULL,
+            venue TEXT NOT NULL,
+            venue_slug TEXT NOT NULL,
+            venue_url TEXT,
+            event_name TEXT NOT NULL,
+            name TEXT NOT NULL,
+            dedupe_key TEXT NOT NULL,
+            event_date TEXT,
+            show_time TEXT,
+            show_start TEXT,
+            recurrence_day TEXT,
+            day TEXT,
+            url TEXT,
+            image TEXT,
+            source_url TEXT,
+            is_free INTEGER NOT NULL,
+            is_sold_out INTEGER NOT NULL,
+            scraped_at TIMESTAMP,
+            FOREIGN KEY (image_id) REFERENCES images(id),
+            FOREIGN KEY (venue_id) REFERENCES venues(id)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_shows_start ON shows(show_start)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_shows_venue ON shows(venue, show_start)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_shows_free ON shows(is_free, show_start)")
+
+    # Fingerprint of the images rows each venue's records were built from
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS shows_state (
+            venue_id INTEGER PRIMARY KEY,
+            fingerprint TEXT NOT NULL
+        )
+    """)
+
+
+# Changes to the tables and rules above rebuild every venue
+RULES_DIGEST = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def _fingerprint(rows: List[sqlite3.Row], year: int) -> str:
+    digest = hashlib.sha256(f"{RULES_DIGEST}:{year}".encode())
+    for row in rows:
+        digest.update(repr(tuple(row)).encode())
+    return digest.hexdigest()
+
+
+def _venue_rows(
+    conn: sqlite3.Connection, venue_ids: Optional[Iterable[int]] = None
+) -> tuple:
+    """
+    (rows by venue, stored fingerprints by venue, venue ids to check) for
+    every venue, or just `venue_ids`. Only reads.
+    """
+    query = """
+        SELECT i.id, i.venue_id, i.event_name, i.event_date, i.show_time, i.source_url,
+               i.local_path, i.show_start, i.recurrence_day, i.scraped_at,
+               v.name AS venue_name, v.url AS venue_url
+        FROM images i
+        JOIN venues v ON i.venue_id = v.id
+        WHERE i.event_name IS NOT NULL AND i.event_name != ''
+    """
+    params: tuple = ()
+    if venue_ids is not None:
+        venue_ids = list(venue_ids)
+        query += f" AND i.venue_id IN ({', '.join('?' * len(venue_ids))})"
+        params = tuple(venue_ids)
+    query += " ORDER BY i.venue_id, i.id"
+
+    previous = conn.row_factory
+    conn.row_factory = sqlite3.Row
+    try:
+        by_venue: Dict[int, List[sqlite3.Row]] = {}
+        for row in conn.execute(query, params):
+            by_venue.setdefault(row['venue_id'], []).append(row)
+        stored = {
+            row['venue_id']: row['fingerprint']
+            for row in conn.execute("SELECT venue_id, fingerprint FROM shows_state")
+        }
+    finally:
+        conn.row_factory = previous
+
+    if venue_ids is None:
+        # Venues whose rows are all gone drop their records too
+        venue_ids = sorted(set(by_venue) | set(stored))
+    return by_venue, stored, venue_ids
+
+
+def stale_venues(conn: sqlite3.Connection) -> List[int]:
+    """
+    Venues whose records are out of date: their images rows, the rules in
+    this file or the year changed since the last rebuild. Only reads, so it
+    works on a read-only connection.
+    """
+    by_venue, stored, venue_ids = _venue_rows(conn)
+    year = datetime.now().year
+    return [
+        venue_id for venue_id in venue_ids
+        if stored.get(venue_id) != _fingerprint(by_venue.get(venue_id, []), year)
+    ]
+
+
+def refresh_shows(conn: sqlite3.Connection, venue_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Rebuild the shows records of every venue (or just `venue_ids`) whose
+    images rows changed since its last rebuild. Doesn't commit. Returns the
+    number of venues rebuilt.
+    """
+    create_shows_tables(conn)
+    by_venue, stored, venue_ids = _venue_rows(conn, venue_ids)
+
+    year = datetime.now().year
+    placeholders = ', '.join('?' * len(SHOW_COLUMNS))
+    rebuilt = 0
+    for venue_id in venue_ids:
+        rows = by_venue.get(venue_id, [])
+        fingerprint = _fingerprint(rows, year)
+        if stored.get(venue_id) == fingerprint:
+            continue
+        conn.execute("DELETE FROM shows WHERE venue_id = ?", (venue_id,))
+        conn.executemany(
+            f"INSERT INTO shows ({', '.join(SHOW_COLUMNS)}) VALUES ({placeholders})",
+            [show_record(row, year) for row in rows]
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO shows_state (venue_id, fingerprint) VALUES (?, ?)",
+            (venue_id, fingerprint)
+        )
+        rebuilt += 1
+    return rebuilt
+
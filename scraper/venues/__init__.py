@@ -5,6 +5,7 @@ from .sunset_strip import SunsetStripScraper
 from .east_austin import EastAustinScraper
 from .rozcos import RozcosScraper
 from .vulcan import VulcanScraper
+from .cap_city import CapCityScraper
 from .paramount import ParamountScraper
 from .secret_level import SecretLevelScraper
 
@@ -16,6 +17,7 @@ SCRAPERS = {
     "east_austin": EastAustinScraper,
     "rozcos": RozcosScraper,
     "vulcan": VulcanScraper,
+    "cap_city": CapCityScraper,
     "paramount": ParamountScraper,
     "secret_level": SecretLevelScraper,
 }
@@ -28,6 +30,7 @@ __all__ = [
     "EastAustinScraper",
     "RozcosScraper",
     "VulcanScraper",
+    "CapCityScraper",
     "ParamountScraper",
     "SecretLevelScraper",
     "SCRAPERS",
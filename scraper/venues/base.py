@@ -1,13 +1,88 @@
+import asyncio
+import hashlib
+import re
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import Any, AsyncIterator, List, Dict, Optional, Tuple
 from playwright.async_api import Page
 
-from ..config import PAGE_LOAD_WAIT
+from ..browser import track_requests
+from ..config import READY_TIMEOUT, NETWORK_QUIET_MS, SCROLL_WAIT
+from ..crawler import DetailCache, iter_details
+from ..matching import ShowMatcher
+
+
+# Collects src/srcset plus the name/date text of each image's closest card
+# for all selectors in one call. Mirrors the old per-element lookups: text is
+# null when there is no selector, no card, no match or a lookup error, and a
+# card that still throws is skipped rather than failing the whole call.
+EXTRACT_CARDS_JS = """
+({selectors, nameSelector, dateSelector}) => {
+    const textIn = (card, sel) => {
+        if (!sel || !card) return null;
+        try {
+            const el = card.querySelector(sel);
+            if (!el) return null;
+            const text = el.innerText;
+            return text ? text.trim() : null;
+        } catch (e) {
+            return null;
+        }
+    };
+    const cards = [];
+    for (const selector of selectors) {
+        for (const img of document.querySelectorAll(selector)) {
+            try {
+                const card = img.closest("div, article, section, a");
+                cards.push({
+                    src: img.getAttribute("src"),
+                    srcset: img.getAttribute("srcset"),
+                    name: textIn(card, nameSelector),
+                    date: textIn(card, dateSelector),
+                });
+            } catch (e) {
+                continue;
+            }
+        }
+    }
+    return cards;
+}
+"""
+
+# Resolved href of every link matching a selector
+LINK_HREFS_JS = """
+(selector) => Array.from(document.querySelectorAll(selector), (a) => a.href)
+"""
 
 
 class BaseScraper(ABC):
     """Base class for venue-specific scrapers."""
 
+    # Venues whose data is reachable over plain HTTP set this to False and
+    # implement scrape_http(); the browser is then only a fallback.
+    requires_browser = True
+
+    # Set by scraper.main for --refresh: reload detail pages even if cached
+    refresh_details = False
+
+    # Venues whose every listed show belongs on the site set this to True:
+    # a show whose flyer can't be downloaded is stored without one (and
+    # retried next run) instead of being left out.
+    keep_shows_without_flyer = False
+
+    # Venues that list every upcoming show set this to True: once a scrape
+    # completes, upcoming rows missing from the listing (cancelled or
+    # rescheduled shows) are deleted.
+    prune_missing_shows = False
+
+    # Set by a scraper when its listing may be missing shows (a detail page
+    # failed to load), so that nothing is pruned for this run
+    partial_listing = False
+
+    # Recurring shows whose listings get the time (or day) wrong: a
+    # ShowMatcher over lowercase name fragments -> (day, time or None).
+    # scraper.main applies it to the venue's rows after each scrape.
+    known_shows: Optional[ShowMatcher] = None
+
     venue_key: str
     venue_name: str
     venue_url: str
@@ -15,6 +90,7 @@ class BaseScraper(ABC):
     image_selectors: List[str]
     event_name_selector: str
     event_date_selector: str
+    ready_selector: str
 
     def __init__(self, config: dict):
         self.venue_name = config["name"]
@@ -23,6 +99,7 @@ class BaseScraper(ABC):
         self.image_selectors = config["image_selectors"]
         self.event_name_selector = config.get("event_name_selector", "")
         self.event_date_selector = config.get("event_date_selector", "")
+        self.ready_selector = config.get("ready_selector", "")
 
     async def scrape(self, page: Page) -> List[Dict]:
         """
@@ -30,14 +107,11 @@ class BaseScraper(ABC):
         Returns list of dicts: {"url": str, "event_name": str|None, "event_date": str|None}
         """
         await page.goto(self.events_url, wait_until="networkidle")
-        await page.wait_for_timeout(PAGE_LOAD_WAIT)
+        await self.wait_until_ready(page, self.ready_selector or ", ".join(self.image_selectors))
 
         await self.handle_pagination(page)
 
-        images = []
-        for selector in self.image_selectors:
-            found = await self.extract_images(page, selector)
-            images.extend(found)
+        images = await self.extract_cards(page, self.image_selectors)
 
         seen_urls = set()
         unique_images = []
@@ -48,21 +122,226 @@ class BaseScraper(ABC):
 
         return unique_images
 
+    async def iter_records(self, page: Page) -> AsyncIterator[Dict]:
+        """
+        Yield records as they are found, so scraper.main can download and
+        store them while the page is still being read. Scrapers that walk
+        several pages override this; the default yields scrape(page).
+        """
+        for record in await self.scrape(page):
+            yield record
+
+    async def scrape_http(self, session) -> Optional[List[Dict]]:
+        """
+        Scrape without a browser, using the helpers in scraper.fetch.
+        Return None (or raise) to fall back to scrape(page).
+        """
+        return None
+
+    def listing_fingerprint(self, images: List[Dict]) -> str:
+        """
+        Stable hash of a scraped listing: each show's name, date, time,
+        ticket URL and image URL, order-insensitive. scraper.main skips the
+        download and DB stages when it matches the last stored listing.
+        """
+        def text(value) -> str:
+            return re.sub(r"\s+", " ", value or "").strip().lower()
+
+        keys = sorted(
+            "\t".join((
+                text(img.get("event_name")),
+                text(img.get("event_date")),
+                text(img.get("show_time")),
+                (img.get("ticket_url") or "").strip(),
+                (img.get("url") or "").strip(),
+            ))
+            for img in images
+        )
+        return hashlib.sha256("\n".join(keys).encode()).hexdigest()
+
+    def known_show_times(
+        self, event_name: Optional[str], event_date: Optional[str], show_time: Optional[str]
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        (event_date, show_time) corrected from known_shows: a known day
+        fills in a missing date, and a known time replaces the listed one
+        on the show's regular day. Specials on other days keep their time.
+        """
+        if self.known_shows is None or not event_name:
+            return event_date, show_time
+        known = self.known_shows.find(event_name.lower())
+        if known is None:
+            return event_date, show_time
+        day, time = known
+        if not event_date:
+            return day, time or show_time
+        if event_date.lower().startswith(day.lower()):
+            return event_date, time or show_time
+        return event_date, show_time
+
+    def detail_cache(self) -> DetailCache:
+        """This venue's cache of parsed detail pages."""
+        return DetailCache.for_venue(self.venue_key, self.refresh_details)
+
+    async def crawl_detail_pages(
+        self, page: Page, urls: List[str], parse, wait_until: str = "domcontentloaded"
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        iter_details() in the page's browser context, skipping cached pages:
+        yields (url, parsed result) for each URL as soon as it is ready, so
+        records can be yielded (and stored) while later pages load.
+        """
+        async for url, result in self.detail_cache().iter(
+            urls,
+            lambda missing: iter_details(page.context, missing, parse, wait_until=wait_until),
+        ):
+            yield url, result
+
+    def _first_sighting(self, seen_keys: set, record: Dict) -> bool:
+        """Deduplicate by name + date + time."""
+        key = f"{(record.get('event_name') or '').lower()}|{record.get('event_date')}|{record.get('show_time')}"
+        if key in seen_keys:
+            return False
+        seen_keys.add(key)
+        return True
+
+    async def event_links(self, page: Page, selector: str) -> List[str]:
+        """
+        Absolute URLs of the links matching `selector`, in page order, with
+        query strings and fragments dropped and repeats removed.
+        """
+        hrefs = await page.evaluate(LINK_HREFS_JS, selector)
+        urls = [href.split("#")[0].split("?")[0] for href in hrefs if href]
+        return list(dict.fromkeys(urls))
+
+    async def wait_until_ready(
+        self,
+        page: Page,
+        selector: str = "",
+        min_count: int = 1,
+        json_ld: bool = False,
+        timeout: int = READY_TIMEOUT,
+    ) -> bool:
+        """
+        Wait until the page has what we came for, up to `timeout` ms.
+
+        Waits for at least `min_count` matches of `selector` and/or a JSON-LD
+        script, then for a quiet network window so late images and XHRs
+        settle. Returns False if the ceiling was hit; callers carry on and
+        scrape whatever rendered, as they did after the old fixed sleeps.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout / 1000
+
+        def remaining() -> int:
+            return max(0, int((deadline - loop.time()) * 1000))
+
+        try:
+            if selector:
+                await page.wait_for_function(
+                    "([sel, n]) => document.querySelectorAll(sel).length >= n",
+                    arg=[selector, min_count],
+                    timeout=remaining() or 1,
+                )
+            if json_ld:
+                await page.wait_for_function(
+                    "() => !!document.querySelector('script[type=\"application/ld+json\"]')",
+                    timeout=remaining() or 1,
+                )
+        except Exception:
+            return False
+
+        return await self.wait_for_network_quiet(page, timeout=remaining())
+
+    async def wait_for_network_quiet(
+        self,
+        page: Page,
+        quiet_ms: int = NETWORK_QUIET_MS,
+        timeout: int = READY_TIMEOUT,
+    ) -> bool:
+        """
+        Wait until no request has been in flight for `quiet_ms`, up to
+        `timeout` ms. Pages from BrowserService are tracked from the moment
+        they open, so requests started before this call count too.
+        """
+        loop = asyncio.get_running_loop()
+        called = loop.time()
+        deadline = called + timeout / 1000
+        tracker = track_requests(page)
+        while loop.time() < deadline:
+            # At least quiet_ms from the call too, for requests it triggers
+            quiet = min(tracker.quiet_for(), loop.time() - called)
+            if quiet >= quiet_ms / 1000:
+                return True
+            await asyncio.sleep(0.05)
+        return False
+
+    async def scroll_until_settled(
+        self,
+        page: Page,
+        max_scrolls: int,
+        selector: str = "",
+        to_bottom: bool = False,
+        timeout: int = SCROLL_WAIT,
+    ):
+        """
+        Scroll to trigger lazy loading, waiting for the network to go quiet
+        (at most `timeout` ms) after each scroll rather than a fixed sleep.
+
+        Scrolls by one viewport, or straight to the bottom with `to_bottom`.
+        Stops early once the bottom is reached and `selector` (if given)
+        stopped gaining matches.
+        """
+        script = (
+            "window.scrollTo(0, document.body.scrollHeight)"
+            if to_bottom else
+            "window.scrollBy(0, window.innerHeight)"
+        )
+        count_js = "(sel) => sel ? document.querySelectorAll(sel).length : 0"
+        at_bottom_js = (
+            "() => window.scrollY + window.innerHeight >= document.body.scrollHeight - 2"
+        )
+
+        count = await page.evaluate(count_js, selector)
+        for _ in range(max_scrolls):
+            await page.evaluate(script)
+            await self.wait_for_network_quiet(page, timeout=timeout)
+
+            new_count = await page.evaluate(count_js, selector)
+            if new_count == count and await page.evaluate(at_bottom_js):
+                break
+            count = new_count
+
     async def handle_pagination(self, page: Page):
         """Override in subclass to handle load more buttons, infinite scroll, etc."""
         pass
 
     async def extract_images(self, page: Page, selector: str) -> List[Dict]:
         """Extract image URLs and metadata using the given selector."""
-        images = []
+        return await self.extract_cards(page, [selector])
 
-        elements = await page.query_selector_all(selector)
-        for element in elements:
-            src = await element.get_attribute("src")
-            if not src:
-                srcset = await element.get_attribute("srcset")
-                if srcset:
-                    src = srcset.split(",")[0].split()[0]
+    async def extract_cards(self, page: Page, selectors: List[str]) -> List[Dict]:
+        """
+        Extract image URLs and metadata for every selector in one round-trip.
+
+        A single page.evaluate collects each matched image's src/srcset and
+        the name/date text of its closest card, in selector order; URL
+        cleanup and filtering then happen here.
+        """
+        cards = await page.evaluate(
+            EXTRACT_CARDS_JS,
+            {
+                "selectors": selectors,
+                "nameSelector": self.event_name_selector,
+                "dateSelector": self.event_date_selector,
+            },
+        )
+
+        images = []
+        for card in cards:
+            src = card["src"]
+            if not src and card["srcset"]:
+                src = card["srcset"].split(",")[0].split()[0]
 
             if not src:
                 continue
@@ -75,13 +354,10 @@ class BaseScraper(ABC):
             if not self.is_valid_image_url(src):
                 continue
 
-            event_name = await self.get_event_name(element, page)
-            event_date = await self.get_event_date(element, page)
-
             images.append({
                 "url": src,
-                "event_name": event_name,
-                "event_date": event_date,
+                "event_name": card["name"],
+                "event_date": card["date"],
             })
 
         return images
@@ -109,37 +385,3 @@ class BaseScraper(ABC):
         ])
 
         return has_valid_ext or is_cdn
-
-    async def get_event_name(self, img_element, page: Page) -> Optional[str]:
-        """Try to extract event name from nearby elements."""
-        if not self.event_name_selector:
-            return None
-
-        try:
-            parent = await img_element.evaluate_handle("el => el.closest('div, article, section, a')")
-            if parent:
-                name_el = await parent.query_selector(self.event_name_selector)
-                if name_el:
-                    text = await name_el.inner_text()
-                    return text.strip() if text else None
-        except Exception:
-            pass
-
-        return None
-
-    async def get_event_date(self, img_element, page: Page) -> Optional[str]:
-        """Try to extract event date from nearby elements."""
-        if not self.event_date_selector:
-            return None
-
-        try:
-            parent = await img_element.evaluate_handle("el => el.closest('div, article, section, a')")
-            if parent:
-                date_el = await parent.query_selector(self.event_date_selector)
-                if date_el:
-                    text = await date_el.inner_text()
-                    return text.strip() if text else None
-        except Exception:
-            pass
-
-        return None
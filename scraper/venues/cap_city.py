@@ -0,0 +1,190 @@
+"""Scraper for Cap City Comedy - headliner pages with several show times each."""
+
+import re
+from datetime import datetime, timedelta
+from typing import AsyncIterator, List, Dict, Optional
+from playwright.async_api import Page
+from .base import BaseScraper
+from ..config import VENUES
+
+
+# Only shows in the next DAYS_AHEAD days are listed
+DAYS_AHEAD = 10
+
+# Private events, workshops, and generic page titles
+SKIP_KEYWORDS = ['private', 'workshop', 'upcoming events', 'calendar']
+
+MONTH_ABBRS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+# Cap City uses two formats:
+# 1. "Thu, Dec 18, 2025" with times on separate lines
+# 2. "12/21/2025 7:00 PM" - date and time together
+DATE_PATTERN = r'(Mon|Tue|Wed|Thu|Fri|Sat|Sun),?\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2}),?\s*(\d{4})'
+DATE_TIME_PATTERN = r'(\d{1,2})/(\d{1,2})/(\d{4})\s+(\d{1,2}:\d{2}\s*(?:AM|PM))'
+TIME_PATTERN = r'(\d{1,2}:\d{2}\s*(?:AM|PM))'
+
+# Talent headshots, most specific first
+HEADSHOT_SELECTORS = [
+    'img[src*="talent/headshots"]',
+    'img[src*="headshot"]',
+    'img[src*="/talent/"]',
+]
+
+
+class CapCityScraper(BaseScraper):
+    """
+    Scraper for Cap City Comedy.
+
+    The calendar links to one page per headliner; each page lists that
+    run's show times and links to a ticket page per show.
+    """
+
+    venue_key = "cap_city"
+    keep_shows_without_flyer = True
+    prune_missing_shows = True
+
+    def __init__(self):
+        super().__init__(VENUES[self.venue_key])
+
+    def parse_show_times(self, page_text: str) -> List[tuple]:
+        """Return (day, month, day_num, year, time) for every show time in the page text."""
+        matches = []
+
+        # Dates and times sit between "CLICK SHOWTIME" and the performer bio
+        if 'CLICK SHOWTIME' in page_text:
+            remaining_text = page_text[page_text.find('CLICK SHOWTIME'):]
+            current_date = None
+            found_times = False
+            for line in remaining_text.split('\n'):
+                line = line.strip()
+                date_match = re.search(DATE_PATTERN, line)
+                time_matches = re.findall(TIME_PATTERN, line)
+                if date_match or time_matches:
+                    found_times = True
+                    if date_match:
+                        current_date = date_match.groups()
+                    if current_date:
+                        for time_val in time_matches:
+                            matches.append((*current_date, time_val))
+                elif found_times and len(line) > 5:
+                    # First real line after the times ends the section
+                    break
+
+        # Fall back to the "12/21/2025 7:00 PM" format
+        if not matches:
+            for month_num, day, year, time_val in re.findall(DATE_TIME_PATTERN, page_text):
+                try:
+                    dt = datetime.strptime(f"{year}-{month_num}-{day}", "%Y-%m-%d")
+                except ValueError:
+                    continue
+                matches.append((dt.strftime('%a'), MONTH_ABBRS[dt.month - 1], day, year, time_val))
+
+        return matches
+
+    async def _event_page_shows(self, page: Page, event_url: str) -> Optional[List[Dict]]:
+        """
+        Read a headliner's show times from a loaded event page. Every show
+        is returned; scrape() applies the date window, so cached pages stay
+        valid as the window moves.
+        """
+        title_el = await page.query_selector('h1')
+        performer_name = (await title_el.inner_text()).strip() if title_el else ''
+        performer_name = re.sub(r'^Special Event:\s*', '', performer_name, flags=re.IGNORECASE).strip()
+
+        if not performer_name:
+            print(f"      Skipping {event_url} - no performer name found")
+            return []
+        if any(kw in performer_name.lower() for kw in SKIP_KEYWORDS):
+            print(f"      Skipping: {performer_name}")
+            return []
+
+        # Prefer the talent headshot, then any non-header seatengine image
+        image_url = ''
+        for selector in HEADSHOT_SELECTORS:
+            img_el = await page.query_selector(selector)
+            src = await img_el.get_attribute('src') if img_el else None
+            if src:
+                image_url = src
+                break
+        if not image_url:
+            for img in await page.query_selector_all('img'):
+                src = await img.get_attribute('src')
+                if src and 'seatengine' in src and 'header' not in src:
+                    image_url = src
+                    break
+        if image_url.startswith('//'):
+            image_url = 'https:' + image_url
+        elif image_url and not image_url.startswith('http'):
+            image_url = self.venue_url + image_url
+
+        matches = self.parse_show_times(await page.inner_text('body'))
+        if not matches:
+            print(f"      No show times found for {performer_name}")
+            return []
+
+        # Ticket pages are matched to show times by position
+        show_urls = await self.event_links(page, 'a[href*="/shows/"]')
+
+        shows = []
+        for i, (day_name, month, day, year, time_str) in enumerate(matches):
+            try:
+                show_date = datetime.strptime(f"{month} {day} {year}", "%b %d %Y")
+            except ValueError:
+                continue
+
+            show_url = show_urls[i] if i < len(show_urls) else (show_urls[0] if show_urls else event_url)
+            shows.append({
+                'name': performer_name,
+                'date': f"{day_name.capitalize()}, {month[:3]} {day}",
+                'time': time_str.strip().upper(),
+                'url': show_url,
+                'image_url': image_url,
+                'show_date': show_date,
+            })
+
+        return shows
+
+    async def scrape(self, page: Page) -> List[Dict]:
+        """Scrape Cap City shows in the next DAYS_AHEAD days."""
+        return [record async for record in self.iter_records(page)]
+
+    async def iter_records(self, page: Page) -> AsyncIterator[Dict]:
+        """Yield the shows of each headliner page as it is read."""
+        await page.goto(self.events_url, wait_until="domcontentloaded", timeout=60000)
+        await self.wait_until_ready(page, self.ready_selector)
+
+        event_urls = [
+            url for url in await self.event_links(page, self.ready_selector)
+            if not url.endswith('/events/')
+        ]
+        print(f"    Found {len(event_urls)} event pages")
+
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        cutoff = datetime.now() + timedelta(days=DAYS_AHEAD)
+
+        found = 0
+        # networkidle: show times render after the page's own XHRs
+        async for _, shows in self.crawl_detail_pages(
+            page, event_urls, self._event_page_shows, wait_until="networkidle"
+        ):
+            if shows is None:
+                self.partial_listing = True
+            for show in shows or []:
+                if not today <= show['show_date'] <= cutoff:
+                    continue
+
+                # One row per show time: the ticket page plus a date/time fragment
+                date_slug = show['date'].replace(' ', '_').replace(',', '')
+                time_slug = show['time'].replace(' ', '').replace(':', '')
+                print(f"      + {show['name']} | {show['date']} @ {show['time']}")
+                found += 1
+                yield {
+                    "url": show['image_url'],
+                    "event_name": show['name'],
+                    "event_date": show['date'],
+                    "show_time": show['time'],
+                    "ticket_url": f"{show['url']}#{date_slug}_{time_slug}",
+                }
+
+        print(f"    Found {found} shows in the next {DAYS_AHEAD} days")
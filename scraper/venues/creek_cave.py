@@ -1,10 +1,11 @@
 import re
 import hashlib
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from playwright.async_api import Page
 from .base import BaseScraper
-from ..config import VENUES, PAGE_LOAD_WAIT
+from ..config import VENUES
+from ..matching import ShowMatcher
 
 
 # Month name mapping
@@ -15,11 +16,43 @@ MONTH_MAP = {
 
 DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
 
+# Recurring shows: partial name -> (day, time), first match wins
+KNOWN_SHOWS = ShowMatcher({
+    'monday gamble': ('Monday', '8:00 PM'),
+    'clocked out': ('Monday', '10:00 PM'),
+    'new joke monday': ('Monday', '11:00 PM'),
+    'gimmick mic': ('Monday', '11:00 PM'),
+    'dunk tank': ('Tuesday', '8:00 PM'),
+    'optimum noctis': ('Tuesday', '8:00 PM'),
+    'hood therapy': ('Tuesday', '10:00 PM'),
+    'off the cuff': ('Wednesday', '8:00 PM'),
+    'absolute show': ('Wednesday', '8:00 PM'),
+    'the forge': ('Wednesday', '10:00 PM'),
+    'wild west': ('Wednesday', '10:00 PM'),
+    'comedians on the rise': ('Wednesday', '10:00 PM'),
+    'bear arms': ('Thursday', '8:00 PM'),
+    'gator tales': ('Thursday', '8:00 PM'),
+    'unscripted': ('Thursday', '10:00 PM'),
+    'word up': ('Thursday', '10:00 PM'),
+    'big naturals': ('Friday', '8:00 PM'),
+    'roast battle': ('Friday', '11:00 PM'),
+    'laughs with the staff': ('Friday', '10:00 PM'),
+    'new joke saturday': ('Saturday', '6:00 PM'),
+    'creek featured': ('Saturday', '8:00 PM'),
+    'main course': ('Saturday', '8:00 PM'),
+    'freaky': ('Saturday', '11:00 PM'),
+    "writers' room": ('Sunday', '6:00 PM'),
+    'writers room': ('Sunday', '6:00 PM'),
+    'creek open mic': ('Sunday', '8:00 PM'),
+    'banana phone': ('Sunday', '10:00 PM'),
+})
+
 
 class CreekCaveScraper(BaseScraper):
     """Scraper for Creek and the Cave."""
 
     venue_key = "creek_cave"
+    known_shows = KNOWN_SHOWS
 
     def __init__(self):
         super().__init__(VENUES[self.venue_key])
@@ -69,8 +102,12 @@ class CreekCaveScraper(BaseScraper):
 
     async def scrape(self, page: Page) -> List[Dict]:
         """Scrape Creek and the Cave events with date, time, and images."""
+        return [record async for record in self.iter_records(page)]
+
+    async def iter_records(self, page: Page) -> AsyncIterator[Dict]:
+        """Yield each unique event as the calendar weeks are walked."""
         await page.goto(self.events_url, wait_until="networkidle", timeout=60000)
-        await page.wait_for_timeout(PAGE_LOAD_WAIT)
+        await self.wait_until_ready(page, self.ready_selector)
 
         # Switch to calendar view (month view) using JavaScript
         await page.evaluate('''
@@ -82,9 +119,10 @@ class CreekCaveScraper(BaseScraper):
                 }
             }
         ''')
-        await page.wait_for_timeout(3000)
+        await self.wait_until_ready(page, ".events-calendar-day")
 
-        images = []
+        seen_keys = set()
+        found = 0
 
         # Navigate through multiple weeks to get more events
         weeks_to_scrape = 4  # Scrape current + 3 more weeks
@@ -157,15 +195,19 @@ class CreekCaveScraper(BaseScraper):
                                 url_hash = hashlib.md5(unique_key.encode()).hexdigest()[:8]
                                 ticket_url = f"https://www.creekandcave.com/calendar#{url_hash}"
 
-                            images.append({
+                            record = {
                                 "url": img_url or "",
                                 "event_name": event_name,
                                 "event_date": event_date,
                                 "show_time": show_time,
                                 "ticket_url": ticket_url,
-                            })
+                            }
+                            if not self._first_sighting(seen_keys, record):
+                                continue
 
                             print(f"      + {event_name} | {event_date} @ {show_time}")
+                            found += 1
+                            yield record
 
                         except Exception as e:
                             continue
@@ -179,19 +221,19 @@ class CreekCaveScraper(BaseScraper):
                     next_btn = await page.query_selector('[data-events-nav-next], .events-nav-arrow.next')
                     if next_btn:
                         await next_btn.click()
-                        await page.wait_for_timeout(2000)
+                        await self.wait_for_network_quiet(page, timeout=2000)
                 except Exception:
                     pass
 
         # If calendar view didn't work, fall back to list view
-        if not images:
+        if not found:
             print("    Calendar view failed, falling back to list view")
             # Reload page for list view
             await page.goto(self.events_url, wait_until="networkidle", timeout=60000)
-            await page.wait_for_timeout(PAGE_LOAD_WAIT)
+            await self.wait_until_ready(page, ".events-list-day")
 
         # Process each day container (list view) - only if calendar view didn't get events
-        day_containers = await page.query_selector_all('.events-list-day') if not images else []
+        day_containers = await page.query_selector_all('.events-list-day') if not found else []
         print(f"    Found {len(day_containers)} day containers")
 
         for day_container in day_containers:
@@ -239,31 +281,25 @@ class CreekCaveScraper(BaseScraper):
                     url_hash = hashlib.md5(unique_key.encode()).hexdigest()[:8]
                     ticket_url = f"https://www.creekandcave.com/calendar#{url_hash}"
 
-                    images.append({
+                    record = {
                         "url": img_url or "",
                         "event_name": event_name,
                         "event_date": event_date,
                         "show_time": show_time,
                         "ticket_url": ticket_url,
-                    })
+                    }
+                    if not self._first_sighting(seen_keys, record):
+                        continue
 
                     if img_url:
                         print(f"      + {event_name} | {event_date} @ {show_time}")
                     else:
                         print(f"      + {event_name} | {event_date} @ {show_time} (no image)")
+                    found += 1
+                    yield record
 
                 except Exception as e:
                     print(f"    Error processing event: {e}")
                     continue
 
-        # Deduplicate by name + date + time
-        seen_keys = set()
-        unique_images = []
-        for img in images:
-            key = f"{(img.get('event_name') or '').lower()}|{img.get('event_date')}|{img.get('show_time')}"
-            if key not in seen_keys:
-                seen_keys.add(key)
-                unique_images.append(img)
-
-        print(f"    Found {len(unique_images)} unique events")
-        return unique_images
+        print(f"    Found {found} unique events")
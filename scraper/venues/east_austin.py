@@ -1,21 +1,146 @@
+import re
+from datetime import datetime, timedelta
+from typing import AsyncIterator, List, Dict, Optional
 from playwright.async_api import Page
 from .base import BaseScraper
 from ..config import VENUES
 
 
+# Only shows in the next DAYS_AHEAD days are listed
+DAYS_AHEAD = 14
+
+MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June',
+               'July', 'August', 'September', 'October', 'November', 'December']
+FULL_DATE_PATTERN = r'(?:' + '|'.join(MONTH_NAMES) + r')\s+\d{1,2},?\s*\d{4}'
+
+
 class EastAustinScraper(BaseScraper):
-    """Scraper for East Austin Comedy Club - Squarespace site."""
+    """Scraper for East Austin Comedy Club - Squarespace site with an event page per show."""
 
     venue_key = "east_austin"
+    # Also retires upcoming rows keyed by the old listing cards' flyer URLs.
+    # The hand-made "See All Shows!" row has no show_start, so it stays.
+    prune_missing_shows = True
 
     def __init__(self):
         super().__init__(VENUES[self.venue_key])
 
+    def parse_event_date(self, date_text: str) -> Optional[datetime]:
+        """Parse 'Friday, December 20, 2024', 'December 20, 2024' or 'Dec 20'."""
+        if not date_text:
+            return None
+
+        # Drop the day name if present
+        text = re.sub(r'^[A-Za-z]+day,\s*', '', date_text.strip())
+
+        for fmt in ("%B %d, %Y", "%B %d %Y"):
+            try:
+                return datetime.strptime(text, fmt)
+            except ValueError:
+                pass
+
+        # "Dec 20": this year, or next year if that's well in the past
+        try:
+            today = datetime.now()
+            date_obj = datetime.strptime(f"{text}, {today.year}", "%b %d, %Y")
+            if date_obj < today - timedelta(days=30):
+                date_obj = date_obj.replace(year=today.year + 1)
+            return date_obj
+        except ValueError:
+            return None
+
     async def handle_pagination(self, page: Page):
         """Handle Squarespace lazy loading."""
         try:
-            for _ in range(5):
-                await page.evaluate("window.scrollBy(0, window.innerHeight)")
-                await page.wait_for_timeout(1500)
+            await self.scroll_until_settled(page, 5, self.ready_selector, timeout=1500)
         except Exception:
             pass
+
+    async def _event_page(self, page: Page, event_url: str) -> Optional[Dict]:
+        """Read name, date, time and flyer from a loaded event page."""
+        title_el = await page.query_selector('h1, h2.eventitem-title, .event-title')
+        name = (await title_el.inner_text()).strip() if title_el else ''
+        if not name:
+            return None
+
+        # Squarespace puts the date and time in the event metadata
+        date_obj = None
+        show_time = ''
+        for item in await page.query_selector_all('.eventitem-meta-date, .event-date, time'):
+            text = (await item.inner_text()).strip()
+            if any(month in text for month in MONTH_NAMES):
+                date_obj = self.parse_event_date(text) or date_obj
+            time_match = re.search(r'(\d{1,2}:\d{2}\s*[AaPp][Mm])', text)
+            if time_match and not show_time:
+                show_time = time_match.group(1).strip()
+
+        if not date_obj:
+            date_match = re.search(FULL_DATE_PATTERN, await page.inner_text('body'))
+            if date_match:
+                date_obj = self.parse_event_date(date_match.group(0))
+
+        image_url = ''
+        img_el = await page.query_selector(
+            '.eventitem-column-thumbnail img, .event-image img, .sqs-image img, article img'
+        )
+        if img_el:
+            image_url = await img_el.get_attribute('src') or ''
+        if not image_url:
+            # Fallback: any Squarespace image that isn't the logo
+            for img in await page.query_selector_all('img'):
+                src = await img.get_attribute('src')
+                if src and 'squarespace-cdn' in src and 'logo' not in src.lower():
+                    image_url = src
+                    break
+        if image_url.startswith('//'):
+            image_url = 'https:' + image_url
+
+        return {
+            'name': name,
+            'date_obj': date_obj,
+            'time': show_time,
+            'image_url': image_url,
+        }
+
+    async def scrape(self, page: Page) -> List[Dict]:
+        """Scrape East Austin shows in the next DAYS_AHEAD days from their event pages."""
+        return [record async for record in self.iter_records(page)]
+
+    async def iter_records(self, page: Page) -> AsyncIterator[Dict]:
+        """Yield each show in the next DAYS_AHEAD days as its event page is read."""
+        await page.goto(self.events_url, wait_until="networkidle", timeout=60000)
+        await self.wait_until_ready(page, "a[href*='/events-2-1/']")
+        await self.handle_pagination(page)
+
+        event_urls = [
+            url for url in await self.event_links(page, "a[href*='/events-2-1/']")
+            if not url.rstrip('/').endswith('/events-2-1')
+        ]
+        print(f"    Found {len(event_urls)} event pages")
+
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        cutoff = today + timedelta(days=DAYS_AHEAD)
+
+        found = 0
+        async for event_url, event in self.crawl_detail_pages(
+            page, event_urls, self._event_page, wait_until="networkidle"
+        ):
+            if event is None:
+                self.partial_listing = True
+            if not event or not event['date_obj']:
+                continue
+            # Cached pages may predate today's window
+            if not today <= event['date_obj'] <= cutoff:
+                continue
+            event_date = event['date_obj'].strftime('%A, %b %d')
+            print(f"      + {event['name']} | {event_date} @ {event['time']}")
+            found += 1
+            yield {
+                "url": event['image_url'],
+                "event_name": event['name'],
+                "event_date": event_date,
+                "show_time": event['time'],
+                "ticket_url": event_url,
+            }
+
+        print(f"    Found {found} shows in the next {DAYS_AHEAD} days")
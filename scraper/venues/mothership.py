@@ -7,8 +7,20 @@ from .base import BaseScraper
 from ..config import VENUES
 
 
+# Text and first image src of every event card, in one round-trip
+EXTRACT_CARDS_JS = """
+(selector) => Array.from(document.querySelectorAll(selector), (card) => {
+    const img = card.querySelector("img");
+    return {
+        text: card.innerText,
+        src: img ? img.getAttribute("src") : null,
+    };
+})
+"""
+
+
 class MothershipScraper(BaseScraper):
-    """Scraper for Comedy Mothership - Next.js site with event cards."""
+    """Scraper for Comedy Mothership - Next.js site with event cards. Excludes sold out shows."""
 
     venue_key = "mothership"
 
@@ -58,43 +70,42 @@ class MothershipScraper(BaseScraper):
     async def scrape(self, page: Page) -> List[Dict]:
         """Scrape Comedy Mothership shows with date, name, and time."""
         await page.goto(self.events_url, wait_until="domcontentloaded", timeout=60000)
-        await page.wait_for_timeout(8000)
+        await self.wait_until_ready(page, self.ready_selector)
 
         # Scroll to load more content
-        for _ in range(5):
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await page.wait_for_timeout(2000)
+        await self.scroll_until_settled(page, 5, self.ready_selector, to_bottom=True)
 
         images = []
 
-        # Find all event cards
-        cards = await page.query_selector_all("[class*='EventCard_eventCard']")
+        # Collect all event cards in one pass, then parse in Python
+        cards = await page.evaluate(EXTRACT_CARDS_JS, self.ready_selector)
         print(f"    Found {len(cards)} event cards")
 
         for card in cards:
             try:
-                # Get full card text to parse
-                card_text = await card.inner_text()
-                event_date, event_name, show_time = self.parse_card_text(card_text)
+                # Parse the full card text
+                event_date, event_name, show_time = self.parse_card_text(card["text"])
 
                 # Skip if missing essential data
                 if not event_name:
                     continue
 
-                # Find the image in this card
+                # Sold-out shows aren't listed
+                if "SOLD OUT" in card["text"].upper():
+                    continue
+
+                # Use the image in this card
                 img_url = None
-                img = await card.query_selector("img")
-                if img:
-                    src = await img.get_attribute("src")
-                    if src and "default-event" not in src:
-                        # Decode Next.js image URL
-                        if "/_next/image?url=" in src:
-                            parsed = urllib.parse.urlparse(src)
-                            query = urllib.parse.parse_qs(parsed.query)
-                            if "url" in query:
-                                src = urllib.parse.unquote(query["url"][0])
-                        if self.is_valid_image_url(src):
-                            img_url = src
+                src = card["src"]
+                if src and "default-event" not in src:
+                    # Decode Next.js image URL
+                    if "/_next/image?url=" in src:
+                        parsed = urllib.parse.urlparse(src)
+                        query = urllib.parse.parse_qs(parsed.query)
+                        if "url" in query:
+                            src = urllib.parse.unquote(query["url"][0])
+                    if self.is_valid_image_url(src):
+                        img_url = src
 
                 # Skip cards without images
                 if not img_url:
@@ -52,20 +52,14 @@ class ParamountScraper(BaseScraper):
         """Scrape comedy events from Paramount Theatre."""
         await page.goto(self.events_url, wait_until="networkidle", timeout=60000)
 
-        # Wait longer for dynamic content to load
-        await page.wait_for_timeout(8000)
-
         # Wait for event list to appear
-        try:
-            await page.wait_for_selector(".tn-prod-list-item", timeout=15000)
-        except Exception:
+        await self.wait_until_ready(page, self.ready_selector)
+        if not await page.query_selector(self.ready_selector):
             print("    No events found or page didn't load properly")
             return []
 
         # Scroll to load all events
-        for _ in range(3):
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await page.wait_for_timeout(1500)
+        await self.scroll_until_settled(page, 3, self.ready_selector, to_bottom=True, timeout=1500)
 
         images = []
 
@@ -1,19 +1,50 @@
 import re
 import json
+import asyncio
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 from playwright.async_api import Page
 from .base import BaseScraper
-from ..config import VENUES
+from ..config import VENUES, HTTP_DETAIL_CONCURRENCY
+from ..fetch import FetchError, fetch_html, json_ld_items, meta_content
+from ..matching import ShowMatcher
 
 
 DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
 
+# Recurring shows: partial name -> (day, time or None), first match wins
+KNOWN_SHOWS = ShowMatcher({
+    'eastside open mic': ('Wednesday', '9:00 PM'),
+    'best of austin': ('Thursday', '7:00 PM'),
+    'candlelight': ('Thursday', '9:00 PM'),
+    'friday night laughs': ('Friday', None),
+    'new faces': ('Saturday', '7:00 PM'),
+    'austin all-star': ('Saturday', None),
+    'tuesday gigante': ('Tuesday', '8:00 PM'),
+    'sweet sunday': ('Sunday', '7:00 PM'),
+})
+
+# href, full text, <h4> and first <ul><li> text of every listing link
+LISTING_ROWS_JS = """
+(selector) => Array.from(document.querySelectorAll(selector), (a) => {
+    const h4 = a.querySelector("h4");
+    const li = a.querySelector("ul li");
+    return {
+        href: a.getAttribute("href"),
+        text: a.innerText,
+        name: h4 ? h4.innerText : null,
+        when: li ? li.innerText : null,
+    };
+})
+"""
+
 
 class RozcosScraper(BaseScraper):
     """Scraper for Rozco's Comedy - SimpleTix ticketing."""
 
     venue_key = "rozcos"
+    known_shows = KNOWN_SHOWS
+    requires_browser = False
     simpletix_url = "https://rozcoscomedyclub.simpletix.com/"
 
     def __init__(self):
@@ -56,27 +87,90 @@ class RozcosScraper(BaseScraper):
 
     async def scrape(self, page: Page) -> List[Dict]:
         """Scrape Rozco's Comedy shows from SimpleTix listing page."""
+        return [record async for record in self.iter_records(page)]
+
+    async def iter_records(self, page: Page) -> AsyncIterator[Dict]:
+        """Yield each show as its event page gives up the poster."""
         print(f"    Loading SimpleTix listing: {self.simpletix_url}")
         await page.goto(self.simpletix_url, wait_until="networkidle", timeout=60000)
-        await page.wait_for_timeout(3000)
+        await self.wait_until_ready(page, self.ready_selector)
 
         # Scroll to load all events
-        for _ in range(5):
-            await page.evaluate("window.scrollBy(0, window.innerHeight)")
-            await page.wait_for_timeout(1000)
-
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        await self.scroll_until_settled(page, 5, self.ready_selector, timeout=1000)
 
         # Parse event data directly from listing page HTML (local times, no UTC issues)
-        event_links = await page.query_selector_all('a[href*="simpletix.com/e/"]')
-        print(f"    Found {len(event_links)} event links on listing page")
+        rows = await page.evaluate(LISTING_ROWS_JS, self.ready_selector)
+        events = self._parse_listing(rows)
+
+        # Visit the event pages a few at a time to get poster images
+        by_url = {evt["ticket_url"]: evt for evt in events}
+        seen_keys = set()
+        found = 0
+        async for ticket_url, img_url in self.crawl_detail_pages(
+            page, list(by_url), self._event_page_image
+        ):
+            record = self._record(by_url[ticket_url], img_url)
+            if record and self._first_sighting(seen_keys, record):
+                found += 1
+                yield record
+
+        print(f"    Found {found} unique shows")
+
+    async def scrape_http(self, session) -> Optional[List[Dict]]:
+        """Scrape the SimpleTix listing and event pages without a browser."""
+        print(f"    Fetching SimpleTix listing: {self.simpletix_url}")
+        soup = await fetch_html(session, self.simpletix_url)
+
+        rows = []
+        for link in soup.select(self.ready_selector):
+            h4 = link.select_one("h4")
+            li = link.select_one("ul li")
+            rows.append({
+                "href": link.get("href"),
+                "text": link.get_text(" "),
+                "name": h4.get_text(" ") if h4 else None,
+                "when": li.get_text(" ") if li else None,
+            })
+        if not rows:
+            # Listing is rendered client-side after all
+            return None
+
+        events = self._parse_listing(rows)
+
+        # Fetch event pages a few at a time; results keep listing order
+        slots = asyncio.Semaphore(HTTP_DETAIL_CONCURRENCY)
+
+        async def fetch_image(ticket_url: str) -> Optional[str]:
+            async with slots:
+                try:
+                    detail = await fetch_html(session, ticket_url)
+                except FetchError as e:
+                    print(f"      Error fetching image from {ticket_url}: {e}")
+                    return None
+            cdn_img = detail.select_one('img[src*="cdn.simpletix.com"]')
+            return self._pick_event_image(
+                json_ld_items(detail),
+                cdn_img.get("src") if cdn_img else None,
+                meta_content(detail, "og:image"),
+            )
+
+        image_urls = await self.detail_cache().fetch(
+            [evt["ticket_url"] for evt in events],
+            lambda missing: asyncio.gather(*(fetch_image(url) for url in missing)),
+        )
+        return self._build_images(events, image_urls)
+
+    def _parse_listing(self, rows: List[Dict]) -> List[Dict]:
+        """Turn listing links (href, text, name, when) into upcoming events."""
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        print(f"    Found {len(rows)} event links on listing page")
 
         # Collect event info from listing page
         events = []
         skipped_past = 0
         seen_urls = set()
-        for link in event_links:
-            href = await link.get_attribute("href")
+        for row in rows:
+            href = row["href"]
             if not href or href in seen_urls:
                 continue
             if not href.startswith("http"):
@@ -84,26 +178,20 @@ class RozcosScraper(BaseScraper):
             seen_urls.add(href)
 
             # Skip events marked as "Event is Over"
-            full_text = await link.inner_text()
-            full_clean = re.sub(r'[\u00a0\u202f]', ' ', full_text).lower()
+            full_clean = re.sub(r'[\u00a0\u202f]', ' ', row["text"] or '').lower()
             if 'event is over' in full_clean or 'past event' in full_clean:
                 skipped_past += 1
                 continue
 
-            # Get event name from <h4>
-            h4 = await link.query_selector('h4')
-            event_name = None
-            if h4:
-                event_name = (await h4.inner_text()).strip()
+            # Event name comes from <h4>
+            event_name = row["name"].strip() if row["name"] is not None else None
 
-            # Get date/time from <li> inside <ul>
+            # Date/time comes from the <li> inside <ul>
             date_obj = None
             event_date = None
             show_time = None
-            li = await link.query_selector('ul li')
-            if li:
-                li_text = (await li.inner_text()).strip()
-                date_obj, event_date, show_time = self.parse_listing_datetime(li_text)
+            if row["when"] is not None:
+                date_obj, event_date, show_time = self.parse_listing_datetime(row["when"].strip())
 
             # Skip events before today
             if date_obj and date_obj < today:
@@ -123,70 +211,72 @@ class RozcosScraper(BaseScraper):
             })
 
         print(f"    Parsed {len(events)} upcoming events (skipped {skipped_past} past)")
+        return events
 
-        # Visit each event page to get poster image
-        images = []
-        for evt in events:
-            img_url = await self._fetch_event_image(page, evt["ticket_url"])
-
-            if not evt["event_name"]:
-                continue
-
-            images.append({
-                "url": img_url or "",
-                "event_name": evt["event_name"],
-                "event_date": evt["event_date"],
-                "show_time": evt["show_time"],
-                "ticket_url": evt["ticket_url"],
-            })
-            print(f"      + {evt['event_name']} | {evt['event_date'] or 'NO DATE'} @ {evt['show_time'] or 'NO TIME'}")
-
-        # Deduplicate by name + date + time
+    def _record(self, evt: Dict, img_url: Optional[str]) -> Optional[Dict]:
+        """An event paired with its poster URL, or None if it has no name."""
+        if not evt["event_name"]:
+            return None
+        print(f"      + {evt['event_name']} | {evt['event_date'] or 'NO DATE'} @ {evt['show_time'] or 'NO TIME'}")
+        return {
+            "url": img_url or "",
+            "event_name": evt["event_name"],
+            "event_date": evt["event_date"],
+            "show_time": evt["show_time"],
+            "ticket_url": evt["ticket_url"],
+        }
+
+    def _build_images(self, events: List[Dict], image_urls: List[Optional[str]]) -> List[Dict]:
+        """Pair events with their poster URLs and drop duplicate shows."""
         seen_keys = set()
         unique_images = []
-        for img in images:
-            key = f"{(img.get('event_name') or '').lower()}|{img.get('event_date')}|{img.get('show_time')}"
-            if key not in seen_keys:
-                seen_keys.add(key)
-                unique_images.append(img)
+        for evt, img_url in zip(events, image_urls):
+            record = self._record(evt, img_url)
+            if record and self._first_sighting(seen_keys, record):
+                unique_images.append(record)
 
         print(f"    Found {len(unique_images)} unique shows")
         return unique_images
 
-    async def _fetch_event_image(self, page: Page, ticket_url: str) -> Optional[str]:
-        """Visit a SimpleTix event page and extract the poster image URL."""
-        try:
-            await page.goto(ticket_url, wait_until="networkidle", timeout=30000)
-            await page.wait_for_timeout(2000)
+    def _pick_event_image(
+        self, json_ld: List[Dict], cdn_src: Optional[str], og_image: Optional[str]
+    ) -> Optional[str]:
+        """Poster URL from an event page: JSON-LD, then the CDN img, then og:image."""
+        for item in json_ld:
+            if item.get('@type') == 'Event':
+                img = item.get('image', '')
+                if isinstance(img, list):
+                    img = img[0] if img else ''
+                if img:
+                    return img
+        return cdn_src or og_image
+
+    async def _event_page_image(self, page: Page, ticket_url: str) -> Optional[str]:
+        """Extract the poster image URL from a loaded SimpleTix event page."""
+        await self.wait_until_ready(page, json_ld=True, timeout=2000)
+
+        # Try JSON-LD image field
+        json_ld = []
+        scripts = await page.query_selector_all('script[type="application/ld+json"]')
+        for script in scripts:
+            try:
+                data = json.loads(await script.inner_text())
+                for item in data if isinstance(data, list) else [data]:
+                    if isinstance(item, dict):
+                        json_ld.append(item)
+            except (json.JSONDecodeError, Exception):
+                continue
 
-            # Try JSON-LD image field
-            scripts = await page.query_selector_all('script[type="application/ld+json"]')
-            for script in scripts:
-                try:
-                    content = await script.inner_text()
-                    data = json.loads(content)
-                    items = data if isinstance(data, list) else [data]
-                    for item in items:
-                        if item.get('@type') == 'Event':
-                            img = item.get('image', '')
-                            if isinstance(img, list):
-                                img = img[0] if img else ''
-                            if img:
-                                return img
-                except (json.JSONDecodeError, Exception):
-                    continue
-
-            # Fallback: CDN img tag
-            img_el = await page.query_selector('img[src*="cdn.simpletix.com"]')
-            if img_el:
-                return await img_el.get_attribute('src')
-
-            # Fallback: og:image
-            og_img = await page.query_selector('meta[property="og:image"]')
-            if og_img:
-                return await og_img.get_attribute('content')
+        # Fallback: CDN img tag
+        cdn_src = None
+        img_el = await page.query_selector('img[src*="cdn.simpletix.com"]')
+        if img_el:
+            cdn_src = await img_el.get_attribute('src')
 
-            return None
-        except Exception as e:
-            print(f"      Error fetching image from {ticket_url}: {e}")
-            return None
+        # Fallback: og:image
+        og_image = None
+        og_img = await page.query_selector('meta[property="og:image"]')
+        if og_img:
+            og_image = await og_img.get_attribute('content')
+
+        return self._pick_event_image(json_ld, cdn_src, og_image)
@@ -1,14 +1,16 @@
 """Scraper for Secret Level Comedy - Eventbrite organizer page."""
 
+import asyncio
 import json
 import os
 import re
 from datetime import datetime, timezone
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 from urllib.parse import unquote
 from playwright.async_api import Page
 from .base import BaseScraper
-from ..config import VENUES
+from ..config import VENUES, HTTP_DETAIL_CONCURRENCY
+from ..fetch import FetchError, fetch_html, fetch_json, json_ld_items, next_data
 
 # Windows uses %#I for no-leading-zero hour; Unix uses %-I
 _TIME_FMT = "%#I:%M %p" if os.name == "nt" else "%-I:%M %p"
@@ -27,14 +29,20 @@ class SecretLevelScraper(BaseScraper):
     """
 
     venue_key = "secret_level"
+    requires_browser = False
+    eventbrite_base = "https://www.eventbrite.com"
 
     def __init__(self):
         super().__init__(VENUES[self.venue_key])
 
     async def scrape(self, page: Page) -> List[Dict]:
         """Scrape Secret Level events from Eventbrite organizer page."""
+        return [record async for record in self.iter_records(page)]
+
+    async def iter_records(self, page: Page) -> AsyncIterator[Dict]:
+        """Yield the upcoming shows of each event page as it is read."""
         await page.goto(self.events_url, wait_until="networkidle", timeout=60000)
-        await page.wait_for_timeout(3000)
+        await self.wait_until_ready(page, self.ready_selector)
 
         # Find all event links on the organizer page
         event_urls = await self._get_event_urls(page)
@@ -45,36 +53,84 @@ class SecretLevelScraper(BaseScraper):
             event_urls = await self._get_event_urls_fallback(page)
             print(f"    Fallback found {len(event_urls)} event links")
 
-        all_shows = []
-        for event_url in event_urls:
-            shows = await self._scrape_event_page(page, event_url)
-            all_shows.extend(shows)
-
-        # Deduplicate by (name + date + time)
-        seen = set()
-        unique = []
-        for show in all_shows:
-            key = (
-                (show.get("event_name") or "").lower(),
-                show.get("event_date") or "",
-                show.get("show_time") or "",
-            )
-            if key not in seen:
-                seen.add(key)
-                unique.append(show)
+        seen_keys = set()
+        found = 0
+        async for _, shows in self.crawl_detail_pages(page, event_urls, self._event_page_shows):
+            for show in self._upcoming([shows]):
+                if self._first_sighting(seen_keys, show):
+                    found += 1
+                    yield show
+
+        print(f"    Total: {found} unique show dates")
+
+    async def scrape_http(self, session) -> Optional[List[Dict]]:
+        """
+        Scrape the organizer and event pages without a browser. Eventbrite
+        server-renders the event links, __NEXT_DATA__ and JSON-LD.
+        """
+        soup = await fetch_html(session, self.events_url)
+        event_urls = self._event_urls_from_hrefs(
+            link.get("href") for link in soup.select(self.ready_selector)
+        )
+        print(f"    Found {len(event_urls)} event links on organizer page")
+        if not event_urls:
+            return None
 
+        async def fetch_api(api_url: str) -> dict:
+            result = await fetch_json(session, self.eventbrite_base + api_url)
+            if "error" in result:
+                # Don't drop the series silently; let the browser retry
+                raise FetchError(f"series API error: {result['error']}")
+            return result
+
+        slots = asyncio.Semaphore(HTTP_DETAIL_CONCURRENCY)
+
+        async def scrape_event(event_url: str) -> List[Dict]:
+            async with slots:
+                print(f"    Fetching: {event_url}")
+                event_soup = await fetch_html(session, event_url)
+                basic_info, gallery = self._next_data_context(next_data(event_soup))
+                if not basic_info:
+                    print("      No usable data found, trying JSON-LD fallback...")
+                    return self._shows_from_json_ld(json_ld_items(event_soup), event_url)
+                return await self._shows_from_basic_info(basic_info, gallery, event_url, fetch_api)
+
+        results = await self.detail_cache().fetch(
+            event_urls, lambda missing: asyncio.gather(*(scrape_event(url) for url in missing))
+        )
+        seen_keys = set()
+        unique = [show for show in self._upcoming(results) if self._first_sighting(seen_keys, show)]
         print(f"    Total: {len(unique)} unique show dates")
         return unique
 
+    def _upcoming(self, results: List[Optional[List[Dict]]]) -> List[Dict]:
+        """
+        Shows from parsed event pages that haven't started yet, without
+        their "start". Pages are parsed (and cached) with every date, so
+        the cutoff is applied here, on each run.
+        """
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        upcoming = []
+        for shows in results:
+            for show in shows or []:
+                # Entries cached before "start" was stored were filtered when parsed
+                start = show.get("start")
+                if start is None or start >= now:
+                    upcoming.append({key: value for key, value in show.items() if key != "start"})
+        return upcoming
+
     async def _get_event_urls(self, page: Page) -> List[str]:
         """Extract event page URLs from the organizer page."""
         links = await page.query_selector_all('a[href*="/e/"]')
+        return self._event_urls_from_hrefs([await link.get_attribute("href") for link in links])
+
+    def _event_urls_from_hrefs(self, hrefs) -> List[str]:
+        """Normalise event links to unique absolute URLs without query strings."""
         urls = set()
-        for link in links:
-            href = await link.get_attribute("href")
+        for href in hrefs:
             if href and "/e/" in href:
                 if href.startswith("/"):
-                    href = "https://www.eventbrite.com" + href
+                    href = self.eventbrite_base + href
                 base_url = href.split("?")[0]
                 urls.add(base_url)
         return list(urls)
@@ -90,15 +146,12 @@ class SecretLevelScraper(BaseScraper):
                 urls.add(base_url)
         return list(urls)
 
-    async def _scrape_event_page(self, page: Page, event_url: str) -> List[Dict]:
-        """Scrape a single Eventbrite event page for show data."""
+    async def _event_page_shows(self, page: Page, event_url: str) -> List[Dict]:
+        """Read show data from a loaded Eventbrite event page."""
         print(f"    Visiting: {event_url}")
-        try:
-            await page.goto(event_url, wait_until="networkidle", timeout=60000)
-            await page.wait_for_timeout(2000)
-        except Exception as e:
-            print(f"      Error loading page: {e}")
-            return []
+        await self.wait_until_ready(
+            page, "script#__NEXT_DATA__, script[type='application/ld+json']", timeout=2000
+        )
 
         # Extract __NEXT_DATA__ (Eventbrite's data is under context.basicInfo)
         basic_info, gallery = await self._extract_next_data(page)
@@ -106,6 +159,18 @@ class SecretLevelScraper(BaseScraper):
             print("      No usable data found, trying JSON-LD fallback...")
             return await self._parse_json_ld(page, event_url)
 
+        async def fetch_api(api_url: str) -> dict:
+            return await page.evaluate(
+                "(url) => fetch(url).then(r => r.json()).catch(e => ({error: e.message}))",
+                api_url,
+            )
+
+        return await self._shows_from_basic_info(basic_info, gallery, event_url, fetch_api)
+
+    async def _shows_from_basic_info(
+        self, basic_info: dict, gallery: dict, event_url: str, fetch_api
+    ) -> List[Dict]:
+        """Build shows from an event's basicInfo, expanding series via fetch_api."""
         event_name = basic_info.get("name", "").strip()
         if not event_name:
             print("      No event name found")
@@ -119,7 +184,7 @@ class SecretLevelScraper(BaseScraper):
 
         if is_series and series_id:
             # Use the v3 API to get all child events in the series
-            return await self._fetch_series_events(page, series_id, image_url)
+            return await self._fetch_series_events(fetch_api, series_id, image_url)
         else:
             # Single event - extract date from basicInfo
             return self._parse_single_event(basic_info, image_url, event_url)
@@ -132,13 +197,18 @@ class SecretLevelScraper(BaseScraper):
                 return None, None
 
             raw = await script_el.inner_text()
-            data = json.loads(raw)
-            context = data.get("props", {}).get("pageProps", {}).get("context", {})
-            return context.get("basicInfo", {}), context.get("gallery", {})
+            return self._next_data_context(json.loads(raw))
         except Exception as e:
             print(f"      Error extracting __NEXT_DATA__: {e}")
             return None, None
 
+    def _next_data_context(self, data: Optional[dict]) -> tuple:
+        """Pull (basicInfo, gallery) out of a parsed __NEXT_DATA__ payload."""
+        if not data:
+            return None, None
+        context = data.get("props", {}).get("pageProps", {}).get("context", {})
+        return context.get("basicInfo", {}), context.get("gallery", {})
+
     def _get_gallery_image(self, gallery: dict) -> str:
         """Get the first image URL from the gallery data."""
         if not gallery:
@@ -167,17 +237,18 @@ class SecretLevelScraper(BaseScraper):
         return unquote(encoded_url)
 
     async def _fetch_series_events(
-        self, page: Page, series_id: str, image_url: str
+        self, fetch_api, series_id: str, image_url: str
     ) -> List[Dict]:
-        """Fetch child events for a recurring series via the Eventbrite v3 API."""
-        now = datetime.now(timezone.utc)
+        """
+        Fetch child events for a recurring series via the Eventbrite v3 API.
+        `fetch_api` takes a site-relative API URL and returns the parsed JSON.
+        Past dates are kept; _upcoming() drops them.
+        """
         shows = []
 
         try:
             api_url = f"/api/v3/series/{series_id}/events/?expand=start,end&page_size=50"
-            result = await page.evaluate(
-                f'fetch("{api_url}").then(r => r.json()).catch(e => ({{error: e.message}}))'
-            )
+            result = await fetch_api(api_url)
 
             if "error" in result:
                 print(f"      Series API error: {result['error']}")
@@ -201,10 +272,6 @@ class SecretLevelScraper(BaseScraper):
                 if not dt:
                     continue
 
-                # Only include future dates
-                if dt < now.replace(tzinfo=None):
-                    continue
-
                 child_url = evt.get("url", "")
 
                 shows.append({
@@ -213,9 +280,12 @@ class SecretLevelScraper(BaseScraper):
                     "event_date": dt.strftime("%A, %b %d"),
                     "show_time": dt.strftime(_TIME_FMT),
                     "ticket_url": child_url or f"https://www.eventbrite.com/e/{evt.get('id', '')}",
+                    "start": dt,
                 })
                 print(f"        + {name} | {dt.strftime('%A, %b %d')} @ {dt.strftime(_TIME_FMT)}")
 
+        except FetchError:
+            raise
         except Exception as e:
             print(f"      Error fetching series events: {e}")
 
@@ -225,14 +295,13 @@ class SecretLevelScraper(BaseScraper):
         self, basic_info: dict, image_url: str, event_url: str
     ) -> List[Dict]:
         """Parse a single (non-series) event from basicInfo."""
-        now = datetime.now(timezone.utc)
         name = basic_info.get("name", "").strip()
 
         start = basic_info.get("startDate", {})
         local_str = start.get("local", "") if isinstance(start, dict) else ""
         dt = self._parse_datetime(local_str) if local_str else None
 
-        if not dt or dt < now.replace(tzinfo=None):
+        if not dt:
             return []
 
         print(f"      Single event: {name} | {dt.strftime('%A, %b %d')} @ {dt.strftime(_TIME_FMT)}")
@@ -242,6 +311,7 @@ class SecretLevelScraper(BaseScraper):
             "event_date": dt.strftime("%A, %b %d"),
             "show_time": dt.strftime(_TIME_FMT),
             "ticket_url": event_url,
+            "start": dt,
         }]
 
     def _parse_datetime(self, s: str) -> Optional[datetime]:
@@ -259,39 +329,48 @@ class SecretLevelScraper(BaseScraper):
 
     async def _parse_json_ld(self, page: Page, event_url: str) -> List[Dict]:
         """Fallback: extract event data from JSON-LD structured data."""
+        items = []
         try:
             scripts = await page.query_selector_all('script[type="application/ld+json"]')
             for script in scripts:
                 raw = await script.inner_text()
                 data = json.loads(raw)
+                items.extend(data if isinstance(data, list) else [data])
+        except Exception as e:
+            print(f"      JSON-LD parse error: {e}")
+        return self._shows_from_json_ld(items, event_url)
 
-                items = data if isinstance(data, list) else [data]
-                for item in items:
-                    if item.get("@type") != "Event":
-                        continue
-
-                    name = item.get("name", "").strip()
-                    if not name:
-                        continue
-
-                    image_url = ""
-                    img = item.get("image")
-                    if isinstance(img, str):
-                        image_url = img
-                    elif isinstance(img, list) and img:
-                        image_url = img[0] if isinstance(img[0], str) else img[0].get("url", "")
-
-                    start = item.get("startDate", "")
-                    dt = self._parse_datetime(start) if start else None
-                    if dt and dt > datetime.now():
-                        return [{
-                            "url": image_url,
-                            "event_name": name,
-                            "event_date": dt.strftime("%A, %b %d"),
-                            "show_time": dt.strftime(_TIME_FMT),
-                            "ticket_url": event_url,
-                        }]
+    def _shows_from_json_ld(self, items: List[dict], event_url: str) -> List[Dict]:
+        """Return the dated Events found in JSON-LD items."""
+        shows = []
+        try:
+            for item in items:
+                if item.get("@type") != "Event":
+                    continue
+
+                name = item.get("name", "").strip()
+                if not name:
+                    continue
+
+                image_url = ""
+                img = item.get("image")
+                if isinstance(img, str):
+                    image_url = img
+                elif isinstance(img, list) and img:
+                    image_url = img[0] if isinstance(img[0], str) else img[0].get("url", "")
+
+                start = item.get("startDate", "")
+                dt = self._parse_datetime(start) if start else None
+                if dt:
+                    shows.append({
+                        "url": image_url,
+                        "event_name": name,
+                        "event_date": dt.strftime("%A, %b %d"),
+                        "show_time": dt.strftime(_TIME_FMT),
+                        "ticket_url": event_url,
+                        "start": dt,
+                    })
 
         except Exception as e:
             print(f"      JSON-LD parse error: {e}")
-        return []
+        return shows
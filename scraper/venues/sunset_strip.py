@@ -2,9 +2,11 @@ import re
 import hashlib
 from datetime import datetime
 from typing import List, Dict, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from playwright.async_api import Page
 from .base import BaseScraper
 from ..config import VENUES
+from ..fetch import fetch_json
 
 
 # Month name mapping
@@ -17,11 +19,15 @@ MONTH_MAP = {
 
 DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
 
+# SquadUP start times are converted to the club's local time
+VENUE_TIMEZONE = "America/Chicago"
+
 
 class SunsetStripScraper(BaseScraper):
     """Scraper for Sunset Strip Comedy - SquadUP events."""
 
     venue_key = "sunset_strip"
+    requires_browser = False
 
     def __init__(self):
         super().__init__(VENUES[self.venue_key])
@@ -123,20 +129,81 @@ class SunsetStripScraper(BaseScraper):
             print(f"    SquadUP API failed, falling back to HTML scraping: {e}")
         return image_map
 
+    def _parse_api_start(self, value: Optional[str]) -> Optional[datetime]:
+        """Parse a SquadUP start_at timestamp into naive local time."""
+        if not value:
+            return None
+        try:
+            dt = datetime.fromisoformat(value)
+            if dt.tzinfo:
+                dt = dt.astimezone(ZoneInfo(VENUE_TIMEZONE)).replace(tzinfo=None)
+            return dt
+        except (ValueError, ZoneInfoNotFoundError):
+            return None
+
+    async def scrape_http(self, session) -> Optional[List[Dict]]:
+        """
+        Build the show list straight from the SquadUP API that feeds the
+        widget, without rendering it. Returns None (browser fallback) if an
+        event doesn't have the fields the widget path would have read.
+        """
+        data = await fetch_json(session, self.SQUADUP_API_URL)
+        events = data if isinstance(data, list) else data.get('data', data.get('events', []))
+        print(f"    SquadUP API: {len(events)} events")
+
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        images = []
+        seen_keys = set()
+        for evt in events:
+            event_name = (evt.get('name') or '').strip()
+            start = self._parse_api_start(evt.get('start_at'))
+            if not event_name or not start:
+                return None
+            if start < today:
+                continue
+
+            event_date = f"{DAY_NAMES[start.weekday()]}, {start.strftime('%b')} {start.day}"
+            show_time = f"{start.hour % 12 or 12}:{start.minute:02d} {'AM' if start.hour < 12 else 'PM'}"
+
+            image = evt.get('image') or {}
+            img_url = self._upscale_filepicker_url(image.get('default_url', ''))
+
+            event_id = evt.get('id')
+            if event_id:
+                ticket_url = f"https://www.sunsetstripatx.com/?event-id={event_id}"
+            else:
+                unique_key = f"{event_name}|{event_date}|{show_time}"
+                url_hash = hashlib.md5(unique_key.encode()).hexdigest()[:8]
+                ticket_url = f"https://www.sunsetstripatx.com/events#{url_hash}"
+
+            record = {
+                "url": img_url or "",
+                "event_name": event_name,
+                "event_date": event_date,
+                "show_time": show_time,
+                "ticket_url": ticket_url,
+            }
+            if not self._first_sighting(seen_keys, record):
+                continue
+            images.append(record)
+            print(f"      + {event_name} | {event_date} @ {show_time}")
+
+        print(f"    Found {len(images)} unique shows")
+        return images
+
     async def scrape(self, page: Page) -> List[Dict]:
         """Scrape Sunset Strip Comedy shows from SquadUP."""
         await page.goto(self.events_url, wait_until="networkidle", timeout=60000)
-        await page.wait_for_timeout(5000)
+        await self.wait_until_ready(page, self.ready_selector)
 
         # Fetch full poster URLs from the SquadUP API
         api_image_map = await self._fetch_api_image_map(page)
 
         # Scroll to load all events
-        for _ in range(5):
-            await page.evaluate("window.scrollBy(0, window.innerHeight)")
-            await page.wait_for_timeout(1500)
+        await self.scroll_until_settled(page, 5, self.ready_selector, timeout=1500)
 
         images = []
+        seen_keys = set()
 
         # Find all event boxes
         event_boxes = await page.query_selector_all('.squadup-checkout-event-box')
@@ -197,27 +264,21 @@ class SunsetStripScraper(BaseScraper):
                     url_hash = hashlib.md5(unique_key.encode()).hexdigest()[:8]
                     ticket_url = f"https://www.sunsetstripatx.com/events#{url_hash}"
 
-                images.append({
+                record = {
                     "url": img_url or "",
                     "event_name": event_name,
                     "event_date": event_date,
                     "show_time": show_time,
                     "ticket_url": ticket_url,
-                })
+                }
+                if not self._first_sighting(seen_keys, record):
+                    continue
+                images.append(record)
                 print(f"      + {event_name} | {event_date or 'NO DATE'} @ {show_time or 'NO TIME'}")
 
             except Exception as e:
                 print(f"    Error processing event: {e}")
                 continue
 
-        # Deduplicate by name + date + time
-        seen_keys = set()
-        unique_images = []
-        for img in images:
-            key = f"{(img.get('event_name') or '').lower()}|{img.get('event_date')}|{img.get('show_time')}"
-            if key not in seen_keys:
-                seen_keys.add(key)
-                unique_images.append(img)
-
-        print(f"    Found {len(unique_images)} unique shows")
-        return unique_images
+        print(f"    Found {len(images)} unique shows")
+        return images
@@ -27,6 +27,24 @@ VALID_DAYS = {'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday'
 
 WIX_MEDIA_BASE = "https://static.wixstatic.com/media/"
 
+# Everything _parse_show needs from each repeater item, in one round-trip
+EXTRACT_ITEMS_JS = """
+(selector) => Array.from(document.querySelectorAll(selector), (item) => {
+    const attr = (sel, name) => {
+        const el = item.querySelector(sel);
+        return el ? el.getAttribute(name) : null;
+    };
+    return {
+        imageInfo: attr("wow-image", "data-image-info"),
+        alt: attr('img[src*="wixstatic"]', "alt"),
+        src: attr('img[src*="wixstatic"]', "src"),
+        moreInfo: attr('a[href*="/velv/"]', "href"),
+        ticket: attr('a[href*="seatengine"]', "href"),
+        headings: Array.from(item.querySelectorAll("h2"), (h2) => h2.innerText),
+    };
+})
+"""
+
 
 class VelveetaScraper(BaseScraper):
     """Scraper for The Velveeta Room — Wix website with high-quality posters."""
@@ -88,25 +106,23 @@ class VelveetaScraper(BaseScraper):
         """Scrape The Velveeta Room shows from the Wix website."""
         print(f"    Loading Wix website: {self.events_url}")
         await page.goto(self.events_url, wait_until="domcontentloaded", timeout=60000)
-        await page.wait_for_timeout(8000)
+        await self.wait_until_ready(page, self.ready_selector)
 
         # Scroll to load all repeater items
-        for _ in range(8):
-            await page.evaluate("window.scrollBy(0, window.innerHeight)")
-            await page.wait_for_timeout(1500)
+        await self.scroll_until_settled(page, 8, self.ready_selector, timeout=1500)
 
         # Scroll back to top to ensure all items are rendered
         await page.evaluate("window.scrollTo(0, 0)")
-        await page.wait_for_timeout(2000)
+        await self.wait_for_network_quiet(page, timeout=2000)
 
-        # Find all repeater list items
-        items = await page.query_selector_all('[role="listitem"]')
+        # Collect all repeater list items in one pass, then parse in Python
+        items = await page.evaluate(EXTRACT_ITEMS_JS, self.ready_selector)
         print(f"    Found {len(items)} repeater items")
 
         images = []
         for item in items:
             try:
-                show = await self._extract_show_from_item(item)
+                show = self._parse_show(item)
                 if show:
                     images.append(show)
                     print(f"      + {show['event_name']} | {show.get('event_date', 'NO DATE')} @ {show.get('show_time', 'NO TIME')}")
@@ -156,59 +172,51 @@ class VelveetaScraper(BaseScraper):
         # Convert hyphens to spaces and title-case
         return clean.replace('-', ' ').title()
 
-    async def _extract_show_from_item(self, item) -> Optional[Dict]:
-        """Extract show data from a single Wix repeater listitem."""
+    def _parse_show(self, item: Dict) -> Optional[Dict]:
+        """Build show data from one Wix repeater listitem (see EXTRACT_ITEMS_JS)."""
         # --- Image ---
         img_url = None
         alt_text = ""
 
         # Try wow-image with data-image-info (contains raw image URI)
-        wow_img = await item.query_selector('wow-image')
-        if wow_img:
-            data_info = await wow_img.get_attribute('data-image-info')
-            if data_info:
-                try:
-                    info = json.loads(data_info)
-                    image_data = info.get('imageData', info)
-                    uri = image_data.get('uri', '')
-                    if uri:
-                        img_url = f"{WIX_MEDIA_BASE}{uri}"
-                except (json.JSONDecodeError, Exception):
-                    pass
+        data_info = item["imageInfo"]
+        if data_info:
+            try:
+                info = json.loads(data_info)
+                image_data = info.get('imageData', info)
+                uri = image_data.get('uri', '')
+                if uri:
+                    img_url = f"{WIX_MEDIA_BASE}{uri}"
+            except (json.JSONDecodeError, Exception):
+                pass
 
         # Get alt text from the rendered img tag (more reliable than data-image-info)
-        img_el = await item.query_selector('img[src*="wixstatic"]')
-        if img_el:
-            alt_text = (await img_el.get_attribute('alt') or '').strip()
-            # Fallback image URL from src
-            if not img_url:
-                src = await img_el.get_attribute('src')
-                if src:
-                    uri_match = re.search(r'/media/([^/]+)', src)
-                    if uri_match:
-                        img_url = f"{WIX_MEDIA_BASE}{uri_match.group(1)}"
-                    else:
-                        img_url = src
+        alt_text = (item["alt"] or '').strip()
+        # Fallback image URL from src
+        if not img_url:
+            src = item["src"]
+            if src:
+                uri_match = re.search(r'/media/([^/]+)', src)
+                if uri_match:
+                    img_url = f"{WIX_MEDIA_BASE}{uri_match.group(1)}"
+                else:
+                    img_url = src
 
         # --- Show name ---
         event_name = self._extract_name_from_alt(alt_text)
 
         # Fallback: extract from MORE INFO link slug
-        if not event_name:
-            more_info = await item.query_selector('a[href*="/velv/"]')
-            if more_info:
-                href = await more_info.get_attribute('href') or ''
-                slug = href.rstrip('/').split('/')[-1]
-                event_name = self._extract_name_from_slug(slug)
+        if not event_name and item["moreInfo"]:
+            slug = item["moreInfo"].rstrip('/').split('/')[-1]
+            event_name = self._extract_name_from_slug(slug)
 
         # --- Day / Date / Time from h2 elements ---
         day_text = None
         date_text = None
         time_text = None
 
-        h2_elements = await item.query_selector_all('h2')
-        for h2 in h2_elements:
-            text = (await h2.inner_text()).strip()
+        for heading in item["headings"]:
+            text = heading.strip()
             if not text:
                 continue
 
@@ -227,19 +235,14 @@ class VelveetaScraper(BaseScraper):
         show_time = self.normalize_time(time_text)
 
         # --- Ticket URL ---
-        ticket_url = None
-        ticket_link = await item.query_selector('a[href*="seatengine"]')
-        if ticket_link:
-            ticket_url = await ticket_link.get_attribute('href')
+        ticket_url = item["ticket"]
 
         if not ticket_url:
-            more_info = await item.query_selector('a[href*="/velv/"]')
-            if more_info:
-                href = await more_info.get_attribute('href')
-                if href:
-                    if href.startswith('/'):
-                        href = f"https://www.thevelveetaroom.com{href}"
-                    ticket_url = href
+            href = item["moreInfo"]
+            if href:
+                if href.startswith('/'):
+                    href = f"https://www.thevelveetaroom.com{href}"
+                ticket_url = href
 
         if not event_name and not img_url:
             return None
@@ -1,7 +1,7 @@
 """Scraper for Vulcan Gas Company - filters for comedy shows only."""
 
 import re
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 from playwright.async_api import Page
 from .base import BaseScraper
 from ..config import VENUES
@@ -30,6 +30,8 @@ class VulcanScraper(BaseScraper):
     """
 
     venue_key = "vulcan"
+    keep_shows_without_flyer = True
+    prune_missing_shows = True
 
     def __init__(self):
         super().__init__(VENUES[self.venue_key])
@@ -83,57 +85,56 @@ class VulcanScraper(BaseScraper):
         return f"{month_cap} {date_num}"
 
     async def fetch_image_from_ticket_page(self, page: Page, ticket_url: str) -> Optional[str]:
-        """Fetch the event poster image from the ticketsauce page."""
-        try:
-            await page.goto(ticket_url, wait_until="networkidle", timeout=30000)
-            await page.wait_for_timeout(2000)
-
-            # Try to find the main event image
-            # Check og:image meta tag first (most reliable)
-            og_image = await page.query_selector('meta[property="og:image"]')
-            if og_image:
-                img_url = await og_image.get_attribute("content")
-                if img_url:
-                    return img_url
-
-            # Try to find main event image
-            img_selectors = [
-                'img[alt*="Logo"]',
-                'img[alt*="logo"]',
-                '.event-image img',
-                '.poster img',
-                'main img',
-                'article img',
-            ]
-
-            for selector in img_selectors:
-                img = await page.query_selector(selector)
-                if img:
-                    src = await img.get_attribute("src")
-                    if src and "cloudinary" in src:
-                        return src
-
-            # Fallback: find any cloudinary image
-            all_imgs = await page.query_selector_all('img[src*="cloudinary"]')
-            if all_imgs:
-                src = await all_imgs[0].get_attribute("src")
-                if src:
+        """Read the event poster image from a loaded ticketsauce page."""
+        await self.wait_until_ready(
+            page, "meta[property='og:image'], img[src*='cloudinary']", timeout=2000
+        )
+
+        # Try to find the main event image
+        # Check og:image meta tag first (most reliable)
+        og_image = await page.query_selector('meta[property="og:image"]')
+        if og_image:
+            img_url = await og_image.get_attribute("content")
+            if img_url:
+                return img_url
+
+        # Try to find main event image
+        img_selectors = [
+            'img[alt*="Logo"]',
+            'img[alt*="logo"]',
+            '.event-image img',
+            '.poster img',
+            'main img',
+            'article img',
+        ]
+
+        for selector in img_selectors:
+            img = await page.query_selector(selector)
+            if img:
+                src = await img.get_attribute("src")
+                if src and "cloudinary" in src:
                     return src
 
-        except Exception as e:
-            print(f"      Error fetching image from {ticket_url}: {e}")
+        # Fallback: find any cloudinary image
+        all_imgs = await page.query_selector_all('img[src*="cloudinary"]')
+        if all_imgs:
+            src = await all_imgs[0].get_attribute("src")
+            if src:
+                return src
 
         return None
 
     async def scrape(self, page: Page) -> List[Dict]:
         """Scrape comedy events from Vulcan Gas Company."""
+        return [record async for record in self.iter_records(page)]
+
+    async def iter_records(self, page: Page) -> AsyncIterator[Dict]:
+        """Yield each comedy show as its ticket page gives up the poster."""
         await page.goto(self.events_url, wait_until="networkidle", timeout=60000)
-        await page.wait_for_timeout(3000)
+        await self.wait_until_ready(page, self.ready_selector)
 
         # Scroll to load all events
-        for _ in range(3):
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await page.wait_for_timeout(1500)
+        await self.scroll_until_settled(page, 3, self.ready_selector, to_bottom=True, timeout=1500)
 
         events_data = []
 
@@ -202,23 +203,27 @@ class VulcanScraper(BaseScraper):
 
         # Now fetch images from ticket pages
         print(f"    Fetching poster images from ticket pages...")
-        images = []
+        # (is_comedy_show only keeps events with a ticketsauce link)
+        by_url = {}
         for evt in unique_events:
-            ticket_url = evt.get("ticket_url", "")
-            img_url = await self.fetch_image_from_ticket_page(page, ticket_url)
-
-            images.append({
-                "url": img_url or "",
-                "event_name": evt["event_name"],
-                "event_date": evt["event_date"],
-                "show_time": evt["show_time"],
-                "ticket_url": ticket_url,
-            })
+            by_url.setdefault(evt["ticket_url"], []).append(evt)
 
-            if img_url:
-                print(f"      [OK] Got image for {evt['event_name']}")
-            else:
-                print(f"      [--] No image for {evt['event_name']}")
-
-        print(f"    Completed: {len(images)} comedy shows with images")
-        return images
+        found = 0
+        async for ticket_url, img_url in self.crawl_detail_pages(
+            page, list(by_url), self.fetch_image_from_ticket_page
+        ):
+            for evt in by_url[ticket_url]:
+                if img_url:
+                    print(f"      [OK] Got image for {evt['event_name']}")
+                else:
+                    print(f"      [--] No image for {evt['event_name']}")
+                found += 1
+                yield {
+                    "url": img_url or "",
+                    "event_name": evt["event_name"],
+                    "event_date": evt["event_date"],
+                    "show_time": evt["show_time"],
+                    "ticket_url": ticket_url,
+                }
+
+        print(f"    Completed: {found} comedy shows with images")
@@ -0,0 +1,117 @@
+"""Tests for scraper/dates.py, the event_date/show_time normaliser."""
+
+from datetime import date
+
+import pytest
+
+from scraper.dates import (
+    normalize_show,
+    parse_show_date,
+    parse_show_time,
+    recurrence_day,
+    window_bounds,
+)
+
+REFERENCE = date(2026, 1, 15)
+
+
+@pytest.mark.parametrize("event_date, expected", [
+    ("Friday, February 13, 2026", date(2026, 2, 13)),
+    ("Friday, Feb 13, 2026", date(2026, 2, 13)),
+    ("Fri, Feb 13, 2026", date(2026, 2, 13)),
+    ("January 27, 2026", date(2026, 1, 27)),
+    ("Jan 27, 2026", date(2026, 1, 27)),
+    ("01/27/2026", date(2026, 1, 27)),
+    ("2026-01-27", date(2026, 1, 27)),
+    ("Tuesday, Jan 27", date(2026, 1, 27)),
+    ("Tuesday, January 27", date(2026, 1, 27)),
+    ("Tue, Jan 27", date(2026, 1, 27)),
+    ("Jan 27", date(2026, 1, 27)),
+    ("January 27", date(2026, 1, 27)),
+    # Stray whitespace and trailing commas from scraped markup
+    ("  Jan   27 , ", date(2026, 1, 27)),
+])
+def test_parse_show_date_formats(event_date, expected):
+    assert parse_show_date(event_date, REFERENCE) == expected
+
+
+@pytest.mark.parametrize("event_date", [None, "", " , ", "Monday", "TBA", "Jan 32"])
+def test_parse_show_date_rejects(event_date):
+    assert parse_show_date(event_date, REFERENCE) is None
+
+
+def test_yearless_date_uses_reference_year():
+    # A recent past date is still this year's (a show listed late)
+    assert parse_show_date("Jan 1", REFERENCE) == date(2026, 1, 1)
+    assert parse_show_date("Dec 17", REFERENCE) == date(2026, 12, 17)
+
+
+def test_yearless_date_rolls_over_to_next_year():
+    # "Jan 3" listed in late December is next January's show
+    assert parse_show_date("Jan 3", date(2025, 12, 20)) == date(2026, 1, 3)
+    assert parse_show_date("Saturday, Jan 3", date(2025, 12, 20)) == date(2026, 1, 3)
+
+
+def test_leap_day_without_next_leap_year():
+    assert parse_show_date("Feb 29", date(2028, 2, 20)) == date(2028, 2, 29)
+    # Rolled over past 2028 there is no Feb 29 to land on
+    assert parse_show_date("Feb 29", date(2028, 6, 1)) is None
+
+
+@pytest.mark.parametrize("show_time, expected", [
+    ("8:00 PM", (20, 0)),
+    ("8 PM", (20, 0)),
+    ("8pm", (20, 0)),
+    ("7:30 p.m.", (19, 30)),
+    ("12:00 PM", (12, 0)),
+    ("12:15 AM", (0, 15)),
+    ("Doors 7:00 PM / Show 8:00 PM", (19, 0)),
+    ("8:75 PM", None),
+    ("TBA", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_show_time(show_time, expected):
+    assert parse_show_time(show_time) == expected
+
+
+@pytest.mark.parametrize("event_date, expected", [
+    ("Monday", "mon"),
+    ("mondays", "mon"),
+    ("Every Tuesday", "tue"),
+    (" Sunday ", "sun"),
+    ("Tuesday, Jan 27", None),
+    ("Mon", None),
+    (None, None),
+])
+def test_recurrence_day(event_date, expected):
+    assert recurrence_day(event_date) == expected
+
+
+def test_normalize_show_with_time():
+    assert normalize_show("Jan 27", "8:00 PM", REFERENCE) == ("2026-01-27T20:00", None)
+
+
+def test_normalize_show_without_time():
+    assert normalize_show("Jan 27", None, REFERENCE) == ("2026-01-27", None)
+    assert normalize_show("Jan 27", "TBA", REFERENCE) == ("2026-01-27", None)
+
+
+def test_normalize_show_weekly():
+    assert normalize_show("Every Wednesday", "9:00 PM", REFERENCE) == (None, "wed")
+
+
+def test_normalize_show_unparseable():
+    assert normalize_show("Coming soon", "8:00 PM", REFERENCE) == (None, None)
+
+
+def test_window_bounds_include_last_day():
+    lo, hi = window_bounds(date(2026, 1, 30), 2)
+    assert (lo, hi) == ("2026-01-30", "2026-02-02")
+    # Timestamps on the last day sort before the exclusive upper bound
+    assert lo <= "2026-02-01T23:30" < hi
+    assert not "2026-02-02T00:00" < hi
+
+
+def test_window_bounds_single_day():
+    assert window_bounds(date(2026, 12, 31), 0) == ("2026-12-31", "2027-01-01")
@@ -0,0 +1,132 @@
+"""Tests for scraper/matching.py's ShowMatcher."""
+
+import random
+
+import pytest
+
+from scraper.matching import ShowMatcher
+from scraper.shows import (
+    CREEK_CAVE_DAYS,
+    CREEK_CAVE_URLS,
+    FREE_SHOWS,
+    ROZCOS_DAYS,
+    ROZCOS_FREE_SHOWS,
+    SPEAKEASY_DAYS,
+    SPEAKEASY_URLS,
+    VELVEETA_DAYS,
+    VELVEETA_URLS,
+)
+
+TABLES = {
+    "creek_days": CREEK_CAVE_DAYS,
+    "velveeta_days": VELVEETA_DAYS,
+    "rozcos_days": ROZCOS_DAYS,
+    "speakeasy_days": SPEAKEASY_DAYS,
+    "creek_urls": CREEK_CAVE_URLS,
+    "velveeta_urls": VELVEETA_URLS,
+    "speakeasy_urls": SPEAKEASY_URLS,
+    "free": FREE_SHOWS,
+    "rozcos_free": ROZCOS_FREE_SHOWS,
+}
+
+
+def as_table(table):
+    return table if isinstance(table, dict) else {key: key for key in table}
+
+
+def linear_find(table, text):
+    """The scan ShowMatcher.find replaced."""
+    for key, value in as_table(table).items():
+        if key in text:
+            return value
+    return None
+
+
+def linear_lookup(table, name):
+    """The scan ShowMatcher.lookup replaced."""
+    table = as_table(table)
+    if name in table:
+        return table[name]
+    for key, value in table.items():
+        if key in name or name in key:
+            return value
+    return None
+
+
+def test_find_returns_earliest_key_not_leftmost_match():
+    matcher = ShowMatcher({"mic": "late", "open": "early"})
+    # "open" occurs first in the text, but "mic" comes first in the table
+    assert matcher.find("open mic night") == "late"
+
+
+def test_find_overlapping_keys():
+    matcher = ShowMatcher({"hers": 1, "she": 2, "he": 3})
+    assert matcher.find("ushers") == 1
+    assert matcher.find("ushe") == 2
+    assert matcher.find("the") == 3
+    assert matcher.find("xyz") is None
+
+
+def test_find_key_reached_through_failure_link():
+    matcher = ShowMatcher({"abcd": 1, "bc": 2})
+    assert matcher.find("xabce") == 2
+
+
+def test_lookup_prefers_exact_key():
+    matcher = ShowMatcher({"open mic": "substring", "open mic night": "exact"})
+    assert matcher.lookup("open mic night") == "exact"
+
+
+def test_lookup_name_inside_key():
+    matcher = ShowMatcher({"the monday gamble mic": "mon", "gamble": "other"})
+    assert matcher.lookup("monday gamble") == "mon"
+    # Earliest key wins across both directions
+    assert matcher.lookup("big gamble") == "other"
+
+
+def test_lookup_does_not_match_across_keys():
+    matcher = ShowMatcher({"dunk": 1, "tank": 2})
+    assert matcher.lookup("k\x00t") is None
+    assert matcher.lookup("unk t") is None
+
+
+def test_list_table_values_are_keys():
+    matcher = ShowMatcher(["banana phone", "dunk tank"])
+    assert matcher.find("banana phone: live") == "banana phone"
+    assert matcher.lookup("dunk") == "dunk tank"
+
+
+def test_empty_table():
+    matcher = ShowMatcher({})
+    assert matcher.find("anything") is None
+    assert matcher.lookup("anything") is None
+
+
+def test_results_are_memoized():
+    matcher = ShowMatcher({"mic": 1})
+    assert matcher.find("open mic") == 1
+    assert matcher.lookup("mic night") == 1
+    assert matcher._found == {"open mic": 1}
+    assert matcher._looked_up == {"mic night": 1}
+
+
+def sample_names(table, seed):
+    """Keys, their fragments, and keys inside longer names."""
+    rng = random.Random(seed)
+    names = {"", "zzz", "comedy night"}
+    for key in as_table(table):
+        names.add(key)
+        if len(key) > 2:
+            start = rng.randrange(len(key) - 1)
+            names.add(key[start:rng.randrange(start + 1, len(key) + 1)])
+        names.add(f"{rng.choice(['the ', 'live: ', ''])}{key}{rng.choice([' 8pm', '!', ''])}")
+    return sorted(names)
+
+
+@pytest.mark.parametrize("table_name", sorted(TABLES))
+def test_matches_linear_scan_on_site_tables(table_name):
+    table = TABLES[table_name]
+    matcher = ShowMatcher(table)
+    for name in sample_names(table, table_name):
+        assert matcher.find(name) == linear_find(table, name), name
+        assert matcher.lookup(name) == linear_lookup(table, name), name
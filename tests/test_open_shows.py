@@ -0,0 +1,77 @@
+"""Tests for database.open_shows() keeping the shows table current for readers."""
+
+import sqlite3
+
+import pytest
+
+import scraper.database as database
+import scraper.shows as shows
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    database.close_connection()
+    path = tmp_path / "test.db"
+    monkeypatch.setattr(database, "DB_PATH", path)
+    database.init_db()
+    venue_id = database.get_or_create_venue("Gnar Bar", "https://gnarbaratx.com/events")
+    database.connection().execute(
+        """INSERT INTO images (venue_id, source_url, local_path, event_name, event_date, image_hash)
+           VALUES (?, ?, '', 'The Grind', 'Tuesday', 'hash-1')""",
+        (venue_id, "https://gnarbaratx.com/events#the-grind-tuesday"),
+    )
+    database.refresh_venue_shows(venue_id)
+    database.close_connection()
+    yield path
+    database.close_connection()
+
+
+def show_names(path):
+    conn = database.open_shows(path)
+    try:
+        return sorted(row["name"] for row in conn.execute("SELECT name FROM shows"))
+    finally:
+        conn.close()
+
+
+def test_reader_connection_is_read_only(db):
+    conn = database.open_shows(db)
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM shows")
+    finally:
+        conn.close()
+
+
+def test_rows_written_by_other_tools_are_picked_up(db):
+    conn = sqlite3.connect(db)
+    conn.execute(
+        """INSERT INTO images (venue_id, source_url, local_path, event_name, event_date, image_hash)
+           VALUES (1, 'https://gnarbaratx.com/events#shred-friday', '', 'SHRED', 'Friday', 'hash-2')"""
+    )
+    conn.commit()
+    conn.close()
+
+    assert show_names(db) == ["SHRED", "The Grind"]
+    # The row was normalised on the way in
+    conn = sqlite3.connect(db)
+    assert conn.execute(
+        "SELECT recurrence_day FROM images WHERE image_hash = 'hash-2'"
+    ).fetchone() == ("fri",)
+    conn.close()
+
+
+def test_rule_changes_rebuild_every_venue(db, monkeypatch):
+    conn = database.open_shows(db)
+    assert shows.stale_venues(conn) == []
+    conn.close()
+
+    monkeypatch.setattr(shows, "RULES_DIGEST", "edited")
+    conn = sqlite3.connect(db)
+    assert shows.stale_venues(conn) == [1]
+    conn.close()
+
+    assert show_names(db) == ["The Grind"]
+    conn = database.open_shows(db)
+    assert shows.stale_venues(conn) == []
+    conn.close()
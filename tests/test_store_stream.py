@@ -0,0 +1,193 @@
+"""Tests for scraper.main._store_stream against a temporary database."""
+
+import asyncio
+import hashlib
+
+import pytest
+
+import scraper.database as database
+import scraper.main as main
+from scraper.venues.base import BaseScraper
+
+VENUE = "Test Venue"
+
+
+class FakeScraper(BaseScraper):
+    def __init__(self, **flags):
+        super().__init__({
+            "name": VENUE,
+            "url": "https://venue.test",
+            "events_url": "https://venue.test/events",
+            "image_selectors": [],
+        })
+        for name, value in flags.items():
+            setattr(self, name, value)
+
+
+class FakeDownloads:
+    """Stands in for download_all: records each batch of jobs it is given."""
+
+    def __init__(self):
+        self.batches = []
+        self.failing = set()
+
+    async def __call__(self, jobs, venue_name, session, concurrency):
+        self.batches.append([url for url, _, _ in jobs])
+        return [None if url in self.failing else self.result(url) for url, _, _ in jobs]
+
+    @staticmethod
+    def result(url):
+        image_hash = hashlib.sha256(url.encode()).hexdigest()
+        return f"images/test/{image_hash[:16]}.png", image_hash, None, None
+
+
+@pytest.fixture
+def downloads(tmp_path, monkeypatch):
+    database.close_connection()
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "test.db")
+    fake = FakeDownloads()
+    monkeypatch.setattr(main, "download_all", fake)
+    database.init_db()
+    yield fake
+    database.close_connection()
+
+
+def show(key, event_date="Jan 27, 2099", url=None):
+    return {
+        "url": f"https://cdn.test/{key}.png" if url is None else url,
+        "ticket_url": f"https://venue.test/tickets/{key}",
+        "event_name": f"Show {key}",
+        "event_date": event_date,
+        "show_time": "8:00 PM",
+    }
+
+
+async def _records(listing, error=None):
+    for record in listing:
+        yield record
+    if error:
+        raise error
+
+
+def store(listing, scraper=None, refresh=False, error=None):
+    venue_id = database.get_or_create_venue(VENUE, "https://venue.test")
+    return asyncio.run(main._store_stream(
+        _records(listing, error), scraper or FakeScraper(), venue_id, VENUE,
+        None, 4, refresh,
+    ))
+
+
+def stored_sources():
+    rows = database.connection().execute("SELECT source_url FROM images ORDER BY id")
+    return [row["source_url"].rsplit("/", 1)[-1] for row in rows]
+
+
+def fingerprint():
+    venue_id = database.get_or_create_venue(VENUE, "https://venue.test")
+    return database.get_listing_fingerprint(venue_id)
+
+
+def test_new_shows_are_stored(downloads):
+    assert store([show("a"), show("b")]) == (2, 2, 0, "success")
+    assert stored_sources() == ["a", "b"]
+    assert fingerprint() is not None
+
+
+def test_unchanged_listing_skips_downloads(downloads):
+    store([show("a"), show("b")])
+    downloads.batches.clear()
+
+    assert store([show("a"), show("b")]) == (2, 0, 0, "unchanged")
+    assert downloads.batches == []
+
+
+def test_known_shows_wait_for_a_new_one(downloads):
+    store([show("a"), show("b")])
+    downloads.batches.clear()
+
+    assert store([show("a"), show("b"), show("c")]) == (3, 1, 0, "success")
+    # The new show is fetched first, then the known ones are revalidated
+    assert downloads.batches[0] == ["https://cdn.test/c.png"]
+    assert sorted(url for batch in downloads.batches[1:] for url in batch) == [
+        "https://cdn.test/a.png", "https://cdn.test/b.png",
+    ]
+
+
+def test_changed_listing_revalidates_known_shows(downloads):
+    store([show("a")])
+    downloads.batches.clear()
+
+    renamed = dict(show("a"), event_name="Show A (Late)")
+    assert store([renamed]) == (1, 0, 0, "success")
+    assert downloads.batches == [["https://cdn.test/a.png"]]
+
+
+def test_refresh_revalidates_an_unchanged_listing(downloads):
+    store([show("a")])
+    downloads.batches.clear()
+
+    assert store([show("a")], refresh=True) == (1, 0, 0, "success")
+    assert downloads.batches == [["https://cdn.test/a.png"]]
+
+
+def test_changed_flyer_is_updated(downloads):
+    store([show("a")])
+    moved = show("a", url="https://cdn.test/a-v2.png")
+
+    assert store([moved]) == (1, 0, 1, "success")
+    stored_url = database.connection().execute("SELECT image_url FROM images").fetchone()[0]
+    assert stored_url == "https://cdn.test/a-v2.png"
+
+
+def test_failed_flyer_leaves_listing_untrusted(downloads):
+    downloads.failing.add("https://cdn.test/b.png")
+
+    assert store([show("a"), show("b")]) == (2, 1, 0, "success")
+    assert stored_sources() == ["a"]
+    assert fingerprint() is None
+
+    # The next run retries it rather than trusting the listing
+    downloads.failing.clear()
+    assert store([show("a"), show("b")]) == (2, 1, 0, "success")
+    assert stored_sources() == ["a", "b"]
+
+
+def test_failed_flyer_kept_without_image(downloads):
+    downloads.failing.add("https://cdn.test/b.png")
+
+    store([show("a"), show("b")], FakeScraper(keep_shows_without_flyer=True))
+    row = database.connection().execute(
+        "SELECT local_path, image_hash FROM images WHERE source_url LIKE '%/b'"
+    ).fetchone()
+    assert row["local_path"] == ""
+    assert row["image_hash"].startswith("no-image-")
+    assert fingerprint() is None
+
+
+def test_show_without_image_url(downloads):
+    assert store([show("a", url="")]) == (1, 1, 0, "success")
+    assert not any(downloads.batches)
+
+
+def test_prunes_upcoming_shows_no_longer_listed(downloads):
+    pruning = FakeScraper(prune_missing_shows=True)
+    store([show("a"), show("b"), show("old", event_date="Jan 27, 2001")], pruning)
+
+    store([show("a")], pruning)
+    # "b" was cancelled; past shows are kept
+    assert stored_sources() == ["a", "old"]
+
+
+def test_partial_or_empty_listing_prunes_nothing(downloads):
+    store([show("a"), show("b")], FakeScraper(prune_missing_shows=True))
+
+    store([show("a")], FakeScraper(prune_missing_shows=True, partial_listing=True))
+    store([], FakeScraper(prune_missing_shows=True))
+    assert stored_sources() == ["a", "b"]
+
+
+def test_scraper_error_keeps_stored_rows(downloads):
+    with pytest.raises(RuntimeError):
+        store([show("a")], error=RuntimeError("page crashed"))
+    assert stored_sources() == ["a"]
+    assert fingerprint() is None
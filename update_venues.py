@@ -3,6 +3,10 @@ import requests
 import hashlib
 from pathlib import Path
 
+from scraper.database import create_schema
+from scraper.dates import normalize_show
+from scraper.shows import refresh_shows
+
 DB_PATH = 'comedy_images.db'
 
 # Bulls Pub image path (already exists)
@@ -40,6 +44,9 @@ def download_image(url, save_path):
 
 # Connect to database
 conn = sqlite3.connect(DB_PATH)
+conn.row_factory = sqlite3.Row
+# Make sure the show_start/recurrence_day columns and shows table exist
+create_schema(conn)
 cursor = conn.cursor()
 
 # === Update Bulls Pub image paths ===
@@ -92,12 +99,17 @@ for show in GNAR_BAR_SHOWS:
         print(f"  {show['name']} ({show['day']}) already exists")
         continue
 
+    show_start, recurrence_day = normalize_show(show['day'], show['time'])
     cursor.execute("""
-        INSERT INTO images (venue_id, source_url, local_path, event_name, event_date, image_hash)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (gnar_venue_id, source_url, local_path, show['name'], show['day'], image_hash))
+        INSERT INTO images (venue_id, source_url, local_path, event_name, event_date, image_hash,
+                            show_start, recurrence_day)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, (gnar_venue_id, source_url, local_path, show['name'], show['day'], image_hash,
+          show_start, recurrence_day))
     print(f"  Added {show['name']} ({show['day']})")
 
+# Rebuild the show records of the venues changed above
+refresh_shows(conn)
 conn.commit()
 conn.close()
 